@@ -2,21 +2,31 @@
 """Gerador de HTML para Calendário de Treinos (RAJJ).
 
 Cria um layout no estilo "grade" com:
-- Moldura (frame) nas cores da marca (extraídas da Logo)
+- Moldura (frame) nas cores da marca (extraídas automaticamente da Logo)
 - Logo no cabeçalho
 - Relógio segmentado em 3 partes (Aquecimento, Teoria, Luta) com 20 min cada
 - Grade semanal dos treinos conforme horários informados
 
-Saída: ScriptCalendarioRAJJ/html/calendario_treinos_rajj.html
+Os horários, categorias, filiais e marcas vêm de calendario_rajj.json; o CSS de
+cada marca é montado uma vez e reaproveitado por todas as filiais dela.
+
+Saída: ScriptCalendarioRAJJ/html/calendario_treinos_<filial>.html
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
-from PIL import Image
+# Módulos compartilhados (ex.: imagem_ops) ficam na raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from imagem_ops import copiar_se_diferente, extrair_paleta, remover_fundo_em_cache
 
 
 @dataclass(frozen=True)
@@ -30,33 +40,62 @@ class BrandColors:
 		gray_300: str = "#D0D0D0"
 
 
-def obter_cores_marca() -> BrandColors:
+# Paleta usada quando a logo não existe ou não tem cores saturadas suficientes
+# (dominantes observadas em Logo.JPG/Logo.pdf renderizado).
+CORES_PADRAO = BrandColors(
+		blue="#0000F0",
+		gold="#F0B000",
+)
+
+
+def obter_cores_marca(logo: Path | None = None) -> BrandColors:
 		"""Cores extraídas da Logo (paleta dominante).
 
 		Observação importante:
-		- A logo fornecida é predominantemente azul e dourado.
+		- A paleta é extraída automaticamente da logo (histograma quantizado +
+		  agrupamento), com cache pelo hash do conteúdo do arquivo.
+		- A cor mais frequente vira a principal (``blue``) e a segunda, a de
+		  destaque (``gold``); na logo RAJJ são o azul e o dourado.
 		- O frame e títulos usam as cores da marca.
 		- O relógio segmentado pode usar cores específicas conforme solicitado.
 		"""
 
-		# Dominantes observadas em Logo.JPG/Logo.pdf renderizado.
+		if logo is None or not logo.exists():
+				return CORES_PADRAO
+
+		paleta = extrair_paleta(logo, n_cores=2)
+		if not paleta:
+				return CORES_PADRAO
+
 		return BrandColors(
-				blue="#0000F0",
-				gold="#F0B000",
+				blue=paleta[0],
+				gold=paleta[1] if len(paleta) > 1 else CORES_PADRAO.gold,
 		)
 
 
+def rgba(cor_hex: str, alpha: float) -> str:
+		"""Converte "#RRGGBB" em "rgba(r, g, b, alpha)" (tons claros da marca)."""
+
+		r, g, b = (int(cor_hex[i:i + 2], 16) for i in (1, 3, 5))
+		return f"rgba({r}, {g}, {b}, {alpha:.2f})"
+
+
+# Cores solicitadas para os 3 segmentos do relógio
+# (o restante do layout continua usando as cores da marca no frame e títulos).
+SEGMENTOS_RELOGIO = (
+		("Aquecimento", "#F6B3B3"),  # vermelho claro
+		("Teoria", "#A9D7FF"),       # azul claro
+		("Luta", "#7EDFA1"),         # verde
+)
+
+
 def gerar_svg_relogio_segmentado(colors: BrandColors) -> str:
 		"""Relógio circular com 3 segmentos iguais (20 min cada).
 
 		Implementação via SVG com 3 arcos de 120°.
 		"""
 
-		# Cores solicitadas para os 3 segmentos
-		# (o restante do layout continua usando as cores da marca no frame e títulos).
-		warmup = "#F6B3B3"   # vermelho claro
-		theory = "#A9D7FF"   # azul claro
-		fight = "#7EDFA1"    # verde
+		(_, warmup), (_, theory), (_, fight) = SEGMENTOS_RELOGIO
 
 		# Arcos (círculo central em (60,60), raio 46; stroke largo vira donut)
 		# Segmentos: 0–120, 120–240, 240–360.
@@ -88,117 +127,99 @@ def gerar_svg_relogio_segmentado(colors: BrandColors) -> str:
 """.strip()
 
 
-def gerar_grade_treinos() -> dict:
-		"""Define a grade de treinos conforme solicitado."""
-
-		# Seg–Sex
-		semana = {
-				"Seg": [
-						("08:00–10:00", "Mista"),
-						("15:00–17:00", "Mista"),
-						("17:00–18:00", "Kids 1"),
-						("18:00–19:00", "Kids 2"),
-						("19:00–20:00", "Juvenil"),
-						("20:00–21:00", "Adulto"),
-				],
-				"Ter": [
-						("08:00–10:00", "Mista"),
-						("15:00–17:00", "Mista"),
-						("17:00–18:00", "Kids 1"),
-						("18:00–19:00", "Kids 2"),
-						("19:00–20:00", "Juvenil"),
-						("20:00–21:00", "Adulto"),
-				],
-				"Qua": [
-						("08:00–10:00", "Mista"),
-						("15:00–17:00", "Mista"),
-						("17:00–18:00", "Kids 1"),
-						("18:00–19:00", "Kids 2"),
-						("19:00–20:00", "Juvenil"),
-						("20:00–21:00", "Adulto"),
-				],
-				"Qui": [
-						("08:00–10:00", "Mista"),
-						("15:00–17:00", "Mista"),
-						("17:00–18:00", "Kids 1"),
-						("18:00–19:00", "Kids 2"),
-						("19:00–20:00", "Juvenil"),
-						("20:00–21:00", "Adulto"),
-				],
-				"Sex": [
-						("08:00–10:00", "Mista"),
-						("15:00–17:00", "Mista"),
-						("17:00–18:00", "Kids 1"),
-						("18:00–19:00", "Kids 2"),
-						("19:00–20:00", "Juvenil"),
-						("20:00–21:00", "Adulto"),
-				],
-		}
-
-		sabado = [("18:00–20:00", "Adulto")]
-
-		return {"semana": semana, "sabado": sabado}
-
-
-def gerar_html(colors: BrandColors) -> str:
-		logo_rel = "../Logo_transparente.png"  # arquivo está em ScriptCalendarioRAJJ/
+@dataclass(frozen=True)
+class Filial:
+		id: str
+		marca: str
+		titulo: str
+		subtitulo: str
+		rodape: str
+		semana: dict
+		sabado: list
+		categorias: dict = field(default_factory=dict)
 
-		relogio_html = gerar_svg_relogio_segmentado(colors)
-		grade = gerar_grade_treinos()
-
-		# Cores por categoria (apenas marca + neutros)
-		# Adulto: azul sólido (forte)
-		# Mista: azul da marca em tom claro (mesma cor, só com transparência)
-		cat_styles = {
-				"Mista": {"bg": "rgba(0, 0, 240, 0.20)", "fg": colors.black},
-				"Adulto": {"bg": colors.blue, "fg": colors.white},
-				"Kids 1": {"bg": colors.gold, "fg": colors.black},
-				"Kids 2": {"bg": colors.gold, "fg": colors.black},
-				"Juvenil": {"bg": colors.gray_300, "fg": colors.black},
-		}
-
-		# Grade Seg–Sex em colunas
-		dias_ordem = ["Seg", "Ter", "Qua", "Qui", "Sex"]
-		cards_semana = ""
-		for dia in dias_ordem:
-				linhas = ""
-				for horario, categoria in grade["semana"][dia]:
+
+@dataclass(frozen=True)
+class Calendarios:
+		marcas: dict
+		filiais: list
+
+
+def carregar_calendarios(caminho: Path) -> Calendarios:
+		"""Lê o arquivo de calendários (marcas, categorias e filiais).
+
+		Cada filial traz a grade da semana (dia -> [[horário, categoria], ...]) e a
+		do sábado; as categorias são compartilhadas, mas uma filial pode sobrescrever
+		as suas em "categorias". Erros de digitação em categorias ou marcas são
+		apontados aqui, antes de gerar qualquer arquivo.
+		"""
+
+		dados = json.loads(caminho.read_text(encoding="utf-8"))
+		marcas = dados.get("marcas", {})
+		categorias = dados.get("categorias", {})
+
+		filiais = []
+		for bruta in dados.get("filiais", []):
+				filial = Filial(
+						id=bruta["id"],
+						marca=bruta["marca"],
+						titulo=bruta["titulo"],
+						subtitulo=bruta.get("subtitulo", ""),
+						rodape=bruta.get("rodape", ""),
+						semana={dia: [tuple(slot) for slot in slots] for dia, slots in bruta["semana"].items()},
+						sabado=[tuple(slot) for slot in bruta.get("sabado", [])],
+						categorias={**categorias, **bruta.get("categorias", {})},
+				)
+				if filial.marca not in marcas:
+						raise ValueError(f"Filial '{filial.id}': marca desconhecida '{filial.marca}'")
+				usadas = [c for slots in filial.semana.values() for _, c in slots] + [c for _, c in filial.sabado]
+				for categoria in usadas:
+						if categoria not in filial.categorias:
+								raise ValueError(f"Filial '{filial.id}': categoria desconhecida '{categoria}'")
+				filiais.append(filial)
+
+		return Calendarios(marcas=marcas, filiais=filiais)
+
+
+def resolver_cor(token: str, colors: BrandColors) -> str:
+		"""Resolve "blue", "gold/0.20" (cor da marca com alpha) ou um "#RRGGBB" literal."""
+
+		nome, _, alpha = token.partition("/")
+		cor = nome if nome.startswith("#") else getattr(colors, nome)
+		return rgba(cor, float(alpha)) if alpha else cor
+
+
+def estilos_categorias(filial: Filial, colors: BrandColors) -> dict:
+		"""Cores (fundo, texto e borda da legenda) de cada categoria da filial."""
+
+		estilos = {}
+		for nome, cat in filial.categorias.items():
+				estilos[nome] = {
+						"bg": resolver_cor(cat["bg"], colors),
+						"fg": resolver_cor(cat["fg"], colors),
+						"borda": resolver_cor(cat["borda"], colors) if cat.get("borda") else None,
+						"legenda": cat.get("legenda", nome),
+				}
+		return estilos
+
+
+def itens_legenda(filial: Filial, cat_styles: dict) -> list:
+		"""Estilos das categorias usadas pela filial, um por rótulo (Kids 1 e Kids 2 aparecem juntas como "Kids")."""
+
+		usadas = [c for slots in filial.semana.values() for _, c in slots] + [c for _, c in filial.sabado]
+		itens = {}
+		for categoria in filial.categorias:
+				if categoria in usadas:
 						st = cat_styles[categoria]
-						linhas += f"""
-							<div class=\"slot\" style=\"background:{st['bg']}; color:{st['fg']}\">
-								<div class=\"slot-time\">{horario}</div>
-								<div class=\"slot-cat\">{categoria}</div>
-							</div>
-						"""
+						itens.setdefault(st["legenda"], st)
+		return list(itens.values())
 
-				cards_semana += f"""
-					<div class="day-card">
-						<div class="day-title">{dia}</div>
-						<div class="day-slots">
-							{linhas}
-						</div>
-					</div>
-				"""
 
-		# Sábado (card separado)
-		sab_linhas = ""
-		for horario, categoria in grade["sabado"]:
-				st = cat_styles[categoria]
-				sab_linhas += f"""
-					<div class=\"slot\" style=\"background:{st['bg']}; color:{st['fg']}\">
-						<div class=\"slot-time\">{horario}</div>
-						<div class=\"slot-cat\">{categoria}</div>
-					</div>
-				"""
+@lru_cache(maxsize=None)
+def gerar_css(colors: BrandColors) -> str:
+		"""CSS do calendário; depende só das cores, então é montado uma vez por marca."""
 
-		return f"""<!DOCTYPE html>
-<html lang="pt-br">
-<head>
-	<meta charset="UTF-8" />
-	<meta name="viewport" content="width=device-width, initial-scale=1.0" />
-	<title>Grade de Treinos</title>
-	<link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@500;600;700;800&family=Roboto:wght@300;400;500;700&display=swap" rel="stylesheet">
-	<style>
+		return f"""<style>
 		:root {{
 			--brand-blue: {colors.blue};
 			--brand-gold: {colors.gold};
@@ -254,8 +275,8 @@ def gerar_html(colors: BrandColors) -> str:
 			gap: 26px;
 			background:
 				linear-gradient(180deg, rgba(0,0,0,0.02) 0%, rgba(0,0,0,0) 18%),
-				radial-gradient(900px 500px at 10% 15%, rgba(240,176,0,0.12) 0%, transparent 55%),
-				radial-gradient(900px 500px at 95% 10%, rgba(0,0,240,0.10) 0%, transparent 55%);
+				radial-gradient(900px 500px at 10% 15%, {rgba(colors.gold, 0.12)} 0%, transparent 55%),
+				radial-gradient(900px 500px at 95% 10%, {rgba(colors.blue, 0.10)} 0%, transparent 55%);
 		}}
 
 		header {{
@@ -388,14 +409,10 @@ def gerar_html(colors: BrandColors) -> str:
 			font-weight: 600;
 		}}
 		.sw {{ width: 10px; height: 10px; border-radius: 3px; display: inline-block; }}
-		.sw-mista {{ background: rgba(0, 0, 240, 0.20); border: 1px solid var(--brand-blue); }}
-		.sw-adulto {{ background: var(--brand-blue); }}
-		.sw-kids {{ background: var(--brand-gold); }}
-		.sw-juvenil {{ background: var(--g300); }}
 
 		.week-grid {{
 			display: grid;
-			grid-template-columns: repeat(5, 1fr);
+			grid-template-columns: repeat(var(--dias), 1fr);
 			gap: 14px;
 			flex: 1;
 		}}
@@ -469,7 +486,74 @@ def gerar_html(colors: BrandColors) -> str:
 			background: rgba(255,255,255,0.9);
 			font-weight: 600;
 		}}
-	</style>
+	</style>"""
+
+
+def gerar_html(colors: BrandColors, filial: Filial, logo_rel: str) -> str:
+		css = gerar_css(colors)
+		relogio_html = gerar_svg_relogio_segmentado(colors)
+
+		# Cores por categoria (apenas marca + neutros), conforme o arquivo de calendários
+		cat_styles = estilos_categorias(filial, colors)
+
+		# Grade dos dias úteis em colunas (na ordem do arquivo)
+		cards_semana = ""
+		for dia, slots in filial.semana.items():
+				linhas = ""
+				for horario, categoria in slots:
+						st = cat_styles[categoria]
+						linhas += f"""
+						<div class=\"slot\" style=\"background:{st['bg']}; color:{st['fg']}\">
+							<div class=\"slot-time\">{horario}</div>
+							<div class=\"slot-cat\">{categoria}</div>
+						</div>
+					"""
+
+				cards_semana += f"""
+					<div class="day-card">
+						<div class="day-title">{dia}</div>
+						<div class="day-slots">
+							{linhas}
+						</div>
+					</div>
+				"""
+
+		# Sábado (card separado, só quando a filial tem aula)
+		sab_linhas = ""
+		for horario, categoria in filial.sabado:
+				st = cat_styles[categoria]
+				sab_linhas += f"""
+					<div class=\"slot\" style=\"background:{st['bg']}; color:{st['fg']}\">
+						<div class=\"slot-time\">{horario}</div>
+						<div class=\"slot-cat\">{categoria}</div>
+					</div>
+				"""
+
+		sab_html = ""
+		if sab_linhas:
+				sab_html = f"""<div class="sat">
+					<div class="sat-head">Sábado</div>
+					<div class="sat-body">
+						{sab_linhas}
+					</div>
+				</div>"""
+
+		pilulas = []
+		for st in itens_legenda(filial, cat_styles):
+				borda = f" border: 1px solid {st['borda']};" if st["borda"] else ""
+				pilulas.append(
+						f'<span class="pill"><span class="sw" style="background: {st["bg"]};{borda}"></span>{st["legenda"]}</span>'
+				)
+		legenda = "\n\t\t\t\t\t\t".join(pilulas)
+
+		return f"""<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+	<meta charset="UTF-8" />
+	<meta name="viewport" content="width=device-width, initial-scale=1.0" />
+	<title>Grade de Treinos</title>
+	<link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@500;600;700;800&family=Roboto:wght@300;400;500;700&display=swap" rel="stylesheet">
+	{css}
 </head>
 <body>
 	<div class="flyer">
@@ -479,8 +563,8 @@ def gerar_html(colors: BrandColors) -> str:
 				<div class="brand">
 					<img src="{logo_rel}" alt="Logo" />
 					<div class="title">
-						<h1>Cronograma de Aulas</h1>
-						<div class="sub">Segunda a Sábado • RAJJ</div>
+						<h1>{filial.titulo}</h1>
+						<div class="sub">{filial.subtitulo}</div>
 					</div>
 				</div>
 
@@ -491,27 +575,19 @@ def gerar_html(colors: BrandColors) -> str:
 				<div class="board-head">
 					<h2>Grade Semanal</h2>
 					<div class="legend">
-						<span class="pill"><span class="sw sw-mista"></span>Mista</span>
-						<span class="pill"><span class="sw sw-adulto"></span>Adulto</span>
-						<span class="pill"><span class="sw sw-kids"></span>Kids</span>
-						<span class="pill"><span class="sw sw-juvenil"></span>Juvenil</span>
+						{legenda}
 					</div>
 				</div>
 
-				<div class="week-grid">
+				<div class="week-grid" style="--dias: {len(filial.semana)}">
 					{cards_semana}
 				</div>
 
-				<div class="sat">
-					<div class="sat-head">Sábado</div>
-					<div class="sat-body">
-						{sab_linhas}
-					</div>
-				</div>
+				{sab_html}
 			</section>
 
 			<footer>
-				<div class="tag">Documento Oficial: Versão 1.0</div>
+				<div class="tag">{filial.rodape}</div>
 			</footer>
 		</div>
 	</div>
@@ -520,75 +596,232 @@ def gerar_html(colors: BrandColors) -> str:
 """
 
 
-def gerar_logo_transparente(base_dir: Path) -> None:
+def desenhar_png(colors: BrandColors, filial: Filial, logo_png: Path, destino: Path, escala: float = 1.0) -> None:
+		"""Desenha o calendário direto em PNG com o Pillow, sem passar pelo navegador.
+
+		Reproduz as medidas do CSS de gerar_css (frame, cabeçalho, relógio, grade e
+		sábado) em px; só os gradientes radiais sutis do fundo ficam de fora. Para
+		ajustes finos de layout, o HTML renderizado pelo gerar_posts.py continua
+		sendo a referência.
+		"""
+
+		from raster_direto import Tela
+
+		tela = Tela(1080, 1350, colors.white, escala)
+		cat_styles = estilos_categorias(filial, colors)
+		tinta = rgba(colors.black, 0.85)
+
+		def montserrat(peso, tamanho):
+				return tela.fonte("Montserrat", peso, tamanho)
+
+		def roboto(peso, tamanho):
+				return tela.fonte("Roboto", peso, tamanho)
+
+		# Frame nas cores da marca (.frame e .frame::before)
+		tela.caixa(26, 26, 1054, 1324, raio=28, borda=colors.blue, largura_borda=10)
+		tela.caixa(46, 46, 1034, 1304, raio=20, borda=colors.gold, largura_borda=6)
+
+		esquerda, direita, topo, base = 70, 1010, 60, 1290
+
+		# Relógio no topo-direito
+		f_titulo_relogio = montserrat(800, 14)
+		f_legenda_relogio = roboto(400, 12)
+		linha_titulo = tela.altura_linha(f_titulo_relogio)
+		linha_legenda = tela.altura_linha(f_legenda_relogio)
+		lado_svg = 250 - 2 * 16
+		altura_relogio = 16 + linha_titulo + 10 + lado_svg + 10 + 3 * linha_legenda + 2 * 6 + 14
+		x_relogio = direita - 250
+		tela.caixa(x_relogio, topo, direita, topo + altura_relogio, raio=18,
+				   fundo=colors.white, borda=colors.gray_200, largura_borda=2)
+		tela.texto(x_relogio + 16, topo + 16, "METODOLOGIA", f_titulo_relogio, colors.black, espacamento=1)
+
+		k = lado_svg / 120  # viewBox 0 0 120 120
+		y_svg = topo + 16 + linha_titulo + 10
+		cx, cy = x_relogio + 16 + 60 * k, y_svg + 60 * k
+		tela.arco(cx, cy, 46 * k, 16 * k, 0, 360, colors.gray_200)
+		for i, (_, cor) in enumerate(SEGMENTOS_RELOGIO):
+				tela.arco(cx, cy, 46 * k, 16 * k, -90 + 120 * i, -90 + 120 * (i + 1), cor)
+		tela.circulo(cx, cy, 30 * k, colors.white)
+		tela.texto(cx, y_svg + 64 * k, "60min", montserrat(800, 14 * k), colors.black,
+				   alinhamento="centro", linha_base=True)
+
+		y_legenda = y_svg + lado_svg + 10
+		for nome, cor in SEGMENTOS_RELOGIO:
+				tela.circulo(x_relogio + 21, y_legenda + linha_legenda / 2, 5, cor)
+				tela.texto(x_relogio + 34, y_legenda, f"{nome} • 20min", f_legenda_relogio, colors.black)
+				y_legenda += linha_legenda + 6
+
+		# Marca: logo + título, centralizados na vertical
+		f_h1 = montserrat(800, 44)
+		f_sub = montserrat(600, 18)
+		x_titulo = esquerda + 110 + 18
+		linhas_h1 = tela.quebrar(filial.titulo.upper(), f_h1, x_relogio - 18 - x_titulo, espacamento=0.5)
+		altura_titulo = len(linhas_h1) * 44 * 1.05 + 6 + tela.altura_linha(f_sub)
+		altura_marca = max(110, altura_titulo)
+		if logo_png.exists():
+				tela.colar(logo_png, esquerda, topo + (altura_marca - 110) / 2, 110, 110)
+		y = topo + (altura_marca - altura_titulo) / 2
+		for linha in linhas_h1:
+				tela.texto(x_titulo, y, linha, f_h1, colors.blue, espacamento=0.5, altura_linha=1.05)
+				y += 44 * 1.05
+		tela.texto(x_titulo, y + 6, filial.subtitulo, f_sub, tinta)
+
+		# Rodapé
+		f_tag = roboto(600, 12)
+		altura_tag = 2 + 16 + tela.altura_linha(f_tag)
+		y_rodape = base - altura_tag
+		largura_tag = tela.largura_texto(filial.rodape, f_tag) + 2 + 24
+		tela.caixa(esquerda, y_rodape, esquerda + largura_tag, base, raio=altura_tag / 2,
+				   fundo=colors.white, borda=colors.gray_200)
+		tela.texto(esquerda + 13, y_rodape + 9, filial.rodape, f_tag, tinta)
+
+		# Quadro principal
+		y_quadro = topo + max(altura_marca, altura_relogio) + 26
+		fim_quadro = y_rodape - 26
+		tela.caixa(esquerda, y_quadro, direita, fim_quadro, raio=22,
+				   fundo=colors.white, borda=colors.gray_200, largura_borda=2)
+		x0, x1 = esquerda + 24, direita - 24
+		y = y_quadro + 24
+		fim = fim_quadro - 24
+
+		# Cabeçalho do quadro: título à esquerda, legenda à direita
+		f_h2 = montserrat(800, 22)
+		f_pilula = roboto(600, 12)
+		altura_pilula = 2 + 14 + tela.altura_linha(f_pilula)
+		altura_cabecalho = max(tela.altura_linha(f_h2), altura_pilula)
+		tela.texto(x0, y + (altura_cabecalho - tela.altura_linha(f_h2)) / 2, "GRADE SEMANAL", f_h2,
+				   colors.black, espacamento=1)
+		x_pilula = x1
+		y_pilula = y + (altura_cabecalho - altura_pilula) / 2
+		for st in reversed(itens_legenda(filial, cat_styles)):
+				largura = 2 + 20 + 10 + 7 + tela.largura_texto(st["legenda"], f_pilula)
+				tela.caixa(x_pilula - largura, y_pilula, x_pilula, y_pilula + altura_pilula, raio=altura_pilula / 2,
+						   fundo=colors.white, borda=colors.gray_200)
+				y_sw = y_pilula + (altura_pilula - 10) / 2
+				tela.caixa(x_pilula - largura + 11, y_sw, x_pilula - largura + 21, y_sw + 10, raio=3,
+						   fundo=st["bg"], borda=st["borda"])
+				tela.texto(x_pilula - largura + 28, y_pilula + 8, st["legenda"], f_pilula, colors.black)
+				x_pilula -= largura + 10
+		y += altura_cabecalho + 16
+
+		# Slots (.slot): horário e categoria
+		f_hora = roboto(800, 13)
+		f_categoria = roboto(700, 12)
+		altura_slot = 10 + tela.altura_linha(f_hora) + 4 + tela.altura_linha(f_categoria) + 10
+		f_dia = montserrat(800, 14)
+		altura_dia = 10 + tela.altura_linha(f_dia) + 10
+
+		def desenhar_slot(x_inicio, x_fim, y_slot, horario, categoria):
+				st = cat_styles[categoria]
+				tela.caixa(x_inicio, y_slot, x_fim, y_slot + altura_slot, raio=12, fundo=st["bg"])
+				tela.texto(x_inicio + 10, y_slot + 10, horario, f_hora, st["fg"], espacamento=0.2)
+				tela.texto(x_inicio + 10, y_slot + 10 + tela.altura_linha(f_hora) + 4, categoria.upper(),
+						   f_categoria, st["fg"], espacamento=0.6)
+
+		# Sábado (card separado, abaixo da grade)
+		if filial.sabado:
+				altura_sabado = 2 + altura_dia + 24 + len(filial.sabado) * (altura_slot + 10) - 10
+				y_sabado = fim - altura_sabado
+				tela.caixa(x0, y_sabado, x1, fim, raio=16, fundo=colors.white, borda=colors.gray_200)
+				tela.caixa(x0 + 1, y_sabado + 1, x1 - 1, y_sabado + 1 + altura_dia, raio=15, fundo=colors.gold,
+						   cantos=(True, True, False, False))
+				tela.texto(x0 + 13, y_sabado + 11, "SÁBADO", f_dia, colors.black, espacamento=1)
+				y_slot = y_sabado + 1 + altura_dia + 12
+				for horario, categoria in filial.sabado:
+						desenhar_slot(x0 + 13, x1 - 13, y_slot, horario, categoria)
+						y_slot += altura_slot + 10
+				fim = y_sabado - 14 - 16
+
+		# Grade dos dias úteis (o card corta os slots que não cabem, como o overflow: hidden)
+		n = len(filial.semana)
+		largura_dia = (x1 - x0 - 14 * (n - 1)) / n
+		for i, (dia, slots) in enumerate(filial.semana.items()):
+				xd = x0 + i * (largura_dia + 14)
+				tela.caixa(xd, y, xd + largura_dia, fim, raio=16, fundo=colors.white, borda=colors.gray_200)
+				tela.gradiente(xd + 1, y + 1, xd + largura_dia - 1, y + 1 + altura_dia, colors.blue, colors.gold,
+							   raio=15, cantos=(True, True, False, False))
+				tela.texto(xd + 13, y + 11, dia.upper(), f_dia, colors.white, espacamento=1)
+				y_slot = y + 1 + altura_dia + 10
+				for horario, categoria in slots:
+						if y_slot + altura_slot > fim - 1:
+								break
+						desenhar_slot(xd + 11, xd + largura_dia - 11, y_slot, horario, categoria)
+						y_slot += altura_slot + 10
+
+		tela.salvar(destino)
+
+
+def gerar_logo_transparente(src: Path, dst: Path) -> None:
 		"""Gera uma logo PNG com transparência removendo o branco do fundo.
 
-		Estratégia:
+		Estratégia (modo "border-connected" de imagem_ops):
 		- Considera como fundo os pixels "quase brancos".
-		- Remove apenas o fundo conectado às bordas (flood fill), preservando brancos internos.
+		- Remove apenas o fundo conectado às bordas (a partir dos 4 cantos),
+		  preservando brancos internos.
+		- O resultado fica no cache de derivados (hash do conteúdo da logo), então a
+		  logo só é reprocessada quando o arquivo muda.
 		"""
 
-		src = base_dir / "Logo.JPG"
-		dst = base_dir / "Logo_transparente.png"
-
 		if not src.exists():
-			return
-
-		if dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
-			return
-
-		img = Image.open(src).convert("RGB")
-		w, h = img.size
-		px = img.load()
-
-		# Define fundo como "quase branco" (ajuste fino para JPG com compressão)
-		def is_bg(x: int, y: int) -> bool:
-			r, g, b = px[x, y]
-			return r >= 245 and g >= 245 and b >= 245
-
-		visited = [[False] * w for _ in range(h)]
-		stack = [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
-
-		# Flood fill no fundo conectado às bordas
-		while stack:
-			x, y = stack.pop()
-			if x < 0 or y < 0 or x >= w or y >= h:
-				continue
-			if visited[y][x]:
-				continue
-			if not is_bg(x, y):
-				continue
-			visited[y][x] = True
-			stack.append((x + 1, y))
-			stack.append((x - 1, y))
-			stack.append((x, y + 1))
-			stack.append((x, y - 1))
-
-		rgba = img.convert("RGBA")
-		out_px = rgba.load()
-		for y in range(h):
-			row = visited[y]
-			for x in range(w):
-				if row[x]:
-					r, g, b, _a = out_px[x, y]
-					out_px[x, y] = (r, g, b, 0)
-
-		rgba.save(dst)
+				return
+
+		derivado = remover_fundo_em_cache(src, modo="border-connected")
+		copiar_se_diferente(derivado, dst)
 
 
 def main() -> None:
 		base_dir = Path(__file__).resolve().parent
-		out_dir = base_dir / "html"
-		out_dir.mkdir(parents=True, exist_ok=True)
 
-		gerar_logo_transparente(base_dir)
+		parser = argparse.ArgumentParser(description="Gera o calendário de treinos de cada filial")
+		parser.add_argument("--config", default=str(base_dir / "calendario_rajj.json"),
+							help="Arquivo JSON com marcas, categorias e filiais (padrão: calendario_rajj.json)")
+		parser.add_argument("--filial", action="append",
+							help="Gera só a filial indicada (pode repetir; padrão: todas)")
+		parser.add_argument("--png", nargs="?", const="original_posts", metavar="PASTA",
+							help="Também desenha o PNG direto com o Pillow, sem navegador (padrão: original_posts)")
+		parser.add_argument("--escala", type=float, default=1.0,
+							help="Fator de escala do PNG desenhado com --png (padrão: 1.0)")
+		args = parser.parse_args()
+
+		config = Path(args.config).resolve()
+		try:
+				calendarios = carregar_calendarios(config)
+		except (OSError, ValueError, KeyError) as e:
+				print(f"❌ Erro ao ler {config}: {e}")
+				sys.exit(1)
+
+		filiais = calendarios.filiais
+		if args.filial:
+				desconhecidas = set(args.filial) - {f.id for f in filiais}
+				if desconhecidas:
+						print(f"❌ Filial não encontrada: {', '.join(sorted(desconhecidas))}")
+						sys.exit(1)
+				filiais = [f for f in filiais if f.id in args.filial]
 
-		colors = obter_cores_marca()
-		html = gerar_html(colors)
+		out_dir = base_dir / "html"
+		out_dir.mkdir(parents=True, exist_ok=True)
 
-		out_file = out_dir / "calendario_treinos_rajj.html"
-		out_file.write_text(html, encoding="utf-8")
-		print(f"✅ Gerado: {out_file}")
+		# Logo e paleta são processadas uma vez por marca, não por filial
+		recursos_marca = {}
+		for filial in filiais:
+				if filial.marca not in recursos_marca:
+						logo = config.parent / calendarios.marcas[filial.marca]["logo"]
+						logo_png = logo.with_name(f"{logo.stem}_transparente.png")
+						gerar_logo_transparente(logo, logo_png)
+						recursos_marca[filial.marca] = (obter_cores_marca(logo), logo_png)
+
+				colors, logo_png = recursos_marca[filial.marca]
+				logo_rel = Path(os.path.relpath(logo_png, out_dir)).as_posix()
+				html = gerar_html(colors, filial, logo_rel)
+
+				out_file = out_dir / f"calendario_treinos_{filial.id}.html"
+				out_file.write_text(html, encoding="utf-8")
+				print(f"✅ Gerado: {out_file}")
+
+				if args.png:
+						png_file = Path(args.png) / f"calendario_treinos_{filial.id}.png"
+						desenhar_png(colors, filial, logo_png, png_file, args.escala)
+						print(f"🖼️  Desenhado: {png_file}")
 
 
 if __name__ == "__main__":
@@ -4,21 +4,49 @@ Script para gerar arquivos HTML de cronograma de TCC a partir de dados CSV.
 Gera um arquivo HTML para cada data diferente, organizando os dados cronologicamente.
 """
 
+import argparse
 import csv
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from collections import defaultdict
+from functools import partial
+
+from normalizacao import normalizar_membro_banca, normalizar_nome, normalizar_titulo, relatorio_pessoas
+from paginacao import ModeloLayout
+from validacao import CAMPO_LINHA, validar_dados
+
+# Campos enviados aos workers: só o que o template usa, como tuplas (registro compacto)
+CAMPOS_APRESENTACAO = (
+    'Hora',
+    'Nome',
+    'Título do trabalho',
+    'Orientador',
+    'Membro 1 da Banca',
+    'Membro 2 da Banca',
+    'Membro 3 da Banca (Opcional)',
+)
+
+_modelo_layout = None
 
 def ler_csv(arquivo_csv):
-    """Lê o arquivo CSV e retorna uma lista de dicionários com os dados."""
+    """
+    Lê o arquivo CSV e retorna uma lista de dicionários com os dados.
+    Cada registro guarda em CAMPO_LINHA a linha do arquivo onde começa (para as mensagens de erro).
+    """
     dados = []
     
-    with open(arquivo_csv, 'r', encoding='utf-8') as file:
+    with open(arquivo_csv, 'r', encoding='utf-8', newline='') as file:
         reader = csv.DictReader(file)
+        inicio = 2
         for row in reader:
             # Limpa espaços extras dos valores
             row = {k: v.strip() if v else '' for k, v in row.items()}
+            row[CAMPO_LINHA] = inicio
             dados.append(row)
+            # line_num é a última linha lida: o próximo registro começa depois dela
+            inicio = reader.line_num + 1
     
     return dados
 
@@ -80,21 +108,31 @@ def formatar_banca(orientador, membro1, membro2, membro3=""):
     if membro3:
         membros.append(membro3)
     
-    # Remove prefixos comuns dos nomes
-    membros_limpos = []
-    for membro in membros:
-        if membro:
-            # Remove prefixos como "Prof. Me.", "Esp.", etc.
-            nome_limpo = membro.replace("Prof. Me. ", "Prof. ").replace("Esp. ", "Prof. ").replace("Me. ", "Prof. ")
-            if not nome_limpo.startswith("Prof."):
-                nome_limpo = "Prof. " + nome_limpo
-            membros_limpos.append(nome_limpo)
+    # Unifica prefixos como "Prof. Me.", "Esp.", "Dr." em "Prof." (com cache por nome);
+    # membros que ficam vazios (só espaços ou só o título) são pulados
+    membros_limpos = [membro for membro in map(normalizar_membro_banca, membros) if membro]
     
     return ", ".join(membros_limpos)
 
-def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
-    """Gera o template HTML com os dados fornecidos."""
-    
+def formatar_item(item):
+    """Retorna (hora, nome, título, banca) de uma apresentação já formatados para exibição."""
+    hora = datetime.strptime(item['Hora'], '%H:%M:%S').strftime('%H:%M')
+    nome = normalizar_nome(item['Nome'])
+    titulo = normalizar_titulo(item['Título do trabalho'])
+    banca = formatar_banca(
+        item['Orientador'],
+        item['Membro 1 da Banca'],
+        item['Membro 2 da Banca'],
+        item.get('Membro 3 da Banca (Opcional)', '')
+    )
+    return hora, nome, titulo, banca
+
+def rotulo_dia(dia_numero, parte=1, total=1):
+    """Rótulo do dia no banner: "N" ou, para dias divididos em slides, "N (parte/total)"."""
+    return f"{dia_numero} ({parte}/{total})" if total > 1 else dia_numero
+
+def texto_banner(data_exibicao, dia_rotulo):
+    """Texto do banner da data, com o mês em português."""
     # Mapear meses para português
     meses_pt = {
         'January': 'Janeiro', 'February': 'Fevereiro', 'March': 'Março',
@@ -106,18 +144,30 @@ def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
     for ing, pt in meses_pt.items():
         data_exibicao = data_exibicao.replace(ing, pt)
     
+    return f"📅 DIA {dia_rotulo}: {data_exibicao}"
+
+def paginar_dia(itens, modelo, dia_numero, data_exibicao):
+    """
+    Divide as apresentações de um dia em páginas que cabem no flyer (1080x1350),
+    descontando as linhas a mais do banner da data quando ele quebra.
+    """
+    alturas = []
+    for item in itens:
+        _hora, nome, titulo, banca = formatar_item(item)
+        alturas.append(modelo.altura_item(nome, titulo, banca))
+    paginas = modelo.paginar_com_banner(
+        alturas,
+        lambda total: texto_banner(data_exibicao, rotulo_dia(dia_numero, total, total))
+    )
+    return [[itens[i] for i in pagina] for pagina in paginas]
+
+def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
+    """Gera o template HTML com os dados fornecidos."""
+    
     # Gerar itens do cronograma
     cronograma_html = ""
     for item in itens_cronograma:
-        hora = datetime.strptime(item['Hora'], '%H:%M:%S').strftime('%H:%M')
-        nome = item['Nome'].title()  # Aplica title case (primeira letra maiúscula)
-        titulo = item['Título do trabalho'].title()  # Aplica title case (primeira letra maiúscula)
-        banca = formatar_banca(
-            item['Orientador'],
-            item['Membro 1 da Banca'],
-            item['Membro 2 da Banca'],
-            item['Membro 3 da Banca (Opcional)']
-        )
+        hora, nome, titulo, banca = formatar_item(item)
         
         cronograma_html += f"""            <div class="schedule-item">
                 <div class="time">{hora}</div>
@@ -306,6 +356,8 @@ def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
             display: flex;
             flex-direction: column;
             gap: 8px;
+            /* Palavras maiores que a linha quebram em vez de transbordar (ver paginacao.contar_linhas) */
+            overflow-wrap: anywhere;
         }}
 
         .student-name {{
@@ -364,7 +416,7 @@ def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
         </div>
 
         <div class="date-banner">
-            📅 DIA {dia_numero}: {data_exibicao}
+            {texto_banner(data_exibicao, dia_numero)}
         </div>
 
         <div class="schedule">
@@ -378,18 +430,73 @@ def gerar_html_template(data_exibicao, dia_numero, itens_cronograma):
     
     return template
 
+def compactar_dia(dia_numero, data, itens):
+    """Converte um dia em um registro compacto (tuplas) para envio a um processo worker."""
+    linhas = tuple(tuple(item.get(campo, '') for campo in CAMPOS_APRESENTACAO) for item in itens)
+    return dia_numero, data, linhas
+
+def gerar_arquivos_dia(registro, pasta_html):
+    """
+    Gera e grava os HTMLs de um dia (um ou mais slides, conforme a paginação).
+    Retorna a lista de (nome_arquivo, quantidade_de_apresentações) na ordem das páginas.
+    """
+    global _modelo_layout
+    if _modelo_layout is None:
+        _modelo_layout = ModeloLayout()
+    
+    dia_numero, data, linhas = registro
+    data_exibicao, _ = formatar_data_exibicao(data)
+    itens_dia = [dict(zip(CAMPOS_APRESENTACAO, linha)) for linha in linhas]
+    paginas = paginar_dia(itens_dia, _modelo_layout, dia_numero, data_exibicao)
+    
+    gerados = []
+    for parte, itens in enumerate(paginas, 1):
+        # Dias que não cabem em um slide viram "Dia N (1/2)", "Dia N (2/2)", ...
+        dia_rotulo = rotulo_dia(dia_numero, parte, len(paginas))
+        if len(paginas) > 1:
+            nome_arquivo = f"Dia{dia_numero}_{parte}.html"
+        else:
+            nome_arquivo = f"Dia{dia_numero}.html"
+        
+        html_content = gerar_html_template(data_exibicao, dia_rotulo, itens)
+        caminho_arquivo = os.path.join(pasta_html, nome_arquivo)
+        
+        with open(caminho_arquivo, 'w', encoding='utf-8') as file:
+            file.write(html_content)
+        
+        gerados.append((nome_arquivo, len(itens)))
+    
+    return gerados
+
 def main():
     """Função principal que coordena a geração dos HTMLs."""
+    parser = argparse.ArgumentParser(description="Gerador de HTMLs do cronograma de TCC")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Número de processos para gerar os dias em paralelo (padrão: 1)"
+    )
+    args = parser.parse_args()
+    
     arquivo_csv = 'CSV/data.csv'
     pasta_html = 'html'
     
+    print("Lendo dados do CSV...")
+    dados = ler_csv(arquivo_csv)
+    
+    print("Validando dados...")
+    erros = validar_dados(dados)
+    if erros:
+        for erro in erros:
+            print(f"❌ {erro}")
+        print(f"\n❌ {len(erros)} erro(s) no CSV. Nenhum arquivo HTML foi gerado.")
+        sys.exit(1)
+    
     # Cria a pasta html se não existir
     if not os.path.exists(pasta_html):
         os.makedirs(pasta_html)
     
-    print("Lendo dados do CSV...")
-    dados = ler_csv(arquivo_csv)
-    
     print("Agrupando dados por data...")
     dados_por_data = agrupar_por_data(dados)
     
@@ -401,23 +508,30 @@ def main():
     for i, data in enumerate(datas_ordenadas, 1):
         print(f"  - Dia {i}: {data} ({len(dados_por_data[data])} apresentações)")
     
+    relatorio = relatorio_pessoas(dados)
+    print(f"Pessoas únicas no lote ({relatorio['linhas']} linhas): "
+          f"{len(relatorio['alunos'])} alunos, {len(relatorio['professores'])} professores")
+    
     print("\nGerando arquivos HTML...")
     
-    for i, data in enumerate(datas_ordenadas, 1):
-        data_exibicao, _ = formatar_data_exibicao(data)
-        itens = dados_por_data[data]
-        
-        html_content = gerar_html_template(data_exibicao, i, itens)
-        
-        nome_arquivo = f"Dia{i}.html"
-        caminho_arquivo = os.path.join(pasta_html, nome_arquivo)
-        
-        with open(caminho_arquivo, 'w', encoding='utf-8') as file:
-            file.write(html_content)
-        
-        print(f"✅ Gerado: {nome_arquivo} ({len(itens)} apresentações)")
+    registros = [compactar_dia(i, data, dados_por_data[data]) for i, data in enumerate(datas_ordenadas, 1)]
+    gerar = partial(gerar_arquivos_dia, pasta_html=pasta_html)
+    
+    if args.jobs > 1:
+        chunksize = max(1, len(registros) // (args.jobs * 4))
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            resultados = list(executor.map(gerar, registros, chunksize=chunksize))
+    else:
+        resultados = [gerar(registro) for registro in registros]
+    
+    # executor.map preserva a ordem dos registros, então a saída segue a ordem dos dias
+    total_arquivos = 0
+    for arquivos_dia in resultados:
+        for nome_arquivo, quantidade in arquivos_dia:
+            total_arquivos += 1
+            print(f"✅ Gerado: {nome_arquivo} ({quantidade} apresentações)")
     
-    print(f"\n✨ Processo concluído! {len(datas_ordenadas)} arquivos HTML foram gerados na pasta '{pasta_html}'.")
+    print(f"\n✨ Processo concluído! {total_arquivos} arquivos HTML foram gerados na pasta '{pasta_html}'.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Normalização de nomes de alunos, títulos de trabalhos e membros de banca.
+As regras são pré-compiladas e os resultados ficam em cache, de modo que o custo
+cresce com o número de nomes únicos e não com o número de linhas do CSV.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Sequência de títulos acadêmicos no início do nome: "Prof. Me. ", "Profa. Dra. ", "Esp. ", ...
+RE_TITULOS = re.compile(
+    r'^(?:(?:prof(?:a|ª)?|me|ma|msc|dr|dra|esp)\.\s*)+',
+    re.IGNORECASE
+)
+RE_ESPACOS = re.compile(r'\s+')
+
+PREFIXO_BANCA = "Prof. "
+
+COLUNAS_BANCA = (
+    'Orientador',
+    'Membro 1 da Banca',
+    'Membro 2 da Banca',
+    'Membro 3 da Banca (Opcional)',
+)
+
+
+@lru_cache(maxsize=4096)
+def normalizar_nome(nome):
+    """Aplica title case ao nome do aluno (primeira letra de cada palavra maiúscula)."""
+    return RE_ESPACOS.sub(' ', nome).strip().title()
+
+
+@lru_cache(maxsize=4096)
+def normalizar_titulo(titulo):
+    """Aplica title case ao título do trabalho."""
+    return RE_ESPACOS.sub(' ', titulo).strip().title()
+
+
+@lru_cache(maxsize=4096)
+def normalizar_membro_banca(membro):
+    """Unifica os títulos acadêmicos de um membro da banca no prefixo "Prof."."""
+    nome = RE_TITULOS.sub('', RE_ESPACOS.sub(' ', membro).strip())
+    return PREFIXO_BANCA + nome if nome else ''
+
+
+def relatorio_pessoas(dados):
+    """Conta as pessoas únicas de um lote: alunos e professores (orientadores e banca)."""
+    alunos = Counter()
+    professores = Counter()
+    for item in dados:
+        if item.get('Nome'):
+            alunos[normalizar_nome(item['Nome'])] += 1
+        for coluna in COLUNAS_BANCA:
+            membro = normalizar_membro_banca(item.get(coluna) or '')
+            if membro:
+                professores[membro] += 1
+
+    return {
+        "linhas": len(dados),
+        "alunos": alunos,
+        "professores": professores,
+    }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Modelo de layout por métricas de texto para o flyer do carrossel TCC.
+Estima a altura de cada schedule-item e do banner da data sem navegador e divide dias que
+não cabem em um slide.
+"""
+
+import unicodedata
+
+# Larguras de avanço aproximadas (em "em") da Roboto Regular.
+# Caracteres ausentes usam a largura média da sua classe.
+LARGURAS_ROBOTO = {
+    ' ': 0.248, 'a': 0.544, 'b': 0.561, 'c': 0.523, 'd': 0.564, 'e': 0.529,
+    'f': 0.347, 'g': 0.561, 'h': 0.551, 'i': 0.243, 'j': 0.239, 'k': 0.507,
+    'l': 0.243, 'm': 0.876, 'n': 0.552, 'o': 0.570, 'p': 0.561, 'q': 0.568,
+    'r': 0.339, 's': 0.516, 't': 0.327, 'u': 0.551, 'v': 0.484, 'w': 0.751,
+    'x': 0.496, 'y': 0.473, 'z': 0.496, '.': 0.263, ',': 0.196, ':': 0.242,
+    ';': 0.212, '-': 0.276, '(': 0.342, ')': 0.348, '"': 0.320, "'": 0.174,
+    '/': 0.412, '!': 0.258, '?': 0.473, '&': 0.622, '–': 0.677, '—': 0.799,
+}
+LARGURA_MAIUSCULA = 0.650
+LARGURA_DIGITO = 0.561
+LARGURA_PADRAO = 0.560
+# Emojis e outros símbolos (ex.: o 📅 do banner) ocupam mais que uma letra
+LARGURA_SIMBOLO = 1.250
+
+# Fator multiplicativo aproximado por peso/estilo em relação à Roboto Regular.
+FATOR_PESO = {
+    300: 0.98,
+    400: 1.00,
+    500: 1.02,
+    600: 1.04,
+    700: 1.06,
+}
+
+# A Montserrat é ~15% mais larga que a Roboto no mesmo peso (sem TTF, a tabela da Roboto é escalada).
+FATOR_MONTSERRAT = 1.15
+
+# line-height "normal" das famílias usadas no template.
+LINE_HEIGHT_ROBOTO = 1.172
+LINE_HEIGHT_MONTSERRAT = 1.219
+
+# Margem de segurança sobre a largura estimada (a tabela é aproximada).
+MARGEM_LARGURA = 1.05
+
+# Geometria do template em gerar_html_template() (valores em px).
+# Altura útil da .schedule = 1350 (flyer)
+#   - 180 (header: 60 + logo 100 + 20)
+#   - 152 (title-section: 20 + h1 68 + 10 + h2 34 + 20)
+#   - 139 (date-banner: 30 + 20 + 39 + 20 + 30, com o texto em uma linha; ver altura_extra_banner)
+#   - 40 (padding vertical da .schedule)
+#   - 20 (footer)
+ALTURA_SCHEDULE = 819
+GAP_SCHEDULE = 35
+# Largura da .info = 880 (schedule) - 4 (borda) - 30 (padding) - 110 (hora) - 30 (gap)
+LARGURA_INFO = 706
+PADDING_TEMA_H = 24
+PADDING_TEMA_V = 16
+GAP_INFO = 8
+MARGEM_BANCA = 5
+ALTURA_HORA = 32 * LINE_HEIGHT_MONTSERRAT
+# Largura do texto do .date-banner = 1080 - 160 (margem) - 40 (padding)
+LARGURA_BANNER = 880
+ALTURA_LINHA_BANNER = 32 * LINE_HEIGHT_MONTSERRAT
+
+
+def _largura_caractere(caractere):
+    """Retorna a largura (em) de um caractere segundo a tabela da Roboto."""
+    if caractere in LARGURAS_ROBOTO:
+        return LARGURAS_ROBOTO[caractere]
+    base = unicodedata.normalize('NFD', caractere)[:1] or caractere
+    if base in LARGURAS_ROBOTO:
+        return LARGURAS_ROBOTO[base]
+    if base.isupper():
+        return LARGURA_MAIUSCULA
+    if base.isdigit():
+        return LARGURA_DIGITO
+    if unicodedata.category(base) == 'So':
+        return LARGURA_SIMBOLO
+    return LARGURA_PADRAO
+
+
+class MetricaFonte:
+    """Mede larguras de texto para um tamanho e peso de fonte.
+
+    Usa a tabela embutida da Roboto por padrão (escalada por fator_familia para
+    outras famílias). Se um arquivo TTF local for informado e o Pillow estiver
+    disponível, usa as métricas reais da fonte.
+    """
+
+    def __init__(self, tamanho, peso=400, arquivo_ttf=None, fator_familia=1.0):
+        self.tamanho = tamanho
+        self.fator = FATOR_PESO.get(peso, 1.0) * fator_familia
+        self._fonte = None
+        self._cache = {}
+        if arquivo_ttf:
+            try:
+                from PIL import ImageFont
+                self._fonte = ImageFont.truetype(arquivo_ttf, tamanho)
+            except (ImportError, OSError):
+                self._fonte = None
+
+    def largura(self, texto):
+        """Largura estimada do texto em px."""
+        if texto in self._cache:
+            return self._cache[texto]
+        if self._fonte is not None:
+            valor = self._fonte.getlength(texto)
+        else:
+            valor = sum(_largura_caractere(c) for c in texto) * self.tamanho * self.fator
+        valor *= MARGEM_LARGURA
+        self._cache[texto] = valor
+        return valor
+
+
+def contar_linhas(texto, metrica, largura_maxima):
+    """
+    Conta as linhas do texto com quebra gulosa por palavra, como o navegador faz.
+    Palavras maiores que a linha são partidas, como com overflow-wrap: anywhere (o .info
+    do template usa essa regra justamente para não transbordar).
+    """
+    palavras = texto.split()
+    if not palavras:
+        return 1
+
+    largura_espaco = metrica.largura(' ')
+    linhas = 1
+    largura_linha = 0.0
+    for palavra in palavras:
+        largura_palavra = metrica.largura(palavra)
+        if largura_linha == 0:
+            largura_linha = largura_palavra
+        elif largura_linha + largura_espaco + largura_palavra <= largura_maxima:
+            largura_linha += largura_espaco + largura_palavra
+        else:
+            linhas += 1
+            largura_linha = largura_palavra
+        # Palavras maiores que a linha quebram em várias linhas (overflow-wrap: anywhere)
+        while largura_linha > largura_maxima:
+            linhas += 1
+            largura_linha -= largura_maxima
+    return linhas
+
+
+class ModeloLayout:
+    """Estimador de altura dos schedule-items do template do carrossel."""
+
+    def __init__(self, arquivos_ttf=None):
+        arquivos_ttf = arquivos_ttf or {}
+        self.metrica_nome = MetricaFonte(28, 700, arquivos_ttf.get('bold'))
+        self.metrica_tema = MetricaFonte(20, 500, arquivos_ttf.get('italic'))
+        self.metrica_banca = MetricaFonte(16, 400, arquivos_ttf.get('regular'))
+        self.metrica_banner = MetricaFonte(32, 700, arquivos_ttf.get('montserrat_bold'), FATOR_MONTSERRAT)
+
+    def altura_extra_banner(self, texto):
+        """Altura (px) que o banner da data ocupa além da linha já descontada em ALTURA_SCHEDULE."""
+        return (contar_linhas(texto, self.metrica_banner, LARGURA_BANNER) - 1) * ALTURA_LINHA_BANNER
+
+    def altura_item(self, nome, titulo, banca):
+        """Altura estimada (px) de um schedule-item já formatado."""
+        linhas_nome = contar_linhas(nome, self.metrica_nome, LARGURA_INFO)
+        linhas_tema = contar_linhas(f"Tema: {titulo}", self.metrica_tema, LARGURA_INFO - PADDING_TEMA_H)
+        linhas_banca = contar_linhas(f"Banca: {banca}", self.metrica_banca, LARGURA_INFO)
+
+        altura_info = (
+            linhas_nome * 28 * LINE_HEIGHT_ROBOTO
+            + GAP_INFO
+            + linhas_tema * 20 * LINE_HEIGHT_ROBOTO + PADDING_TEMA_V
+            + GAP_INFO
+            + MARGEM_BANCA + linhas_banca * 16 * 1.4
+        )
+        return max(ALTURA_HORA, altura_info)
+
+    def paginar(self, alturas, altura_disponivel=ALTURA_SCHEDULE):
+        """Agrupa índices de itens em páginas que cabem na área do cronograma.
+
+        Retorna uma lista de listas de índices, preservando a ordem original.
+        Um item que sozinho não cabe ocupa uma página própria.
+        """
+        paginas = []
+        atual = []
+        ocupado = 0.0
+        for indice, altura in enumerate(alturas):
+            necessario = altura if not atual else ocupado + GAP_SCHEDULE + altura
+            if atual and necessario > altura_disponivel:
+                paginas.append(atual)
+                atual = [indice]
+                ocupado = altura
+            else:
+                atual.append(indice)
+                ocupado = necessario
+        if atual:
+            paginas.append(atual)
+        return paginas
+
+    def paginar_com_banner(self, alturas, texto_banner):
+        """Como paginar, descontando da área do cronograma as linhas a mais do banner da data.
+
+        texto_banner(total_paginas) retorna o texto mais largo do banner quando o dia
+        tem esse total de páginas ("Dia N (P/P)": o rótulo cresce ao dividir o dia).
+        """
+        total = 1
+        while True:
+            disponivel = ALTURA_SCHEDULE - self.altura_extra_banner(texto_banner(total))
+            paginas = self.paginar(alturas, disponivel)
+            if len(paginas) <= total:
+                return paginas
+            total = len(paginas)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Validação do CSV de apresentações antes da geração dos HTMLs.
+Verifica todas as linhas em uma única passada e acumula os erros com o número da linha,
+para que um erro de digitação não seja descoberto só depois de um ciclo de renderização.
+"""
+
+from datetime import datetime
+
+COLUNAS_OBRIGATORIAS = (
+    'Nome',
+    'Título do trabalho',
+    'Orientador',
+    'Membro 1 da Banca',
+    'Membro 2 da Banca',
+    'Data',
+    'Hora',
+)
+# Membros vazios são pulados na banca (ver formatar_banca); só é erro se não houver nenhum
+COLUNAS_MEMBROS = (
+    'Membro 1 da Banca',
+    'Membro 2 da Banca',
+    'Membro 3 da Banca (Opcional)',
+)
+
+# Chave em que ler_csv guarda a linha do arquivo onde cada registro começa
+# (registros com campos entre aspas podem ocupar várias linhas)
+CAMPO_LINHA = '_linha'
+
+FORMATOS_DATA = ('%d/%m/%y', '%d/%m/%Y')
+FORMATO_HORA = '%H:%M:%S'
+
+
+def _data_valida(valor):
+    """Indica se a data está em DD/MM/AA ou DD/MM/AAAA."""
+    for formato in FORMATOS_DATA:
+        try:
+            datetime.strptime(valor, formato)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def _hora_valida(valor):
+    """Indica se a hora está em HH:MM:SS."""
+    try:
+        datetime.strptime(valor, FORMATO_HORA)
+        return True
+    except ValueError:
+        return False
+
+
+def validar_dados(dados):
+    """
+    Valida as linhas lidas do CSV e retorna a lista de mensagens de erro (vazia se tudo estiver certo).
+    A numeração segue o arquivo (CAMPO_LINHA, gravado por ler_csv); sem ela, conta um registro
+    por linha a partir da linha 2 (a linha 1 é o cabeçalho).
+    """
+    if not dados:
+        return ["CSV sem nenhuma apresentação"]
+
+    erros = []
+    colunas = set(dados[0].keys()) - {CAMPO_LINHA}
+    faltantes = [coluna for coluna in COLUNAS_OBRIGATORIAS if coluna not in colunas]
+    for coluna in faltantes:
+        erros.append(f"linha 1: coluna obrigatória ausente '{coluna}'")
+    if faltantes:
+        # Sem as colunas obrigatórias, a validação linha a linha só repetiria o mesmo erro
+        return erros
+
+    for indice, item in enumerate(dados, 2):
+        numero = item.get(CAMPO_LINHA, indice)
+        for coluna in COLUNAS_OBRIGATORIAS:
+            if coluna not in COLUNAS_MEMBROS and not item.get(coluna):
+                erros.append(f"linha {numero}: campo '{coluna}' vazio")
+        if not any(item.get(coluna) for coluna in COLUNAS_MEMBROS):
+            erros.append(f"linha {numero}: nenhum membro da banca preenchido")
+
+        data = item.get('Data')
+        if data and not _data_valida(data):
+            erros.append(f"linha {numero}: Data '{data}' fora do formato DD/MM/AA ou DD/MM/AAAA")
+
+        hora = item.get('Hora')
+        if hora and not _hora_valida(hora):
+            erros.append(f"linha {numero}: Hora '{hora}' fora do formato HH:MM:SS")
+
+    return erros
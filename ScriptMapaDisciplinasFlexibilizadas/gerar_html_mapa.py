@@ -2,47 +2,147 @@
 """
 Script para gerar arquivo HTML com mapa de disciplinas flexibilizadas.
 Cria uma visualização organizada das disciplinas por curso com suas respectivas cargas horárias.
+
+As disciplinas vêm de um catálogo CSV (curso, disciplina, carga_horaria), lido linha a
+linha; contagens e cargas horárias são calculadas na mesma passada. Catálogos grandes
+são divididos em páginas por grupo de cursos (mapa_disciplinas_flexibilizadas_01.html, ...).
 """
 
+import argparse
+import colorsys
+import csv
+import hashlib
 import os
+import re
+import sys
 from collections import defaultdict
-
-def obter_disciplinas_flexibilizadas():
-    """Retorna o dicionário com as disciplinas flexibilizadas organizadas por curso."""
-    disciplinas = {
-        "Matemática": [
-            {"nome": "Fundamentos da Lógica Matemática", "carga_horaria": "60h"},
-            {"nome": "Estatística Aplicada à Educação", "carga_horaria": "60h"}
-        ],
-        "Geografia": [
-            {"nome": "Geoprocessamento", "carga_horaria": "60h"}
-        ],
-        "Pedagogia": [
-            {"nome": "Tecnologia Educacional", "carga_horaria": "60h"}
-        ],
-        "Letras": [
-            {"nome": "Língua Estrangeira Instrumental", "carga_horaria": "60h"},
-            {"nome": "Letramentos Acadêmicos e a Escrita", "carga_horaria": "60h"}
-        ]
+from html import escape
+from pathlib import Path
+
+# Módulos compartilhados (ex.: raster_direto) ficam na raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CAMPOS_CATALOGO = ('curso', 'disciplina', 'carga_horaria')
+CATALOGO_PADRAO = Path(__file__).resolve().parent / "catalogo_disciplinas.csv"
+
+# Disciplinas por página do mapa; um curso só é quebrado se sozinho passar disso
+MAX_DISCIPLINAS_PAGINA = 12
+
+RE_CARGA = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+def ler_catalogo(caminho):
+    """Lê o catálogo CSV linha a linha (sem carregar o arquivo inteiro)."""
+    with open(caminho, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        faltantes = [campo for campo in CAMPOS_CATALOGO if campo not in (reader.fieldnames or [])]
+        if faltantes:
+            raise ValueError(f"Colunas ausentes no catálogo: {', '.join(faltantes)}")
+        for linha in reader:
+            if (linha['curso'] or '').strip() and (linha['disciplina'] or '').strip():
+                yield linha
+
+def carga_em_horas(carga_horaria):
+    """Converte "60h", "60 h", "45,5h" ou "60" em horas (0 quando não há número)."""
+    m = RE_CARGA.search(carga_horaria or '')
+    if not m:
+        return 0
+    horas = float(m.group(1).replace(',', '.'))
+    return int(horas) if horas.is_integer() else horas
+
+def formatar_horas(horas):
+    """60 -> "60", 68.5 -> "68,5"."""
+    if float(horas).is_integer():
+        return str(int(horas))
+    return f"{horas:.1f}".replace('.', ',')
+
+def agregar_catalogo(linhas):
+    """
+    Agrupa as disciplinas por curso (na ordem em que aparecem) e calcula as estatísticas
+    em uma única passada. Retorna (disciplinas_por_curso, estatisticas).
+    """
+    disciplinas_por_curso = defaultdict(list)
+    carga_por_curso = defaultdict(int)
+    cargas = set()
+    carga_total = 0
+    
+    for linha in linhas:
+        curso = linha['curso'].strip()
+        horas = carga_em_horas(linha['carga_horaria'])
+        carga = f"{formatar_horas(horas)}h" if horas else (linha['carga_horaria'] or '').strip()
+        disciplinas_por_curso[curso].append({"nome": linha['disciplina'].strip(), "carga_horaria": carga})
+        carga_por_curso[curso] += horas
+        carga_total += horas
+        cargas.add(horas)
+    
+    estatisticas = {
+        "total_disciplinas": sum(len(disciplinas) for disciplinas in disciplinas_por_curso.values()),
+        "total_cursos": len(disciplinas_por_curso),
+        "carga_total": carga_total,
+        "carga_por_curso": dict(carga_por_curso),
+        "cargas": sorted(cargas),
     }
-    return disciplinas
-
-def gerar_cards_disciplinas(disciplinas_por_curso):
-    """Gera o HTML dos cards das disciplinas organizadas por curso."""
+    return dict(disciplinas_por_curso), estatisticas
+
+CORES_CURSOS = {
+    "Matemática": "#FF6B6B",
+    "Geografia": "#4ECDC4", 
+    "Pedagogia": "#45B7D1",
+    "Letras": "#96CEB4"
+}
+
+def cor_curso(curso):
+    """
+    Cor do cabeçalho do curso: a de CORES_CURSOS ou uma derivada do hash do nome
+    (a mesma em todas as execuções e máquinas).
+    """
+    if curso in CORES_CURSOS:
+        return CORES_CURSOS[curso]
+    matiz = int.from_bytes(hashlib.sha1(curso.encode('utf-8')).digest()[:2], 'big') / 0xFFFF
+    r, g, b = colorsys.hls_to_rgb(matiz, 0.62, 0.55)
+    return f"#{round(r * 255):02X}{round(g * 255):02X}{round(b * 255):02X}"
+
+def paginar_cursos(disciplinas_por_curso, max_disciplinas=MAX_DISCIPLINAS_PAGINA):
+    """
+    Distribui os cursos em páginas de até max_disciplinas disciplinas sem separar um curso;
+    só um curso maior que uma página inteira é quebrado em partes "(cont.)".
+    Retorna uma lista de páginas, cada uma com os grupos (curso, titulo, disciplinas).
+    """
+    paginas = []
+    atual = []
+    ocupadas = 0
+    for curso, disciplinas in disciplinas_por_curso.items():
+        for inicio in range(0, len(disciplinas), max_disciplinas):
+            parte = disciplinas[inicio:inicio + max_disciplinas]
+            titulo = curso if inicio == 0 else f"{curso} (cont.)"
+            if atual and ocupadas + len(parte) > max_disciplinas:
+                paginas.append(atual)
+                atual = []
+                ocupadas = 0
+            atual.append((curso, titulo, parte))
+            ocupadas += len(parte)
+    if atual:
+        paginas.append(atual)
+    return paginas
+
+def descricao_carga(estatisticas):
+    """Frase sobre a carga horária para a introdução (com <strong> no destaque)."""
+    cargas = [carga for carga in estatisticas['cargas'] if carga]
+    if len(cargas) == 1:
+        return f"Cada disciplina oferece <strong>{formatar_horas(cargas[0])} horas</strong> de conteúdo especializado em diferentes áreas do conhecimento."
+    if cargas:
+        return f"As disciplinas têm de <strong>{formatar_horas(cargas[0])} a {formatar_horas(cargas[-1])} horas</strong> de conteúdo especializado em diferentes áreas do conhecimento."
+    return "As disciplinas oferecem conteúdo especializado em diferentes áreas do conhecimento."
+
+def gerar_cards_disciplinas(grupos):
+    """Gera o HTML dos cards das disciplinas de uma página, grupo a grupo (curso, titulo, disciplinas)."""
     cards_html = ""
-    cores_cursos = {
-        "Matemática": "#FF6B6B",
-        "Geografia": "#4ECDC4", 
-        "Pedagogia": "#45B7D1",
-        "Letras": "#96CEB4"
-    }
     
-    for curso, disciplinas in disciplinas_por_curso.items():
-        cor = cores_cursos.get(curso, "#6C5CE7")
+    for curso, titulo, disciplinas in grupos:
+        cor = cor_curso(curso)
         
         cards_html += f"""        <div class="course-section">
             <div class="course-header" style="background: linear-gradient(135deg, {cor} 0%, {cor}dd 100%);">
-                <h3>{curso}</h3>
+                <h3>{escape(titulo)}</h3>
                 <div class="course-badge">{len(disciplinas)} disciplina{'s' if len(disciplinas) > 1 else ''}</div>
             </div>
             <div class="subjects-grid">
@@ -50,10 +150,10 @@ def gerar_cards_disciplinas(disciplinas_por_curso):
         
         for disciplina in disciplinas:
             cards_html += f"""                <div class="subject-card">
-                    <div class="subject-name">{disciplina['nome']}</div>
+                    <div class="subject-name">{escape(disciplina['nome'])}</div>
                     <div class="subject-load">
                         <span class="load-icon">⏱️</span>
-                        {disciplina['carga_horaria']}
+                        {escape(disciplina['carga_horaria'])}
                     </div>
                 </div>
 """
@@ -65,24 +165,17 @@ def gerar_cards_disciplinas(disciplinas_por_curso):
     
     return cards_html
 
-def calcular_estatisticas(disciplinas_por_curso):
-    """Calcula estatísticas gerais das disciplinas."""
-    total_disciplinas = sum(len(disciplinas) for disciplinas in disciplinas_por_curso.values())
-    total_cursos = len(disciplinas_por_curso)
-    
-    # Assume que todas têm 60h para cálculo da carga total
-    carga_total = total_disciplinas * 60
-    
-    return {
-        "total_disciplinas": total_disciplinas,
-        "total_cursos": total_cursos,
-        "carga_total": carga_total
-    }
+def subtitulo_pagina(pagina, total_paginas):
+    subtitulo = "Bacharelado em Sistemas de Informação - FASI"
+    return f"{subtitulo} • Página {pagina}/{total_paginas}" if total_paginas > 1 else subtitulo
 
-def gerar_html_mapa(disciplinas_por_curso, estatisticas):
-    """Gera o template HTML completo com o mapa de disciplinas."""
+def gerar_html_mapa(grupos, estatisticas, pagina=1, total_paginas=1):
+    """
+    Gera o template HTML completo com o mapa de disciplinas de uma página.
+    As estatísticas do cabeçalho são sempre as do catálogo inteiro.
+    """
     
-    cards_disciplinas = gerar_cards_disciplinas(disciplinas_por_curso)
+    cards_disciplinas = gerar_cards_disciplinas(grupos)
     
     template = f"""<!DOCTYPE html>
 <html lang="pt-br">
@@ -343,7 +436,7 @@ def gerar_html_mapa(disciplinas_por_curso, estatisticas):
     <div class="container">
         <header>
             <h1>📚 MAPA DE DISCIPLINAS FLEXIBILIZADAS</h1>
-            <p class="subtitle">Bacharelado em Sistemas de Informação - FASI</p>
+            <p class="subtitle">{subtitulo_pagina(pagina, total_paginas)}</p>
         </header>
 
         <div class="stats-banner">
@@ -356,7 +449,7 @@ def gerar_html_mapa(disciplinas_por_curso, estatisticas):
                 <div class="stat-label">Cursos</div>
             </div>
             <div class="stat-item">
-                <div class="stat-number">{estatisticas['carga_total']}h</div>
+                <div class="stat-number">{formatar_horas(estatisticas['carga_total'])}h</div>
                 <div class="stat-label">Carga Horária Total</div>
             </div>
         </div>
@@ -364,7 +457,7 @@ def gerar_html_mapa(disciplinas_por_curso, estatisticas):
         <div class="main-content">
             <div class="intro-text">
                 Explore as <span class="highlight">disciplinas flexibilizadas</span> disponíveis para complementar sua formação acadêmica.<br>
-                Cada disciplina oferece <strong>60 horas</strong> de conteúdo especializado em diferentes áreas do conhecimento.
+                {descricao_carga(estatisticas)}
             </div>
 
             <div class="courses-container">
@@ -383,39 +476,206 @@ def gerar_html_mapa(disciplinas_por_curso, estatisticas):
     
     return template
 
+def desenhar_png_mapa(grupos, estatisticas, destino, escala=1.0, pagina=1, total_paginas=1):
+    """
+    Desenha o mapa direto em PNG com o Pillow, sem passar pelo navegador.
+    Segue as medidas do CSS de gerar_html_mapa na viewport "original" do gerar_posts.py
+    (1200px, container em 95vw); sombras, emojis e a animação do cabeçalho ficam de fora.
+    """
+    from raster_direto import Tela, cor_rgb, sem_emoji
+
+    largura_pagina = 1200
+    largura = 1140
+    interno = largura - 80
+    colunas = max(1, (interno - 60 + 20) // (300 + 20))
+    largura_card = (interno - 60 - 20 * (colunas - 1)) / colunas
+
+    medida = Tela(1, 1, escala=escala)
+    f_h1 = medida.fonte("Montserrat", 800, 48)
+    f_sub = medida.fonte("Montserrat", 400, 20)
+    f_numero = medida.fonte("Montserrat", 800, 36)
+    f_rotulo = medida.fonte("Roboto", 600, 14)
+    f_intro = medida.fonte("Roboto", 400, 18)
+    f_curso = medida.fonte("Montserrat", 700, 24)
+    f_badge = medida.fonte("Roboto", 600, 12)
+    f_disciplina = medida.fonte("Roboto", 600, 18)
+    f_carga = medida.fonte("Roboto", 600, 16)
+    f_rodape = medida.fonte("Roboto", 400, 14)
+
+    titulo = medida.quebrar(sem_emoji("📚 MAPA DE DISCIPLINAS FLEXIBILIZADAS"), f_h1, interno)
+    intro = [
+        "Explore as disciplinas flexibilizadas disponíveis para complementar sua formação acadêmica.",
+        re.sub(r'<[^>]+>', '', descricao_carga(estatisticas)),
+    ]
+    rodape = [
+        "Como funciona: Escolha as disciplinas que mais se alinham com seus objetivos acadêmicos e profissionais.",
+        "Para mais informações sobre inscrições e cronogramas, entre em contato com a coordenação do curso.",
+    ]
+    linhas_intro = [linha for trecho in intro for linha in medida.quebrar(trecho, f_intro, interno)]
+    linhas_rodape = [linha for trecho in rodape for linha in medida.quebrar(trecho, f_rodape, interno)]
+
+    # Primeira passada: alturas de cada bloco
+    altura_cabecalho = 40 + len(titulo) * medida.altura_linha(f_h1) + 10 + medida.altura_linha(f_sub) + 40
+    altura_stats = 30 + medida.altura_linha(f_numero) + 8 + medida.altura_linha(f_rotulo) + 30 + 1
+    altura_intro = len(linhas_intro) * 18 * 1.6
+    altura_topo_curso = 25 + max(medida.altura_linha(f_curso), 16 + medida.altura_linha(f_badge)) + 25
+
+    cursos = []
+    for curso, titulo_curso, disciplinas in grupos:
+        cards = [(medida.quebrar(d['nome'], f_disciplina, largura_card - 54), d['carga_horaria']) for d in disciplinas]
+        alturas_linhas = []
+        for i in range(0, len(cards), colunas):
+            alturas_linhas.append(max(
+                25 + len(nome) * 18 * 1.4 + 15 + medida.altura_linha(f_carga) + 25
+                for nome, _ in cards[i:i + colunas]
+            ))
+        altura = altura_topo_curso + 30 + sum(alturas_linhas) + 20 * (len(alturas_linhas) - 1) + 30
+        cursos.append((curso, titulo_curso, cards, alturas_linhas, altura))
+
+    altura_cursos = sum(c[4] for c in cursos) + 30 * (len(cursos) - 1)
+    altura_main = 40 + altura_intro + 40 + altura_cursos + 40
+    altura_rodape = 1 + 30 + len(linhas_rodape) * 14 * 1.6 + 30
+    altura = altura_cabecalho + altura_stats + altura_main + altura_rodape
+
+    altura_pagina = max(1600, altura + 40)
+    x0 = (largura_pagina - largura) / 2
+    y = (altura_pagina - altura) / 2
+
+    # Segunda passada: desenho
+    tela = Tela(largura_pagina, altura_pagina, "#667eea", escala)
+    tela.gradiente(0, 0, largura_pagina, altura_pagina, "#667eea", "#764ba2", horizontal=False)
+    tela.caixa(x0, y, x0 + largura, y + altura, raio=20, fundo="#FFFFFF")
+    centro = x0 + largura / 2
+
+    tela.gradiente(x0, y, x0 + largura, y + altura_cabecalho, "#000099", "#0000FF", raio=20,
+                   cantos=(True, True, False, False))
+    yc = y + 40
+    for linha in titulo:
+        tela.texto(centro, yc, linha, tela.fonte("Montserrat", 800, 48), "#FFFFFF", alinhamento="centro")
+        yc += medida.altura_linha(f_h1)
+    tela.texto(centro, yc + 10, subtitulo_pagina(pagina, total_paginas), tela.fonte("Montserrat", 400, 20),
+               "rgba(255, 255, 255, 0.9)", alinhamento="centro")
+    y += altura_cabecalho
+
+    tela.caixa(x0, y, x0 + largura, y + altura_stats, fundo="#f8f9fa")
+    tela.caixa(x0, y + altura_stats - 1, x0 + largura, y + altura_stats, fundo="#e0e6ed")
+    stats = [
+        (str(estatisticas['total_disciplinas']), "DISCIPLINAS"),
+        (str(estatisticas['total_cursos']), "CURSOS"),
+        (f"{formatar_horas(estatisticas['carga_total'])}h", "CARGA HORÁRIA TOTAL"),
+    ]
+    for i, (numero, rotulo) in enumerate(stats):
+        cx = x0 + 40 + interno * (2 * i + 1) / (2 * len(stats))
+        tela.texto(cx, y + 30, numero, tela.fonte("Montserrat", 800, 36), "#0000FF", alinhamento="centro")
+        tela.texto(cx, y + 30 + medida.altura_linha(f_numero) + 8, rotulo, tela.fonte("Roboto", 600, 14),
+                   "#666666", espacamento=1, alinhamento="centro")
+    y += altura_stats + 40
+
+    for linha in linhas_intro:
+        tela.texto(centro, y, linha, tela.fonte("Roboto", 400, 18), "#333333", altura_linha=1.6, alinhamento="centro")
+        y += 18 * 1.6
+    y += 40
+
+    xs0, xs1 = x0 + 40, x0 + largura - 40
+    for curso, titulo_curso, cards, alturas_linhas, altura_curso in cursos:
+        cor = cor_curso(curso)
+        tela.caixa(xs0, y, xs1, y + altura_curso, raio=15, fundo="#FFFFFF", borda="#e0e6ed")
+        tela.caixa(xs0, y, xs1, y + altura_topo_curso, raio=15, fundo=cor, cantos=(True, True, False, False))
+        meio = y + altura_topo_curso / 2
+        tela.texto(xs0 + 25, meio - medida.altura_linha(f_curso) / 2, titulo_curso, tela.fonte("Montserrat", 700, 24),
+                   "#FFFFFF")
+
+        badge = f"{len(cards)} disciplina{'s' if len(cards) > 1 else ''}".upper()
+        f_badge_tela = tela.fonte("Roboto", 600, 12)
+        largura_badge = tela.largura_texto(badge, f_badge_tela, espacamento=1) + 30
+        altura_badge = 16 + medida.altura_linha(f_badge)
+        fundo_badge = "#%02X%02X%02X" % cor_rgb("rgba(255, 255, 255, 0.2)", fundo=cor_rgb(cor))
+        tela.caixa(xs1 - 25 - largura_badge, meio - altura_badge / 2, xs1 - 25, meio + altura_badge / 2,
+                   raio=altura_badge / 2, fundo=fundo_badge)
+        tela.texto(xs1 - 25 - largura_badge + 15, meio - altura_badge / 2 + 8, badge, f_badge_tela, "#FFFFFF",
+                   espacamento=1)
+
+        yl = y + altura_topo_curso + 30
+        for i, altura_linha in enumerate(alturas_linhas):
+            for j, (nome, carga) in enumerate(cards[i * colunas:(i + 1) * colunas]):
+                xc = xs0 + 30 + j * (largura_card + 20)
+                tela.caixa(xc, yl, xc + largura_card, yl + altura_linha, raio=12, fundo="#f8f9fa")
+                tela.caixa(xc, yl, xc + 4, yl + altura_linha, fundo="#0000FF")
+                yt = yl + 25
+                for linha in nome:
+                    tela.texto(xc + 29, yt, linha, tela.fonte("Roboto", 600, 18), "#333333", altura_linha=1.4)
+                    yt += 18 * 1.4
+                tela.texto(xc + 29, yt + 15, carga, tela.fonte("Roboto", 600, 16), "#0000FF")
+            yl += altura_linha + 20
+        y += altura_curso + 30
+    y += 40 - 30
+
+    tela.caixa(x0, y, x0 + largura, y + altura_rodape, raio=20, fundo="#f8f9fa", cantos=(False, False, True, True))
+    tela.caixa(x0, y, x0 + largura, y + 1, fundo="#e0e6ed")
+    y += 31
+    for linha in linhas_rodape:
+        tela.texto(centro, y, linha, tela.fonte("Roboto", 400, 14), "#666666", altura_linha=1.6, alinhamento="centro")
+        y += 14 * 1.6
+
+    tela.salvar(destino)
+
 def main():
     """Função principal que coordena a geração do HTML do mapa de disciplinas."""
+    parser = argparse.ArgumentParser(description="Gera o HTML do mapa de disciplinas flexibilizadas")
+    parser.add_argument("--catalogo", default=str(CATALOGO_PADRAO),
+                        help="CSV com as colunas curso, disciplina e carga_horaria (padrão: catalogo_disciplinas.csv)")
+    parser.add_argument("--max-disciplinas", type=int, default=MAX_DISCIPLINAS_PAGINA,
+                        help=f"Disciplinas por página do mapa (padrão: {MAX_DISCIPLINAS_PAGINA})")
+    parser.add_argument("--png", nargs="?", const="original_posts", metavar="PASTA",
+                        help="Também desenha o PNG direto com o Pillow, sem navegador (padrão: original_posts)")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="Fator de escala do PNG desenhado com --png (padrão: 1.0)")
+    args = parser.parse_args()
+    
     pasta_html = 'html'
     
     # Cria a pasta html se não existir
     if not os.path.exists(pasta_html):
         os.makedirs(pasta_html)
     
-    print("Obtendo disciplinas flexibilizadas...")
-    disciplinas_por_curso = obter_disciplinas_flexibilizadas()
+    print(f"Lendo catálogo de disciplinas: {args.catalogo}")
+    try:
+        disciplinas_por_curso, estatisticas = agregar_catalogo(ler_catalogo(args.catalogo))
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler o catálogo: {e}")
+        sys.exit(1)
     
-    print("Calculando estatísticas...")
-    estatisticas = calcular_estatisticas(disciplinas_por_curso)
+    if not disciplinas_por_curso:
+        print("❌ Nenhuma disciplina encontrada no catálogo!")
+        sys.exit(1)
     
     print(f"Encontradas {estatisticas['total_disciplinas']} disciplinas em {estatisticas['total_cursos']} cursos:")
     for curso, disciplinas in disciplinas_por_curso.items():
-        print(f"  - {curso}: {len(disciplinas)} disciplina{'s' if len(disciplinas) > 1 else ''}")
-        for disciplina in disciplinas:
-            print(f"    • {disciplina['nome']} ({disciplina['carga_horaria']})")
-    
-    print("\nGerando arquivo HTML do mapa...")
+        print(f"  - {curso}: {len(disciplinas)} disciplina{'s' if len(disciplinas) > 1 else ''} "
+              f"({formatar_horas(estatisticas['carga_por_curso'][curso])}h)")
     
-    html_content = gerar_html_mapa(disciplinas_por_curso, estatisticas)
+    paginas = paginar_cursos(disciplinas_por_curso, max(1, args.max_disciplinas))
+    print(f"\nGerando {len(paginas)} página{'s' if len(paginas) > 1 else ''} do mapa...")
     
-    nome_arquivo = "mapa_disciplinas_flexibilizadas.html"
-    caminho_arquivo = os.path.join(pasta_html, nome_arquivo)
-    
-    with open(caminho_arquivo, 'w', encoding='utf-8') as file:
-        file.write(html_content)
+    digitos = max(2, len(str(len(paginas))))
+    for numero, grupos in enumerate(paginas, 1):
+        html_content = gerar_html_mapa(grupos, estatisticas, numero, len(paginas))
+        
+        sufixo = f"_{numero:0{digitos}d}" if len(paginas) > 1 else ""
+        nome_base = f"mapa_disciplinas_flexibilizadas{sufixo}"
+        caminho_arquivo = os.path.join(pasta_html, f"{nome_base}.html")
+        
+        with open(caminho_arquivo, 'w', encoding='utf-8') as file:
+            file.write(html_content)
+        
+        print(f"✅ Gerado: {caminho_arquivo} ({sum(len(d) for _, _, d in grupos)} disciplinas)")
+        
+        if args.png:
+            caminho_png = os.path.join(args.png, f"{nome_base}.png")
+            desenhar_png_mapa(grupos, estatisticas, caminho_png, args.escala, numero, len(paginas))
+            print(f"🖼️  Desenhado: {caminho_png}")
     
-    print(f"✅ Gerado: {nome_arquivo}")
-    print(f"📍 Localização: {caminho_arquivo}")
-    print(f"📊 Total: {estatisticas['total_disciplinas']} disciplinas, {estatisticas['carga_total']}h de carga horária")
+    print(f"📊 Total: {estatisticas['total_disciplinas']} disciplinas, {formatar_horas(estatisticas['carga_total'])}h de carga horária")
     print(f"\n✨ Processo concluído! O mapa de disciplinas foi gerado na pasta '{pasta_html}'.")
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Gravação das imagens renderizadas direto em um pacote .zip ou .tar (.tar.gz, .tgz).
+
+Cada screenshot chega como bytes e vai para o pacote assim que a sua vez chega, sem
+passar por um arquivo solto no disco. A ordem das entradas é a das tarefas (e não a
+de conclusão, que varia com a concorrência), e as entradas têm data, dono e
+permissões fixos: o mesmo lote gera o mesmo pacote. Ao final entra um manifest.json
+com largura, altura, tamanho e SHA-256 de cada imagem.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import struct
+import tarfile
+import threading
+import zipfile
+
+NOME_MANIFESTO = "manifest.json"
+
+# Data fixa das entradas do zip (a menor que o formato aceita)
+DATA_ZIP = (1980, 1, 1, 0, 0, 0)
+
+ASSINATURA_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+def dimensoes_imagem(dados):
+    """(largura, altura) de uma imagem em bytes; PNG direto do cabeçalho IHDR, demais pelo Pillow."""
+    if dados[:8] == ASSINATURA_PNG and dados[12:16] == b'IHDR':
+        return struct.unpack('>II', dados[16:24])
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(dados)) as img:
+        return img.size
+
+
+def formato_pacote(caminho):
+    """"zip" ou o modo de escrita do tarfile ("w", "w:gz") conforme a extensão."""
+    nome = str(caminho).lower()
+    if nome.endswith(".zip"):
+        return "zip"
+    if nome.endswith((".tar.gz", ".tgz")):
+        return "w:gz"
+    if nome.endswith(".tar"):
+        return "w"
+    raise ValueError(f"Extensão de pacote não suportada (use .zip, .tar, .tar.gz ou .tgz): {caminho}")
+
+
+class EscritorPacote:
+    """
+    Recebe as imagens de cada tarefa (adicionar(indice, [(nome, bytes), ...])) de qualquer
+    thread e as grava no pacote na ordem dos índices. Tarefas que falharam devem ser
+    informadas com uma lista vazia para não segurar as seguintes.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.formato = formato_pacote(caminho)
+        self._arquivos = []
+        if self.formato == "zip":
+            self.pacote = zipfile.ZipFile(caminho, "w", zipfile.ZIP_STORED)
+        elif self.formato == "w:gz":
+            # GzipFile próprio: o do tarfile grava a hora atual e o nome no cabeçalho
+            bruto = open(caminho, "wb")
+            comprimido = gzip.GzipFile(filename="", mode="wb", fileobj=bruto, mtime=0)
+            self._arquivos = [comprimido, bruto]
+            self.pacote = tarfile.open(fileobj=comprimido, mode="w", format=tarfile.PAX_FORMAT)
+        else:
+            self.pacote = tarfile.open(caminho, "w", format=tarfile.PAX_FORMAT)
+        self.manifesto = []
+        self._proximo = 0
+        self._aguardando = {}
+        self._trava = threading.Lock()
+
+    def _gravar_entrada(self, nome, dados):
+        if self.formato == "zip":
+            info = zipfile.ZipInfo(nome, DATA_ZIP)
+            info.external_attr = 0o644 << 16
+            self.pacote.writestr(info, dados)
+        else:
+            info = tarfile.TarInfo(nome)
+            info.size = len(dados)
+            info.mode = 0o644
+            info.mtime = 0
+            self.pacote.addfile(info, io.BytesIO(dados))
+
+    def _gravar_imagem(self, nome, dados):
+        largura, altura = dimensoes_imagem(dados)
+        self._gravar_entrada(nome, dados)
+        self.manifesto.append({
+            "arquivo": nome,
+            "largura": largura,
+            "altura": altura,
+            "bytes": len(dados),
+            "sha256": hashlib.sha256(dados).hexdigest(),
+        })
+
+    def adicionar(self, indice, imagens):
+        """Entrega as imagens da tarefa `indice`; grava esta e as seguintes que já chegaram."""
+        with self._trava:
+            self._aguardando[indice] = imagens
+            while self._proximo in self._aguardando:
+                for nome, dados in self._aguardando.pop(self._proximo):
+                    self._gravar_imagem(nome, dados)
+                self._proximo += 1
+
+    def fechar(self):
+        """Grava o que sobrou (na ordem dos índices), o manifest.json e fecha o pacote."""
+        with self._trava:
+            for indice in sorted(self._aguardando):
+                for nome, dados in self._aguardando.pop(indice):
+                    self._gravar_imagem(nome, dados)
+            manifesto = json.dumps({"imagens": self.manifesto}, ensure_ascii=False, indent=2)
+            self._gravar_entrada(NOME_MANIFESTO, manifesto.encode("utf-8"))
+            self.pacote.close()
+            for arquivo in self._arquivos:
+                arquivo.close()
+        return len(self.manifesto)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Ajuste automático do número de renders simultâneos (páginas/navegadores locais).
+
+Começa baixo (ou do valor salvo para o host), mede imagens/s e a memória residente
+(RSS) do processo e dos filhos (Chromium) a cada janela de renders e sobe ou desce a
+concorrência para maximizar a vazão sem passar do teto de RSS:
+
+- RSS acima do teto: desce um nível, e esse nível vira o máximo do lote.
+- Vazão melhor que a do melhor nível até agora (mais que TOLERANCIA): tenta subir um
+  nível, se a memória estimada para ele couber no teto.
+- Vazão pior: volta ao melhor nível e para de subir.
+
+O melhor nível é salvo por host em <cache>/autoajuste.json e é o ponto de partida da
+próxima execução.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+
+# Ganho relativo mínimo para considerar que um nível é melhor (ruído entre janelas)
+TOLERANCIA = 0.05
+# Renders por janela de medição, por página simultânea (com um mínimo absoluto)
+RENDERS_POR_PAGINA = 2
+MIN_RENDERS_JANELA = 4
+# Fração da memória física usada como teto quando nenhum é informado
+FRACAO_MEMORIA_PADRAO = 0.7
+
+
+def memoria_fisica_mb():
+    """Memória física total em MB, ou None onde o sysconf não informa."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2 ** 20
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def teto_rss_padrao():
+    memoria = memoria_fisica_mb()
+    return round(memoria * FRACAO_MEMORIA_PADRAO) if memoria else None
+
+
+def _rss_processo_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii", errors="replace") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def rss_total_mb(pid=None):
+    """
+    RSS em MB do processo e de todos os descendentes (os processos do Chromium), lido
+    do /proc. Fora do Linux, retorna o pico de RSS do próprio processo (resource).
+    """
+    pid = pid or os.getpid()
+    if not os.path.isdir("/proc/self"):
+        import resource
+        import sys
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2 ** 20 if sys.platform == "darwin" else pico / 1024
+
+    filhos = {}
+    for entrada in os.listdir("/proc"):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entrada}/stat", encoding="ascii", errors="replace") as stat:
+                # O nome do processo (2º campo) pode ter espaços: o ppid vem depois do último ')'
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(entrada))
+
+    total, pilha = 0.0, [pid]
+    while pilha:
+        atual = pilha.pop()
+        total += _rss_processo_mb(atual)
+        pilha.extend(filhos.get(atual, []))
+    return total
+
+
+def arquivo_ajustes():
+    from imagem_ops import pasta_cache_padrao
+    return pasta_cache_padrao() / "autoajuste.json"
+
+
+def carregar_ajuste(host=None):
+    """Ajuste salvo para o host ({"concorrencia", "imagens_por_segundo", ...}) ou None."""
+    try:
+        ajustes = json.loads(arquivo_ajustes().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return ajustes.get(host or socket.gethostname())
+
+
+def salvar_ajuste(dados, host=None):
+    caminho = arquivo_ajustes()
+    try:
+        ajustes = json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        ajustes = {}
+    ajustes[host or socket.gethostname()] = dados
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(f".{os.getpid()}.tmp")
+    temporario.write_text(json.dumps(ajustes, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temporario, caminho)
+
+
+class Autoajuste:
+    """
+    Controla a concorrência de um lote. As threads de render chamam aguardar_vez(indice)
+    antes de cada tarefa (só as `concorrencia` primeiras trabalham) e registrar() depois.
+    """
+
+    def __init__(self, teto_rss_mb=None, maximo=None, inicial=None):
+        self.teto_rss_mb = teto_rss_mb
+        self.maximo = maximo or os.cpu_count() or 4
+        salvo = carregar_ajuste()
+        if inicial is None:
+            inicial = salvo["concorrencia"] if salvo else 1
+        self.concorrencia = max(1, min(self.maximo, inicial))
+        self.limite = self.maximo
+        self.melhor = None  # (concorrencia, imagens_por_segundo)
+        self.pico_rss_mb = 0.0
+        self.encerrado = False
+        self._condicao = threading.Condition()
+        self._iniciar_janela()
+
+    def _iniciar_janela(self):
+        self._inicio_janela = time.perf_counter()
+        self._renders_janela = 0
+
+    def aguardar_vez(self, indice):
+        """Bloqueia a thread `indice` enquanto ela estiver acima da concorrência atual. False = fim do lote."""
+        with self._condicao:
+            while indice >= self.concorrencia and not self.encerrado:
+                self._condicao.wait()
+            return not self.encerrado
+
+    def ativa(self, indice):
+        return indice < self.concorrencia
+
+    def encerrar(self):
+        with self._condicao:
+            self.encerrado = True
+            self._condicao.notify_all()
+
+    def registrar(self):
+        """Conta um render concluído e, ao fim da janela, reavalia a concorrência."""
+        with self._condicao:
+            self._renders_janela += 1
+            if self._renders_janela < max(MIN_RENDERS_JANELA, RENDERS_POR_PAGINA * self.concorrencia):
+                return
+            taxa = self._renders_janela / (time.perf_counter() - self._inicio_janela)
+            rss = rss_total_mb()
+            self.pico_rss_mb = max(self.pico_rss_mb, rss)
+            anterior = self.concorrencia
+            self._avaliar(taxa, rss)
+            if self.concorrencia != anterior:
+                print(f"⚙️  Concorrência {anterior} → {self.concorrencia} "
+                      f"({taxa:.2f} imagens/s, RSS {rss:.0f} MB)")
+            self._iniciar_janela()
+            self._condicao.notify_all()
+
+    def _avaliar(self, taxa, rss):
+        nivel = self.concorrencia
+        if self.teto_rss_mb and rss > self.teto_rss_mb:
+            self.limite = max(1, nivel - 1)
+            self.concorrencia = self.limite
+            if self.melhor and self.melhor[0] > self.limite:
+                self.melhor = None
+            return
+
+        if self.melhor is None or taxa > self.melhor[1] * (1 + TOLERANCIA):
+            self.melhor = (nivel, taxa)
+            # Memória estimada do próximo nível: proporcional ao número de páginas
+            cabe = not self.teto_rss_mb or rss * (nivel + 1) / nivel <= self.teto_rss_mb
+            if nivel < self.limite and cabe:
+                self.concorrencia = nivel + 1
+        elif nivel == self.melhor[0]:
+            # Mesmo nível, janela nova: atualiza a medida (o mix de trabalhos muda ao longo do lote)
+            self.melhor = (nivel, taxa)
+        else:
+            # Subir não compensou: volta ao melhor nível e não tenta mais acima dele
+            self.limite = self.melhor[0]
+            self.concorrencia = self.melhor[0]
+
+    def salvar(self):
+        """Grava o melhor nível medido para este host."""
+        if self.melhor is None:
+            return
+        salvar_ajuste({
+            "concorrencia": self.melhor[0],
+            "imagens_por_segundo": round(self.melhor[1], 3),
+            "teto_rss_mb": self.teto_rss_mb,
+            "pico_rss_mb": round(self.pico_rss_mb),
+            "atualizado": datetime.now().isoformat(timespec="seconds"),
+        })
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Dados sintéticos (determinísticos) para os benchmarks: linhas do CSV de TCC, catálogo
+de disciplinas e logos com fundo branco de N megapixels.
+"""
+
+import random
+
+import numpy as np
+
+PRENOMES = ["ana", "BRUNO", "Carla", "diego", "Eduarda", "FERNANDO", "gabriela", "Heitor", "Isabela", "joão",
+            "Larissa", "MARCOS", "natália", "Otávio", "Patrícia", "rafael", "Sabrina", "TIAGO", "Vitória", "william"]
+SOBRENOMES = ["silva", "SANTOS", "Oliveira", "souza", "Rodrigues", "FERREIRA", "alves", "Pereira", "Lima",
+              "gomes", "COSTA", "Ribeiro", "martins", "Carvalho", "de almeida", "Lopes", "da Rocha", "Nunes"]
+PREFIXOS_BANCA = ["Prof.", "Prof. Me.", "Prof. Dr.", "Me.", "Dr.", "Esp.", "Profa. Dra.", ""]
+PALAVRAS_TITULO = ["sistema", "de", "gestão", "aplicado", "à", "educação", "análise", "dados", "uma", "proposta",
+                   "para", "o", "ensino", "web", "mobile", "aprendizado", "de máquina", "estudo", "caso",
+                   "implementação", "em", "Python", "redes", "segurança", "avaliação", "usabilidade"]
+CURSOS = ["Matemática", "Geografia", "Pedagogia", "Letras", "Física", "Química", "História", "Biologia",
+          "Computação", "Engenharia Civil", "Artes Visuais", "Filosofia"]
+CARGAS = ["30h", "45h", "60h", "60 h", "68,5h", "75h", "90"]
+
+
+def _nome(rng):
+    return f"{rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+
+def linhas_tcc(quantidade, apresentacoes_por_dia=20, semente=1):
+    """Linhas como as do ler_csv de ScriptCarroselTCC/gerar_html.py (dias com ~apresentacoes_por_dia)."""
+    rng = random.Random(semente)
+    dias = max(1, quantidade // apresentacoes_por_dia)
+    linhas = []
+    for i in range(quantidade):
+        dia = rng.randrange(dias)
+        data = f"{1 + dia % 28:02d}/{1 + (dia // 28) % 12:02d}/{26 + dia // 336:02d}"
+        linhas.append({
+            'Nome': _nome(rng),
+            'Matrícula': f"{202600000 + i}",
+            'Email': f"aluno{i}@exemplo.com",
+            'Título do trabalho': " ".join(rng.choice(PALAVRAS_TITULO) for _ in range(rng.randint(5, 14))),
+            'Modalidade do Trabalho': "Monografia",
+            'Orientador': f"{rng.choice(PREFIXOS_BANCA)} {_nome(rng)}".strip(),
+            'Membro 1 da Banca': f"{rng.choice(PREFIXOS_BANCA)} {_nome(rng)}".strip(),
+            'Membro 2 da Banca': f"{rng.choice(PREFIXOS_BANCA)} {_nome(rng)}".strip(),
+            'Membro 3 da Banca (Opcional)': _nome(rng) if rng.random() < 0.3 else "",
+            'Data': data,
+            'Hora': f"{8 + rng.randrange(10):02d}:{rng.choice(('00', '20', '40'))}:00",
+        })
+    return linhas
+
+
+def linhas_catalogo(quantidade, semente=1):
+    """Linhas como as do ler_catalogo de gerar_html_mapa.py, com cursos repetidos em blocos."""
+    rng = random.Random(semente)
+    linhas = []
+    for i in range(quantidade):
+        curso = CURSOS[(i // 37) % len(CURSOS)]
+        if i // (37 * len(CURSOS)):
+            curso = f"{curso} {i // (37 * len(CURSOS)) + 1}"
+        disciplina = " ".join(rng.choice(PALAVRAS_TITULO) for _ in range(rng.randint(2, 6))).title()
+        linhas.append({'curso': curso, 'disciplina': f"{disciplina} <{i}>", 'carga_horaria': rng.choice(CARGAS)})
+    return linhas
+
+
+def gravar_logo(destino, megapixels, semente=1):
+    """Grava um PNG RGB de ~megapixels com fundo branco, formas coloridas e ruído quase branco."""
+    from PIL import Image
+
+    lado = max(16, int((megapixels * 1_000_000) ** 0.5))
+    rng = np.random.default_rng(semente)
+    imagem = np.full((lado, lado, 3), 255, dtype=np.uint8)
+    # Ruído de compressão no fundo (pixels entre 245 e 255)
+    ruido = rng.random((lado, lado)) < 0.05
+    imagem[ruido] = 245 + rng.integers(0, 10, size=(int(ruido.sum()), 1), dtype=np.uint8)
+
+    y, x = np.ogrid[:lado, :lado]
+    centro = lado / 2
+    anel = np.abs(np.hypot(y - centro, x - centro) - lado * 0.3) < lado * 0.05
+    imagem[anel] = (0, 0, 240)
+    miolo = np.hypot(y - centro, x - centro) < lado * 0.12  # branco interno ao anel, preservado no border-connected
+    imagem[miolo] = 255
+    imagem[int(lado * 0.75):int(lado * 0.85), int(lado * 0.2):int(lado * 0.8)] = (240, 176, 0)
+
+    Image.fromarray(imagem).save(destino, "PNG", compress_level=1)
+    return lado * lado
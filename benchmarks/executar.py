@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks dos geradores de HTML e dos kernels de imagem, sem navegador.
+
+Cada caso mede a mediana de algumas repetições (depois de um aquecimento), a vazão
+(linhas, disciplinas ou megapixels por segundo) e, em uma execução à parte sob
+tracemalloc, o pico de memória alocada pelo Python e pelo numpy. O resultado sai em
+JSON e pode ser comparado com uma base versionada:
+
+    python benchmarks/executar.py                       # perfil rápido
+    python benchmarks/executar.py --perfil completo     # 1k–1M linhas, 1–50 MP
+    python benchmarks/executar.py --comparar benchmarks/baseline.json --tolerancia 0.25
+    python benchmarks/executar.py --saida benchmarks/baseline.json   # atualiza a base
+
+Com --comparar, o código de saída é 1 quando algum caso ficou mais lento ou usou mais
+memória que a base além da tolerância.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+# Módulos compartilhados na raiz e os geradores em suas pastas
+for pasta in (RAIZ, RAIZ / "ScriptCarroselTCC", RAIZ / "ScriptMapaDisciplinasFlexibilizadas",
+              RAIZ / "ScriptCalendarioRAJJ", RAIZ / "removeBackground"):
+    sys.path.insert(0, str(pasta))
+
+from dados_sinteticos import gravar_logo, linhas_catalogo, linhas_tcc
+
+PERFIS = {
+    "rapido": {"linhas": [1_000, 10_000], "disciplinas": [1_000, 10_000], "megapixels": [1, 4]},
+    "completo": {"linhas": [1_000, 10_000, 100_000, 1_000_000], "disciplinas": [1_000, 10_000, 100_000],
+                 "megapixels": [1, 10, 50]},
+}
+
+REPETICOES = 5
+# Casos cuja primeira execução passa disso rodam uma vez só
+SEGUNDOS_EXECUCAO_UNICA = 2.0
+# Duração mínima de cada amostra: casos rápidos rodam várias vezes por amostra (como o timeit)
+SEGUNDOS_AMOSTRA = 0.05
+TOLERANCIA_PADRAO = 0.25
+
+
+@dataclass
+class Caso:
+    nome: str
+    unidade: str
+    quantidade: float
+    preparar: callable   # () -> args de executar, fora da medição (uma vez por amostra)
+    executar: callable
+    # False quando executar duas vezes com os mesmos args não mede o mesmo trabalho (ex.: cache)
+    repetivel: bool = True
+
+
+def casos_html(perfil):
+    from gerar_html import agrupar_por_data, formatar_data_exibicao, gerar_html_template
+    from gerar_html_mapa import agregar_catalogo, gerar_cards_disciplinas
+
+    casos = []
+    for quantidade in perfil["linhas"]:
+        linhas = linhas_tcc(quantidade)
+        casos.append(Caso(f"agrupar_por_data/{quantidade}", "linhas", quantidade,
+                          lambda linhas=linhas: (linhas,), agrupar_por_data))
+
+        dias = list(agrupar_por_data(linhas).items())
+
+        def gerar_todos(dias):
+            for dia_numero, (data, itens) in enumerate(dias, 1):
+                gerar_html_template(formatar_data_exibicao(data)[0], dia_numero, itens)
+
+        casos.append(Caso(f"gerar_html_template/{quantidade}", "linhas", quantidade,
+                          lambda dias=dias: (dias,), gerar_todos))
+
+    for quantidade in perfil["disciplinas"]:
+        linhas = linhas_catalogo(quantidade)
+        casos.append(Caso(f"agregar_catalogo/{quantidade}", "disciplinas", quantidade,
+                          lambda linhas=linhas: (linhas,), agregar_catalogo))
+
+        por_curso, _ = agregar_catalogo(linhas)
+        grupos = [(curso, curso, disciplinas) for curso, disciplinas in por_curso.items()]
+        casos.append(Caso(f"gerar_cards_disciplinas/{quantidade}", "disciplinas", quantidade,
+                          lambda grupos=grupos: (grupos,), gerar_cards_disciplinas))
+    return casos
+
+
+def casos_imagem(perfil, pasta):
+    from Script import remove_background
+    from gerar_html_rajj import gerar_logo_transparente
+
+    casos = []
+    for megapixels in perfil["megapixels"]:
+        logo = pasta / f"logo_{megapixels}mp.png"
+        pixels = gravar_logo(logo, megapixels)
+
+        casos.append(Caso(f"remove_background/{megapixels}mp", "MP", pixels / 1e6,
+                          lambda logo=logo: (str(logo), str(pasta / "saida.png")),
+                          lambda origem, destino: remove_background(origem, destino, verbose=False)))
+
+        def cache_vazio(logo=logo):
+            # Cache novo a cada repetição: mede o processamento, não o acerto no cache
+            cache = pasta / "cache"
+            shutil.rmtree(cache, ignore_errors=True)
+            os.environ["GERADOR_CACHE_DIR"] = str(cache)
+            return logo, pasta / "logo_transparente.png"
+
+        casos.append(Caso(f"gerar_logo_transparente/{megapixels}mp", "MP", pixels / 1e6,
+                          cache_vazio, gerar_logo_transparente, repetivel=False))
+    return casos
+
+
+def medir(caso, repeticoes=REPETICOES):
+    """Mediana e mínimo do tempo (a comparação usa o mínimo), vazão e pico de memória (tracemalloc) de um caso."""
+    tempos = []
+    argumentos = caso.preparar()
+    inicio = time.perf_counter()
+    caso.executar(*argumentos)  # aquecimento (imports, caches de normalização, ...)
+    chamadas = 1
+    if caso.repetivel:
+        chamadas = max(1, math.ceil(SEGUNDOS_AMOSTRA / (time.perf_counter() - inicio)))
+    for _ in range(repeticoes):
+        argumentos = caso.preparar()
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            caso.executar(*argumentos)
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+        if tempos[0] > SEGUNDOS_EXECUCAO_UNICA:
+            break
+
+    argumentos = caso.preparar()
+    tracemalloc.start()
+    try:
+        caso.executar(*argumentos)
+        _atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mediana = statistics.median(tempos)
+    return {
+        "segundos": round(mediana, 6),
+        "minimo": round(min(tempos), 6),
+        "repeticoes": len(tempos),
+        "vazao": round(caso.quantidade / mediana, 2),
+        "unidade": f"{caso.unidade}/s",
+        "pico_memoria_mb": round(pico / 2 ** 20, 2),
+    }
+
+
+def ambiente():
+    import numpy
+    import PIL
+
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pillow": PIL.__version__,
+        "data": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def comparar(resultados, base, tolerancia):
+    """Imprime a comparação com a base e retorna os nomes dos casos que pioraram."""
+    regressoes = []
+    print(f"\n{'caso':42} {'tempo':>10} {'base':>10} {'Δ':>7} {'memória':>10} {'base':>10}")
+    for nome, atual in resultados.items():
+        anterior = base.get(nome)
+        if anterior is None:
+            print(f"{nome:42} {atual['minimo']:>9.4f}s {'—':>10} {'novo':>7}")
+            continue
+        # O mínimo é menos sensível a ruído da máquina que a mediana
+        delta = atual["minimo"] / anterior["minimo"] - 1
+        piorou_tempo = delta > tolerancia
+        piorou_memoria = atual["pico_memoria_mb"] > anterior["pico_memoria_mb"] * (1 + tolerancia) + 0.5
+        marca = " ❌" if piorou_tempo or piorou_memoria else ""
+        print(f"{nome:42} {atual['minimo']:>9.4f}s {anterior['minimo']:>9.4f}s {delta:>+7.0%} "
+              f"{atual['pico_memoria_mb']:>8.1f}MB {anterior['pico_memoria_mb']:>8.1f}MB{marca}")
+        if marca:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks dos geradores e kernels de imagem")
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="rapido",
+                        help="Tamanhos dos dados sintéticos (padrão: rapido)")
+    parser.add_argument("--filtro", help="Roda só os casos cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES,
+                        help=f"Repetições medidas por caso (padrão: {REPETICOES})")
+    parser.add_argument("--saida", help="Grava os resultados neste JSON")
+    parser.add_argument("--comparar", metavar="BASE", help="JSON de resultados anteriores para comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help=f"Piora relativa aceita na comparação (padrão: {TOLERANCIA_PADRAO})")
+    args = parser.parse_args()
+
+    perfil = PERFIS[args.perfil]
+    pasta = Path(tempfile.mkdtemp(prefix="benchmarks_"))
+    cache_original = os.environ.get("GERADOR_CACHE_DIR")
+    resultados = {}
+    try:
+        casos = casos_html(perfil) + casos_imagem(perfil, pasta)
+        if args.filtro:
+            casos = [caso for caso in casos if args.filtro in caso.nome]
+        for caso in casos:
+            resultado = medir(caso, args.repeticoes)
+            resultados[caso.nome] = resultado
+            print(f"⏱️  {caso.nome:42} {resultado['segundos']:>9.4f}s  "
+                  f"{resultado['vazao']:>14,.1f} {resultado['unidade']:14} "
+                  f"pico {resultado['pico_memoria_mb']:>8.1f} MB")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+        if cache_original is None:
+            os.environ.pop("GERADOR_CACHE_DIR", None)
+        else:
+            os.environ["GERADOR_CACHE_DIR"] = cache_original
+
+    saida = {"perfil": args.perfil, "ambiente": ambiente(), "casos": resultados}
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(saida, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Resultados em {args.saida}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding="utf-8"))
+        regressoes = comparar(resultados, base["casos"], args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} caso(s) piorou(aram) mais que {args.tolerancia:.0%}: {', '.join(regressoes)}")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma piora acima de {args.tolerancia:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tempo de import de cada script e módulo compartilhado, em um interpretador novo.
+
+Importar um módulo não deve fazer trabalho nem carregar as dependências pesadas
+(Playwright, Pillow, numpy, fontTools): elas ficam dentro das funções que as usam, para
+que --help, --simular, o enfileiramento e os geradores de HTML partam rápido. Para cada
+módulo, o script mede o menor tempo de import entre algumas execuções e lista as
+dependências pesadas que apareceram em sys.modules:
+
+    python benchmarks/inicializacao.py
+    python benchmarks/inicializacao.py --limite-ms 150
+
+O código de saída é 1 quando algum módulo carregou uma dependência pesada ou passou do
+limite.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# (pasta, módulo): cada módulo é importado com a sua pasta no sys.path, como ao rodar o script.
+# imagem_tiles fica de fora: é o kernel numpy em si, importado só quando uma imagem é grande
+MODULOS = [
+    (".", "gerar_posts"),
+    (".", "imagem_ops"),
+    (".", "otimizar_assets"),
+    (".", "raster_direto"),
+    (".", "fontes_subset"),
+    (".", "arquivo_saida"),
+    (".", "trace_render"),
+    (".", "pool_navegadores"),
+    (".", "autoajuste"),
+    (".", "fila_render"),
+    ("ScriptCarroselTCC", "gerar_html"),
+    ("ScriptMapaDisciplinasFlexibilizadas", "gerar_html_mapa"),
+    ("ScriptCalendarioRAJJ", "gerar_html_rajj"),
+    ("removeBackground", "Script"),
+]
+
+PESADOS = ("playwright", "PIL", "numpy", "fontTools")
+
+EXECUCOES = 3
+LIMITE_MS_PADRAO = 200
+
+CODIGO_MEDICAO = """
+import json, sys, time
+sys.path.insert(0, {pasta!r})
+inicio = time.perf_counter()
+import {modulo}
+ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{"ms": ms, "pesados": [m for m in {pesados!r} if m in sys.modules]}}))
+"""
+
+
+def medir_import(pasta, modulo, execucoes=EXECUCOES):
+    """{"ms": menor tempo de import, "pesados": [...]} de um módulo, cada execução em um processo novo."""
+    codigo = CODIGO_MEDICAO.format(pasta=str(RAIZ / pasta), modulo=modulo, pesados=PESADOS)
+    tempos, pesados = [], []
+    for _ in range(execucoes):
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                               cwd=RAIZ / pasta, check=True)
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        tempos.append(resultado["ms"])
+        pesados = resultado["pesados"]
+    return {"ms": round(min(tempos), 1), "pesados": pesados}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de import e dependências pesadas de cada módulo")
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_MS_PADRAO,
+                        help=f"Tempo de import máximo aceito por módulo (padrão: {LIMITE_MS_PADRAO} ms)")
+    parser.add_argument("--execucoes", type=int, default=EXECUCOES,
+                        help=f"Processos por módulo; vale o menor tempo (padrão: {EXECUCOES})")
+    args = parser.parse_args()
+
+    violacoes = []
+    for pasta, modulo in MODULOS:
+        nome = modulo if pasta == "." else f"{pasta}/{modulo}"
+        try:
+            resultado = medir_import(pasta, modulo, args.execucoes)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ {nome:50} falhou ao importar: {e.stderr.strip().splitlines()[-1]}")
+            violacoes.append(nome)
+            continue
+        problemas = []
+        if resultado["pesados"]:
+            problemas.append(f"carregou {', '.join(resultado['pesados'])}")
+        if resultado["ms"] > args.limite_ms:
+            problemas.append(f"acima de {args.limite_ms:.0f} ms")
+        marca = "❌" if problemas else "✅"
+        print(f"{marca} {nome:50} {resultado['ms']:>7.1f} ms  {'; '.join(problemas)}")
+        if problemas:
+            violacoes.append(nome)
+
+    if violacoes:
+        print(f"\n❌ {len(violacoes)} módulo(s) com import pesado: {', '.join(violacoes)}")
+        sys.exit(1)
+    print(f"\n✅ Todos os imports abaixo de {args.limite_ms:.0f} ms e sem {', '.join(PESADOS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Fila de renderização em uma pasta compartilhada (spool), sem broker externo.
+
+Vários hosts com a mesma pasta montada (NFS ou uma pasta local, para testes)
+dividem os trabalhos assim:
+
+    <spool>/pendentes/<id>.json                 trabalho aguardando
+    <spool>/em_andamento/<id>@<trabalhador>.json  trabalho reivindicado
+    <spool>/concluidos/<id>.json                trabalho + resultado
+    <spool>/falhas/<id>.json                    trabalho + último erro
+
+- Enfileirar grava o JSON em <spool>/tmp e o move com os.replace para pendentes/.
+- Reivindicar é um os.rename de pendentes/ para em_andamento/: só um trabalhador consegue.
+- Enquanto renderiza, o trabalhador atualiza o mtime do arquivo reivindicado (batimento).
+- Reivindicações sem batimento há mais de `expiracao` segundos (trabalhador que caiu)
+  voltam para pendentes/; depois de MAX_TENTATIVAS o trabalho vai para falhas/.
+
+Os tempos são comparados com o relógio do próprio servidor de arquivos (mtime de um
+arquivo de referência), então relógios diferentes entre hosts não afetam a expiração.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+PASTAS = ("tmp", "pendentes", "em_andamento", "concluidos", "falhas")
+
+INTERVALO_BATIMENTO = 10
+EXPIRACAO_PADRAO = 60
+MAX_TENTATIVAS = 3
+INTERVALO_ESPERA = 2
+
+
+def preparar_spool(spool):
+    """Cria as subpastas do spool (idempotente) e retorna o caminho como Path."""
+    spool = Path(spool)
+    for pasta in PASTAS:
+        (spool / pasta).mkdir(parents=True, exist_ok=True)
+    return spool
+
+
+def id_trabalhador():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _gravar_json(spool, destino, dados):
+    """Grava o JSON em tmp/ e move para o destino de uma vez (os.replace é atômico)."""
+    temporario = spool / "tmp" / f"{destino.name}.{id_trabalhador()}"
+    temporario.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temporario, destino)
+
+
+def agora_no_spool(spool):
+    """Hora atual segundo o servidor de arquivos (mtime de um arquivo recém-tocado)."""
+    referencia = Path(spool) / "tmp" / f".relogio-{id_trabalhador()}"
+    referencia.touch()
+    os.utime(referencia, None)
+    agora = referencia.stat().st_mtime
+    referencia.unlink()
+    return agora
+
+
+def enfileirar(spool, trabalho):
+    """
+    Coloca um trabalho (dict serializável) em pendentes/ e retorna o id.
+    Os ids começam pelo instante em nanossegundos, então a ordem dos nomes é a de chegada.
+    """
+    spool = preparar_spool(spool)
+    chave = hashlib.sha1(json.dumps(trabalho, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    id_ = f"{time.time_ns():020d}-{chave}"
+    _gravar_json(spool, spool / "pendentes" / f"{id_}.json", dict(trabalho, id=id_, tentativas=0))
+    return id_
+
+
+def reenfileirar_expirados(spool, expiracao=EXPIRACAO_PADRAO):
+    """Devolve para pendentes/ as reivindicações sem batimento há mais de `expiracao` s. Retorna quantas."""
+    spool = Path(spool)
+    limite = agora_no_spool(spool) - expiracao
+    devolvidos = 0
+    for reivindicado in (spool / "em_andamento").glob("*.json"):
+        try:
+            if reivindicado.stat().st_mtime >= limite:
+                continue
+            id_ = reivindicado.name.split("@", 1)[0]
+            os.rename(reivindicado, spool / "pendentes" / f"{id_}.json")
+            devolvidos += 1
+        except FileNotFoundError:
+            continue  # concluído ou devolvido por outro trabalhador nesse meio-tempo
+    return devolvidos
+
+
+def reivindicar(spool, trabalhador, max_tentativas=MAX_TENTATIVAS):
+    """
+    Reivindica o trabalho pendente mais antigo. Retorna (caminho_reivindicado, trabalho)
+    ou None quando não há pendentes. Trabalhos que já esgotaram as tentativas vão para falhas/.
+    """
+    spool = Path(spool)
+    for pendente in sorted((spool / "pendentes").glob("*.json")):
+        reivindicado = spool / "em_andamento" / f"{pendente.stem}@{trabalhador}.json"
+        try:
+            os.rename(pendente, reivindicado)
+            # O rename mantém o mtime da chegada à fila: sem isso, um trabalho que esperou mais
+            # que a expiração seria devolvido por reenfileirar_expirados assim que reivindicado
+            os.utime(reivindicado, None)
+        except FileNotFoundError:
+            continue  # outro trabalhador chegou antes
+
+        trabalho = json.loads(reivindicado.read_text(encoding="utf-8"))
+        if trabalho.get("tentativas", 0) >= max_tentativas:
+            _gravar_json(spool, spool / "falhas" / pendente.name,
+                         dict(trabalho, erro=trabalho.get("erro") or "reivindicação expirada"))
+            reivindicado.unlink()
+            continue
+
+        trabalho["tentativas"] = trabalho.get("tentativas", 0) + 1
+        _gravar_json(spool, reivindicado, trabalho)
+        return reivindicado, trabalho
+    return None
+
+
+class Batimento:
+    """Atualiza o mtime do arquivo reivindicado em segundo plano enquanto o trabalho roda."""
+
+    def __init__(self, reivindicado, intervalo=INTERVALO_BATIMENTO):
+        self.reivindicado = reivindicado
+        self.intervalo = intervalo
+        self.perdido = False
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._bater, daemon=True)
+
+    def _bater(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                os.utime(self.reivindicado, None)
+            except FileNotFoundError:
+                # Reivindicação expirou e foi devolvida: outro trabalhador pode refazer
+                self.perdido = True
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+
+
+def finalizar(spool, reivindicado, trabalho, resultado=None, erro=None, max_tentativas=MAX_TENTATIVAS):
+    """
+    Registra o fim do trabalho: concluidos/ com o resultado, ou, em caso de erro, de volta a
+    pendentes/ (se ainda há tentativas) ou falhas/. Retorna False se a reivindicação foi perdida.
+    """
+    spool = Path(spool)
+    if not reivindicado.exists():
+        return False
+
+    nome = f"{trabalho['id']}.json"
+    if erro is None:
+        _gravar_json(spool, spool / "concluidos" / nome, dict(trabalho, resultado=resultado))
+    elif trabalho.get("tentativas", 0) < max_tentativas:
+        _gravar_json(spool, spool / "pendentes" / nome, dict(trabalho, erro=erro))
+    else:
+        _gravar_json(spool, spool / "falhas" / nome, dict(trabalho, erro=erro))
+    reivindicado.unlink()
+    return True
+
+
+def processar_fila(spool, executar, aguardar=False, expiracao=EXPIRACAO_PADRAO, max_tentativas=MAX_TENTATIVAS):
+    """
+    Laço do trabalhador: devolve reivindicações expiradas, reivindica e executa trabalhos
+    (executar(trabalho) -> resultado serializável) até a fila esvaziar. Com aguardar=True,
+    continua esperando novos trabalhos. Retorna (concluidos, falhas).
+    """
+    spool = preparar_spool(spool)
+    trabalhador = id_trabalhador()
+    concluidos = falhas = 0
+
+    while True:
+        reenfileirar_expirados(spool, expiracao)
+        reivindicacao = reivindicar(spool, trabalhador, max_tentativas)
+        if reivindicacao is None:
+            if not aguardar and not any((spool / "em_andamento").iterdir()):
+                return concluidos, falhas
+            time.sleep(INTERVALO_ESPERA)
+            continue
+
+        reivindicado, trabalho = reivindicacao
+        inicio = time.time()
+        resultado = erro = None
+        with Batimento(reivindicado, min(INTERVALO_BATIMENTO, expiracao / 3)):
+            try:
+                resultado = executar(trabalho)
+            except Exception as e:
+                erro = f"{type(e).__name__}: {e}"
+
+        if resultado is not None:
+            resultado = {"saida": resultado, "trabalhador": trabalhador, "segundos": round(time.time() - inicio, 3)}
+        if not finalizar(spool, reivindicado, trabalho, resultado, erro, max_tentativas):
+            print(f"⚠️  {trabalho['id']}: reivindicação expirada durante o render; o resultado foi descartado")
+        elif erro is None:
+            concluidos += 1
+        else:
+            falhas += 1
+            print(f"❌ {trabalho['id']}: {erro}")
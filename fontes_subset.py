@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Fontes locais, reduzidas aos glifos do lote, no lugar do CSS do Google Fonts.
+
+Os templates carregam Montserrat e Roboto inteiras em vários pesos pelo CDN, mas cada
+lote usa poucas dezenas de caracteres. Esta etapa de pré-renderização (ver
+preparar_html em gerar_posts.py):
+
+1. junta o texto visível de todos os HTMLs do lote (mais maiúsculas/minúsculas, por
+   causa do text-transform, e o ASCII imprimível);
+2. lê as famílias e pesos pedidos no <link> do Google Fonts;
+3. para cada peso, gera um WOFF2 só com esses glifos no cache de derivados, a partir
+   do arquivo local (fontes/, $GERADOR_FONTES_DIR, pastas do sistema) ou de um TTF
+   baixado uma vez para <cache>/fontes;
+4. troca o <link> por @font-face locais com <link rel="preload">.
+
+Sem o fontTools instalado, ou se algum peso não for encontrado, o HTML fica como está.
+"""
+
+import hashlib
+import importlib.util
+import re
+import string
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from pathlib import Path
+
+from imagem_ops import CacheDerivados, marcar_uso, pasta_cache_padrao
+from raster_direto import NOMES_PESO, caminho_fonte, nome_arquivo_fonte
+
+RE_LINK_GOOGLE = re.compile(
+    r'<link\b[^>]*href\s*=\s*["\'](https://fonts\.googleapis\.com/css2?\?[^"\']*)["\'][^>]*>\s*',
+    re.IGNORECASE)
+RE_PRECONNECT = re.compile(
+    r'<link\b[^>]*rel\s*=\s*["\']preconnect["\'][^>]*fonts\.(?:googleapis|gstatic)\.com[^>]*>\s*',
+    re.IGNORECASE)
+RE_URL_CSS = re.compile(r'url\((["\']?)(https://[^)"\']+)\1\)')
+
+URL_CSS_GOOGLE = "https://fonts.googleapis.com/css2?family={familia}:ital,wght@{italico},{peso}"
+TIMEOUT_DOWNLOAD = 20
+
+# Versão da etapa; entra na chave do cache para invalidar subsets antigos
+VERSAO_SUBSET = 1
+
+
+class _ColetorTexto(HTMLParser):
+    """Junta o texto visível (fora de <style>, <script> e <title>)."""
+
+    IGNORAR = {"style", "script", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.profundidade_ignorada = 0
+        self.partes = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.IGNORAR:
+            self.profundidade_ignorada += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.IGNORAR and self.profundidade_ignorada:
+            self.profundidade_ignorada -= 1
+
+    def handle_data(self, data):
+        if not self.profundidade_ignorada:
+            self.partes.append(data)
+
+
+def caracteres_usados(conteudos):
+    """Conjunto de caracteres que as fontes precisam cobrir para os HTMLs dados."""
+    caracteres = set(string.printable.strip()) | {" ", "\u00a0"}
+    for conteudo in conteudos:
+        coletor = _ColetorTexto()
+        coletor.feed(conteudo)
+        texto = "".join(coletor.partes)
+        caracteres.update(texto, texto.upper(), texto.lower())
+    return caracteres
+
+
+def estilos_google_fonts(url):
+    """[(familia, italico, peso)] pedidos em uma URL do css2 do Google Fonts."""
+    estilos = []
+    for familia in urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("family", []):
+        nome, _, eixos = familia.partition(":")
+        if not eixos:
+            estilos.append((nome, False, 400))
+            continue
+        chaves, _, valores = eixos.partition("@")
+        chaves = chaves.split(",")
+        for tupla in valores.split(";"):
+            valores_eixos = dict(zip(chaves, tupla.split(",")))
+            estilos.append((nome, valores_eixos.get("ital") == "1", int(valores_eixos.get("wght", 400))))
+    return estilos
+
+
+def baixar_fonte(familia, italico, peso):
+    """
+    Baixa (uma vez) o TTF completo do Google Fonts para <cache>/fontes. Retorna o caminho
+    ou None sem rede. Sem um User-Agent de navegador, o css2 responde com TrueType.
+    """
+    destino = pasta_cache_padrao() / "fontes" / f"{nome_arquivo_fonte(familia, peso, italico)}.ttf"
+    if destino.exists():
+        marcar_uso(destino)
+        return destino
+    url_css = URL_CSS_GOOGLE.format(familia=urllib.parse.quote_plus(familia), italico=int(italico), peso=peso)
+    try:
+        with urllib.request.urlopen(url_css, timeout=TIMEOUT_DOWNLOAD) as resposta:
+            m = RE_URL_CSS.search(resposta.read().decode("utf-8"))
+        if not m:
+            return None
+        with urllib.request.urlopen(m.group(2), timeout=TIMEOUT_DOWNLOAD) as resposta:
+            dados = resposta.read()
+    except OSError:
+        return None
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(".tmp")
+    temporario.write_bytes(dados)
+    temporario.replace(destino)
+    return destino
+
+
+def arquivo_fonte(familia, italico, peso):
+    """(caminho, variavel) do TTF/OTF exato do peso: local, senão baixado. None se não houver."""
+    local = caminho_fonte(familia, peso, italico, aproximar=False)
+    if local:
+        return local
+    if peso in NOMES_PESO:
+        baixado = baixar_fonte(familia, italico, peso)
+        if baixado:
+            return baixado, False
+    return None
+
+
+def formato_subset():
+    """WOFF2 quando o brotli está instalado; senão WOFF (zlib)."""
+    return "woff2" if importlib.util.find_spec("brotli") else "woff"
+
+
+def _gerar_subset(texto, formato):
+    def gerar(origem, destino):
+        import logging
+        from fontTools import subset
+
+        # Tabelas que o subsetter não conhece (ex.: FFTM) são descartadas com um aviso por arquivo
+        logging.getLogger("fontTools.subset").setLevel(logging.ERROR)
+        opcoes = subset.Options()
+        opcoes.flavor = formato
+        opcoes.layout_features = ["*"]
+        fonte = subset.load_font(str(origem), opcoes)
+        subsetter = subset.Subsetter(opcoes)
+        subsetter.populate(text=texto)
+        subsetter.subset(fonte)
+        subset.save_font(fonte, str(destino), opcoes)
+    return gerar
+
+
+class SubsetFontes:
+    """
+    Etapa de preparar_html (conteudo, base_dir -> conteudo). Com `conteudos_lote`, os
+    subsets cobrem o texto do lote inteiro e são os mesmos arquivos para todos os HTMLs;
+    sem ele, cada HTML usa só o próprio texto.
+    """
+
+    def __init__(self, conteudos_lote=None, cache=None):
+        self.cache = cache or CacheDerivados()
+        self.formato = formato_subset()
+        self.texto_lote = None
+        if conteudos_lote is not None:
+            self.texto_lote = "".join(sorted(caracteres_usados(conteudos_lote)))
+        self._faces = {}
+
+    def _face(self, familia, italico, peso, texto):
+        """Regra @font-face e URL do subset de um peso, ou None se a fonte não foi encontrada."""
+        chave = (familia, italico, peso, texto)
+        if chave not in self._faces:
+            encontrada = arquivo_fonte(familia, italico, peso)
+            face = None
+            if encontrada:
+                caminho, variavel = encontrada
+                parametros = {"op": "subset", "versao": VERSAO_SUBSET, "formato": self.formato,
+                              "texto": hashlib.sha256(texto.encode("utf-8")).hexdigest()}
+                variante = self.cache.obter(Path(caminho), parametros, _gerar_subset(texto, self.formato),
+                                            extensao=f".{self.formato}")
+                url = variante.resolve().as_uri()
+                # A fonte variável é um arquivo só para todos os pesos
+                faixa_peso = "100 900" if variavel else str(peso)
+                face = (f"@font-face {{ font-family: '{familia}'; font-style: {'italic' if italico else 'normal'}; "
+                        f"font-weight: {faixa_peso}; font-display: block; "
+                        f"src: url('{url}') format('{self.formato}'); }}", url)
+            self._faces[chave] = face
+        return self._faces[chave]
+
+    def __call__(self, conteudo, base_dir):
+        if not importlib.util.find_spec("fontTools"):
+            print("⚠️  fontTools não instalado (pip install fonttools[woff]): fontes mantidas no CDN")
+            return conteudo
+
+        links = RE_LINK_GOOGLE.findall(conteudo)
+        if not links:
+            return conteudo
+        texto = self.texto_lote or "".join(sorted(caracteres_usados([conteudo])))
+
+        regras, urls = [], []
+        for link in links:
+            for familia, italico, peso in estilos_google_fonts(link):
+                face = self._face(familia, italico, peso, texto)
+                if face is None:
+                    print(f"⚠️  Fonte {familia} {peso}{' itálico' if italico else ''} não encontrada: "
+                          "fontes mantidas no CDN")
+                    return conteudo
+                regra, url = face
+                if regra not in regras:
+                    regras.append(regra)
+                if url not in urls:
+                    urls.append(url)
+
+        bloco = "".join(f'<link rel="preload" href="{url}" as="font" type="font/{self.formato}" crossorigin>\n'
+                        for url in urls)
+        bloco += "<style>\n" + "\n".join(regras) + "\n</style>\n"
+        # O primeiro <link> do Google Fonts vira o bloco local; os demais saem
+        substituicoes = iter([bloco])
+        conteudo = RE_PRECONNECT.sub("", conteudo)
+        return RE_LINK_GOOGLE.sub(lambda m: next(substituicoes, ""), conteudo)
@@ -1,7 +1,12 @@
-from playwright.sync_api import sync_playwright
 import os
 import glob
+import fnmatch
 import argparse
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
 
 def obter_configuracoes_plataforma(plataforma, tipo_conteudo="auto"):
     """
@@ -79,57 +84,536 @@ def detectar_tipo_arquivo(html_file_path, plataforma="original"):
         config["tipo"] = "carrossel"
         return config
 
-def gerar_imagem_post(html_file_path, output_filename, config=None, plataforma="original"):
+# Conta os .schedule-item que ultrapassam a área visível do .flyer (acima do rodapé)
+JS_MEDIR_OVERFLOW = """
+() => {
+    const flyer = document.querySelector('.flyer');
+    if (!flyer) return null;
+    const footer = flyer.querySelector('footer');
+    const limite = footer ? footer.getBoundingClientRect().top : flyer.getBoundingClientRect().bottom;
+    const itens = Array.from(flyer.querySelectorAll('.schedule-item'));
+    return itens.filter(item => item.getBoundingClientRect().bottom > limite + 0.5).length;
+}
+"""
+
+def verificar_overflow(page, output_filename):
+    """
+    Confirma com uma medição no DOM se a paginação estimada em Python coube no flyer.
+    Retorna o número de itens cortados (0 quando tudo coube ou o layout não é um flyer).
+    """
+    cortados = page.evaluate(JS_MEDIR_OVERFLOW)
+    if cortados:
+        print(f"⚠️  {output_filename}: {cortados} apresentação(ões) cortada(s) pelo limite do flyer")
+    return cortados or 0
+
+# Captura determinística: sem animações, transições, cursor nem efeitos de hover
+CSS_CAPTURA_DETERMINISTICA = """
+*, *::before, *::after {
+    animation: none !important;
+    transition: none !important;
+    caret-color: transparent !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+# Instante fixo do relógio da página (2024-01-01T00:00:00Z), para que Date e performance.now
+# não mudem entre execuções
+INSTANTE_FIXO_MS = 1704067200000
+
+JS_RELOGIO_FIXO = """
+(() => {
+    const INSTANTE = %d;
+    const DataOriginal = Date;
+    class DataFixa extends DataOriginal {
+        constructor(...args) {
+            if (args.length === 0) { super(INSTANTE); } else { super(...args); }
+        }
+        static now() { return INSTANTE; }
+    }
+    window.Date = DataFixa;
+    performance.now = () => 0;
+    const rafOriginal = window.requestAnimationFrame.bind(window);
+    window.requestAnimationFrame = (callback) => rafOriginal(() => callback(0));
+})();
+""" % INSTANTE_FIXO_MS
+
+# Remove as regras :hover das folhas de estilo da página (as de outra origem não são acessíveis e ficam)
+JS_REMOVER_HOVER = """
+() => {
+    let removidas = 0;
+    // dono: folha de estilo ou regra de agrupamento (@media, ...), ambas com deleteRule
+    const limpar = (dono) => {
+        const regras = dono.cssRules;
+        for (let i = regras.length - 1; i >= 0; i--) {
+            const regra = regras[i];
+            if (regra.selectorText && regra.selectorText.includes(':hover')) {
+                dono.deleteRule(i);
+                removidas++;
+            } else if (regra.cssRules) {
+                limpar(regra);
+            }
+        }
+    };
+    for (const folha of Array.from(document.styleSheets)) {
+        try { limpar(folha); } catch (e) { /* folha de outra origem */ }
+    }
+    return removidas;
+}
+"""
+
+def preparar_captura_deterministica(page):
+    """
+    Deixa a página estável para o screenshot: desliga animações e transições, remove os
+    efeitos de hover e espera as fontes em vez de um tempo fixo. O relógio congelado e o
+    prefers-reduced-motion são aplicados na criação da página (ver gerar_imagem_post).
+    """
+    page.add_style_tag(content=CSS_CAPTURA_DETERMINISTICA)
+    page.evaluate(JS_REMOVER_HOVER)
+    page.mouse.move(0, 0)
+    page.evaluate("() => document.fonts.ready.then(() => true)")
+
+# Blocos que não devem ser cortados entre dois slides no modo fatiado
+SELETOR_BLOCOS_FATIAS = ".course-section, footer"
+
+# Empurra para o slide seguinte cada bloco que cruzaria a divisa entre dois slides e
+# completa a página até um múltiplo da altura do slide. Retorna o número de slides.
+JS_PAGINAR_BLOCOS = """
+([seletor, altura]) => {
+    const topo = (el) => el.getBoundingClientRect().top + window.scrollY;
+    let empurrados = 0;
+    for (const bloco of document.querySelectorAll(seletor)) {
+        const inicio = topo(bloco);
+        const fim = inicio + bloco.getBoundingClientRect().height;
+        const divisa = (Math.floor(inicio / altura) + 1) * altura;
+        // Blocos maiores que um slide são cortados de qualquer forma
+        if (fim > divisa && fim - inicio <= altura) {
+            const margem = parseFloat(getComputedStyle(bloco).marginTop) || 0;
+            bloco.style.marginTop = `${margem + divisa - inicio}px`;
+            empurrados++;
+        }
+    }
+    const raiz = document.documentElement;
+    const total = raiz.scrollHeight;
+    const slides = Math.max(1, Math.ceil(total / altura));
+    raiz.style.paddingBottom = `${slides * altura - total}px`;
+    return {slides, empurrados};
+}
+"""
+
+def gravar_screenshot(page, destino, screenshot_options, salvar=None):
+    """Tira o screenshot e grava em `destino`, ou entrega os bytes a salvar(destino, dados)."""
+    if salvar is None:
+        page.screenshot(path=destino, **screenshot_options)
+    else:
+        salvar(destino, page.screenshot(**screenshot_options))
+
+def capturar_fatias(page, output_filename, config, screenshot_options, salvar=None):
+    """
+    Captura uma página alta como carrossel: slides do tamanho da plataforma, numerados
+    (nome_01.png, nome_02.png, ...), sem cortar os blocos de SELETOR_BLOCOS_FATIAS.
+    O layout é feito uma vez; cada slide é um recorte da mesma página.
+    """
+    largura, altura = config["width"], config["height"]
+    resultado = page.evaluate(JS_PAGINAR_BLOCOS, [SELETOR_BLOCOS_FATIAS, altura])
+    
+    raiz, extensao = os.path.splitext(output_filename)
+    arquivos = []
+    for i in range(resultado["slides"]):
+        destino = f"{raiz}_{i + 1:02d}{extensao}"
+        clip = {"x": 0, "y": i * altura, "width": largura, "height": altura}
+        gravar_screenshot(page, destino, dict(screenshot_options, full_page=True, clip=clip), salvar)
+        arquivos.append(destino)
+    return arquivos
+
+# Pasta dos traces e resumos gravados com --trace
+PASTA_TRACES = "traces"
+
+# Prévia rápida (--preview): meia resolução, JPEG e pasta própria
+PASTA_PREVIEW = "preview_posts"
+ESCALA_PREVIEW = 0.5
+QUALIDADE_PREVIEW = 60
+# Tipos de requisição cortados na prévia; os templates reservam no CSS o espaço das imagens
+TIPOS_BLOQUEADOS_PREVIEW = {"image", "media"}
+
+def nome_saida(plataforma, nome_base, preview=False):
+    """Arquivo de saída de um render: <plataforma>_posts/nome.png, ou preview_posts/<plataforma>/nome.jpg."""
+    if preview:
+        return os.path.join(PASTA_PREVIEW, plataforma, f"{nome_base}.jpg")
+    return os.path.join(f"{plataforma}_posts", f"{nome_base}.png")
+
+def bloquear_nao_essenciais(route):
+    """
+    Handler de page.route da prévia: corta tudo o que vem da rede (Google Fonts) e as
+    imagens; o resto segue para o handler da origem virtual, por onde a prévia carrega
+    os arquivos locais (requisições file:// não passam por page.route).
+    """
+    from pool_navegadores import ORIGEM_VIRTUAL
+    
+    url = route.request.url
+    remoto = url.startswith(("http://", "https://")) and not url.startswith(ORIGEM_VIRTUAL)
+    if remoto or route.request.resource_type in TIPOS_BLOQUEADOS_PREVIEW:
+        route.abort()
+    else:
+        route.fallback()
+
+def preparar_html(html_file, etapas):
+    """
+    Aplica etapas de pré-renderização (funções conteudo, base_dir -> conteudo) ao HTML.
+    Grava o resultado no cache com um <base> apontando para a pasta original, para que
+    os caminhos relativos continuem válidos, e retorna o caminho do arquivo a carregar.
+    """
+    if not etapas:
+        return html_file
+    
+    from imagem_ops import marcar_uso, pasta_cache_padrao, registrar_no_cache
+    
+    with open(html_file, 'r', encoding='utf-8') as file:
+        conteudo = file.read()
+    
+    base_dir = os.path.dirname(os.path.abspath(html_file))
+    for etapa in etapas:
+        conteudo = etapa(conteudo, base_dir)
+    
+    base_href = f'<base href="{Path(base_dir).as_uri()}/">'
+    conteudo = re.sub(r'(<head[^>]*>)', lambda m: m.group(1) + base_href, conteudo, count=1, flags=re.IGNORECASE)
+    
+    pasta = pasta_cache_padrao() / "html"
+    pasta.mkdir(parents=True, exist_ok=True)
+    nome_base = os.path.splitext(os.path.basename(html_file))[0]
+    chave = hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+    destino = pasta / f"{nome_base}-{chave}.html"
+    if destino.exists():
+        marcar_uso(destino)
+    else:
+        destino.write_text(conteudo, encoding='utf-8')
+        registrar_no_cache(destino)
+    return str(destino)
+
+def etapas_preparacao(args, html_files=None):
+    """
+    Monta a lista de etapas de pré-renderização conforme as opções da linha de comando.
+    `html_files` é o lote inteiro (o subset de fontes cobre o texto de todos os arquivos).
+    """
+    etapas = []
+    if args.otimizar_assets:
+        from otimizar_assets import otimizar_imagens_html
+        etapas.append(otimizar_imagens_html)
+    if getattr(args, "subsetar_fontes", False):
+        from fontes_subset import SubsetFontes
+        conteudos = None
+        if html_files:
+            conteudos = [Path(html_file).read_text(encoding='utf-8') for html_file in html_files]
+        etapas.append(SubsetFontes(conteudos))
+    return etapas
+
+def gerar_imagem_post(html_file_path, output_filename, config=None, plataforma="original", browser=None,
+                      salvar=None):
     """
     Renderiza arquivo HTML em uma imagem usando Playwright.
     Detecta automaticamente o tipo de arquivo e aplica configurações apropriadas para cada plataforma.
+    Com `browser`, reaproveita um navegador já aberto (só abre e fecha uma página);
+    sem ele, abre e fecha um Chromium só para esta imagem. Com `salvar`, as imagens não
+    vão para o disco: cada uma é entregue como salvar(nome, bytes). Retorna os nomes gerados.
     """
     if config is None:
         config = detectar_tipo_arquivo(html_file_path, plataforma)
     
-    with sync_playwright() as p:
-        # Inicia um navegador Chromium (headless por padrão)
-        browser = p.chromium.launch()
-        
-        # Cria uma nova página
-        page = browser.new_page()
-        
-        # Define o tamanho da viewport
-        page.set_viewport_size({"width": config["width"], "height": config["height"]})
+    if browser is None:
+        from playwright.sync_api import sync_playwright
         
+        with sync_playwright() as p:
+            # Inicia um navegador Chromium (headless por padrão)
+            browser = p.chromium.launch()
+            try:
+                return gerar_imagem_post(html_file_path, output_filename, config, plataforma, browser, salvar)
+            finally:
+                browser.close()
+    
+    deterministico = config.get("deterministico", False)
+    
+    # Cria uma nova página
+    opcoes_pagina = {}
+    if deterministico:
+        opcoes_pagina["reduced_motion"] = "reduce"
+    if config.get("preview"):
+        # O layout continua em px CSS do tamanho da plataforma; só a rasterização encolhe
+        opcoes_pagina["device_scale_factor"] = ESCALA_PREVIEW
+    page = browser.new_page(**opcoes_pagina)
+    if deterministico:
+        page.add_init_script(JS_RELOGIO_FIXO)
+    
+    caminho_trace = config.get("trace")
+    if not caminho_trace:
+        try:
+            return _capturar(page, html_file_path, output_filename, config, deterministico, salvar)
+        finally:
+            page.close()
+    
+    # Trace do Chromium e métricas do CDP do carregamento ao screenshot (ver trace_render.py)
+    from trace_render import CATEGORIAS_TRACE, formatar_resumo, resumir_trace
+    
+    # O tracing vale para o navegador inteiro: só uma página com trace por navegador (ver main)
+    try:
+        os.makedirs(os.path.dirname(caminho_trace) or ".", exist_ok=True)
+        cdp = page.context.new_cdp_session(page)
+        cdp.send("Performance.enable")
+        browser.start_tracing(page=page, path=caminho_trace, categories=CATEGORIAS_TRACE)
+        try:
+            inicio = time.perf_counter()
+            arquivos = _capturar(page, html_file_path, output_filename, config, deterministico, salvar)
+            segundos = time.perf_counter() - inicio
+            metricas = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        finally:
+            browser.stop_tracing()
+    finally:
+        page.close()
+    
+    resumo = resumir_trace(caminho_trace, segundos, metricas)
+    resumo["arquivo"] = output_filename
+    with open(os.path.splitext(caminho_trace)[0] + ".resumo.json", "w", encoding="utf-8") as arquivo:
+        json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
+    print(formatar_resumo(resumo))
+    return arquivos
+
+def _capturar(page, html_file_path, output_filename, config, deterministico, salvar=None):
+    """Carrega o HTML na página e grava o screenshot; retorna a lista de arquivos gerados."""
+    # Define o tamanho da viewport
+    page.set_viewport_size({"width": config["width"], "height": config["height"]})
+    preview = config.get("preview", False)
+    
+    if config.get("remoto") or preview:
+        # Navegador remoto (CDP) não enxerga o disco: os arquivos vêm pela origem virtual.
+        # Na prévia também: o page.route do Chromium não intercepta subrecursos file://,
+        # e as imagens só podem ser cortadas quando passam por uma origem http
+        from pool_navegadores import servir_arquivos_locais, url_virtual
+        servir_arquivos_locais(page)
+        file_url = url_virtual(html_file_path)
+    else:
         # Carrega o arquivo HTML diretamente
         file_url = f"file://{os.path.abspath(html_file_path)}"
-        page.goto(file_url, wait_until="networkidle")
-        
+    if preview:
+        # Registrado por último, roda antes do handler da origem virtual
+        page.route("**/*", bloquear_nao_essenciais)
+    # Na prévia não há requisições de rede a esperar
+    page.goto(file_url, wait_until="load" if preview else "networkidle")
+    
+    if deterministico:
+        preparar_captura_deterministica(page)
+    elif not preview:
         # Aguarda um pouco para garantir que tudo carregou
         page.wait_for_timeout(1500)
-        
-        # Configurações de screenshot baseadas no tipo e plataforma
-        screenshot_options = {
-            "path": output_filename,
-            "type": "png",
-            "scale": "css"
+    
+    if config.get("verificar_overflow"):
+        verificar_overflow(page, output_filename)
+    
+    # Configurações de screenshot baseadas no tipo e plataforma
+    screenshot_options = {
+        "type": "png",
+        "scale": "css"
+    }
+    if preview:
+        # JPEG na resolução do device_scale_factor reduzido
+        screenshot_options = {"type": "jpeg", "quality": QUALIDADE_PREVIEW, "scale": "device"}
+    
+    if deterministico:
+        screenshot_options["animations"] = "disabled"
+    
+    if config["full_page"]:
+        # Para mapas, captura a página inteira
+        screenshot_options["full_page"] = True
+    else:
+        # Para outros tipos, usa dimensões fixas
+        screenshot_options["clip"] = {
+            "x": 0,
+            "y": 0,
+            "width": config["width"],
+            "height": config["height"]
         }
-        
-        if config["full_page"]:
-            # Para mapas, captura a página inteira
-            screenshot_options["full_page"] = True
-        else:
-            # Para outros tipos, usa dimensões fixas
-            screenshot_options["clip"] = {
-                "x": 0,
-                "y": 0,
-                "width": config["width"],
-                "height": config["height"]
-            }
-        
+    
+    plataforma_info = f"{config['plataforma']} ({config['width']}x{config['height']})"
+    if preview:
+        plataforma_info += " - prévia"
+    
+    if config["full_page"] and config.get("fatiar"):
+        # Mapa em modo carrossel: recorta a página em slides do tamanho da plataforma
+        arquivos = capturar_fatias(page, output_filename, config, screenshot_options, salvar)
+        print(f"✅ {len(arquivos)} slides ({os.path.basename(arquivos[0])}, ...) - {config['tipo']} para {plataforma_info}")
+    else:
         # Tira o screenshot e salva
-        page.screenshot(**screenshot_options)
-        
-        plataforma_info = f"{config['plataforma']} ({config['width']}x{config['height']})"
+        gravar_screenshot(page, output_filename, screenshot_options, salvar)
+        arquivos = [output_filename]
         print(f"✅ {output_filename} - {config['tipo']} para {plataforma_info}")
-        
-        browser.close()
+    
+    return arquivos
+
+def renderizar_tarefa(indice, tarefa, browser=None, escritor=None, remoto=False):
+    """
+    Renderiza uma tarefa (html, saida, config, plataforma). Com `escritor` (EscritorPacote,
+    ver arquivo_saida.py), as imagens da tarefa vão para o pacote na posição `indice`.
+    """
+    html_file, nome_arquivo, config, plataforma = tarefa
+    if remoto:
+        config = dict(config, remoto=True)
+    if escritor is None:
+        return gerar_imagem_post(html_file, nome_arquivo, config, plataforma, browser)
+    
+    # Só entrega ao pacote depois que a tarefa inteira deu certo (uma nova tentativa não duplica slides)
+    imagens = []
+    arquivos = gerar_imagem_post(html_file, nome_arquivo, config, plataforma, browser,
+                                 lambda nome, dados: imagens.append((nome.replace(os.sep, "/"), dados)))
+    escritor.adicionar(indice, imagens)
+    return arquivos
+
+def renderizar_no_pool(tarefas, endpoints, paginas_por_endpoint, escritor=None):
+    """
+    Distribui as tarefas (html, saida, config, plataforma) entre navegadores remotos por CDP
+    (ver pool_navegadores.py), com uma thread por página simultânea. Retorna False, sem
+    renderizar nada, quando nenhum endpoint responde (quem chama usa o Chromium local).
+    """
+    import queue
+    import threading
+    from playwright.sync_api import sync_playwright
+    from pool_navegadores import PoolNavegadores
+    
+    pool = PoolNavegadores(endpoints, paginas_por_endpoint)
+    if not pool.verificar():
+        print("⚠️  Nenhum navegador remoto respondeu; usando o Chromium local")
+        return False
+    
+    pendentes = queue.Queue()
+    for indice, tarefa in enumerate(tarefas):
+        pendentes.put((indice, tarefa))
+    
+    def trabalhador():
+        # Cada thread tem o seu Playwright e as suas conexões (a API síncrona não é thread-safe)
+        with sync_playwright() as p:
+            conexoes = {}
+            local = None
+            while True:
+                try:
+                    indice, tarefa = pendentes.get_nowait()
+                except queue.Empty:
+                    break
+                
+                while True:
+                    endpoint = pool.escolher()
+                    if endpoint is None:
+                        # Todos os endpoints caíram no meio do lote: termina no Chromium local
+                        local = local or p.chromium.launch()
+                        try:
+                            renderizar_tarefa(indice, tarefa, local, escritor)
+                        except Exception as e:
+                            print(f"❌ Erro ao processar {tarefa[0]}: {e}")
+                            if escritor:
+                                escritor.adicionar(indice, [])
+                        break
+                    
+                    try:
+                        if endpoint not in conexoes or not conexoes[endpoint].is_connected():
+                            conexoes[endpoint] = p.chromium.connect_over_cdp(endpoint)
+                        renderizar_tarefa(indice, tarefa, conexoes[endpoint], escritor, remoto=True)
+                    except Exception as e:
+                        # Endpoint ainda responde: o erro é do próprio HTML, não adianta refazer
+                        pool.liberar(endpoint, falhou=True)
+                        if endpoint in pool.saudaveis:
+                            print(f"❌ Erro ao processar {tarefa[0]} em {endpoint}: {e}")
+                            if escritor:
+                                escritor.adicionar(indice, [])
+                            break
+                        continue
+                    pool.liberar(endpoint)
+                    break
+            
+            for browser in list(conexoes.values()) + [local]:
+                if browser is not None:
+                    browser.close()
+    
+    threads = [threading.Thread(target=trabalhador) for _ in range(min(pool.vagas, len(tarefas)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return True
+
+def renderizar_autoajustado(tarefas, teto_rss_mb=None, maximo=None, escritor=None):
+    """
+    Renderiza as tarefas (html, saida, config, plataforma) com vários Chromium locais, um
+    por thread, deixando o Autoajuste (ver autoajuste.py) escolher quantos trabalham ao
+    mesmo tempo. Threads paradas fecham o navegador para liberar a memória.
+    """
+    import queue
+    import threading
+    from autoajuste import Autoajuste
+    from playwright.sync_api import sync_playwright
+    
+    ajuste = Autoajuste(teto_rss_mb, maximo)
+    teto = f", teto de RSS {teto_rss_mb} MB" if teto_rss_mb else ""
+    print(f"⚙️  Autoajuste: começando com {ajuste.concorrencia} página(s) simultânea(s){teto}")
+    
+    pendentes = queue.Queue()
+    for indice, tarefa in enumerate(tarefas):
+        pendentes.put((indice, tarefa))
+    
+    def trabalhador(indice):
+        with sync_playwright() as p:
+            browser = None
+            while True:
+                if browser is not None and not ajuste.ativa(indice):
+                    browser.close()
+                    browser = None
+                if not ajuste.aguardar_vez(indice):
+                    break
+                try:
+                    indice_tarefa, tarefa = pendentes.get_nowait()
+                except queue.Empty:
+                    ajuste.encerrar()
+                    break
+                
+                try:
+                    browser = browser or p.chromium.launch()
+                    renderizar_tarefa(indice_tarefa, tarefa, browser, escritor)
+                except Exception as e:
+                    print(f"❌ Erro ao processar {tarefa[0]}: {e}")
+                    if escritor:
+                        escritor.adicionar(indice_tarefa, [])
+                ajuste.registrar()
+            if browser is not None:
+                browser.close()
+    
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(min(ajuste.maximo, len(tarefas)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    ajuste.salvar()
+    segundos = time.perf_counter() - inicio
+    if ajuste.melhor:
+        print(f"⚙️  Melhor nível: {ajuste.melhor[0]} página(s) ({ajuste.melhor[1]:.2f} imagens/s, "
+              f"pico de RSS {ajuste.pico_rss_mb:.0f} MB); salvo para as próximas execuções")
+    print(f"⏱️  {len(tarefas)} render(s) em {segundos:.1f} s")
+
+def executar_trabalho(trabalho, browser):
+    """Renderiza um trabalho da fila (ver fila_render.py) no navegador já aberto do trabalhador."""
+    etapas = etapas_preparacao(argparse.Namespace(**trabalho["etapas"]))
+    html_render = preparar_html(trabalho["html"], etapas)
+    os.makedirs(os.path.dirname(trabalho["saida"]), exist_ok=True)
+    return gerar_imagem_post(html_render, trabalho["saida"], trabalho["config"], trabalho["plataforma"], browser)
+
+def trabalhar(spool, aguardar=False):
+    """Modo trabalhador: consome a fila do spool com um único Chromium aquecido."""
+    from fila_render import id_trabalhador, processar_fila
+    from playwright.sync_api import sync_playwright
+    
+    print(f"👷 Trabalhador {id_trabalhador()} consumindo {spool}")
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        try:
+            concluidos, falhas = processar_fila(spool, lambda trabalho: executar_trabalho(trabalho, browser), aguardar)
+        finally:
+            browser.close()
+    print(f"\n✨ Fila vazia: {concluidos} trabalho(s) concluído(s), {falhas} falha(s)")
 
 def main():
     """Função principal com argumentos de linha de comando."""
@@ -145,20 +629,140 @@ def main():
         type=str, 
         help="Arquivo HTML específico para processar (opcional)"
     )
+    parser.add_argument(
+        "--otimizar-assets",
+        action="store_true",
+        help="Reduz as imagens dos HTMLs ao tamanho de exibição (cache) antes de renderizar"
+    )
+    parser.add_argument(
+        "--subsetar-fontes",
+        action="store_true",
+        help="Troca o Google Fonts por WOFF2 locais só com os glifos do lote (cache), com preload"
+    )
+    parser.add_argument(
+        "--deterministico",
+        action="store_true",
+        help="Captura estável: sem animações, transições e hover, com relógio congelado e sem espera fixa"
+    )
+    parser.add_argument(
+        "--fatiar",
+        action="store_true",
+        help="Divide páginas altas (mapa) em slides numerados do tamanho da plataforma, sem cortar os cursos"
+    )
+    parser.add_argument(
+        "--cdp",
+        action="append",
+        metavar="ENDPOINT",
+        help="Navegador remoto por CDP (ws://host:porta/devtools/browser/... ou http://host:porta); "
+             "repita para formar um pool. Sem nenhum endpoint saudável, usa o Chromium local"
+    )
+    parser.add_argument(
+        "--paginas-por-endpoint",
+        type=int,
+        default=2,
+        help="Páginas renderizadas ao mesmo tempo em cada navegador remoto (padrão: 2)"
+    )
+    parser.add_argument(
+        "--autoajuste",
+        action="store_true",
+        help="Renderiza com vários Chromium locais, ajustando quantos ao mesmo tempo pela vazão e pela memória "
+             "(o melhor valor é salvo por host)"
+    )
+    parser.add_argument(
+        "--teto-rss",
+        type=int,
+        metavar="MB",
+        help="Com --autoajuste, memória residente máxima (processo + Chromium); padrão: 70%% da RAM"
+    )
+    parser.add_argument(
+        "--saida-arquivo",
+        metavar="PACOTE",
+        help="Grava as imagens direto em um pacote .zip, .tar ou .tar.gz (ordem fixa, com manifest.json) "
+             "em vez das pastas *_posts"
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="*",
+        metavar="PADRAO",
+        help="Grava um trace do Chromium por render em traces/ (abre no Perfetto ou em chrome://tracing) "
+             "e um resumo de layout, pintura, script, decodificação e fontes; PADRAO (ex.: 'Dia*') "
+             "limita aos HTMLs cujo nome casa com ele"
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help=f"Prévia rápida em {PASTA_PREVIEW}/: JPEG em meia resolução, sem fontes remotas, imagens "
+             "e esperas, com o mesmo layout (serve para conferir textos, ordem e overflow)"
+    )
+    parser.add_argument(
+        "--simular",
+        action="store_true",
+        help="Só lista os renders planejados (HTML, saída, formato e tamanho), sem abrir o navegador"
+    )
+    parser.add_argument(
+        "--limpar-cache",
+        nargs="?",
+        const=0,
+        type=float,
+        metavar="MB",
+        help="Só limpa o cache de derivados (HTML preparado, imagens, fontes), removendo os arquivos usados "
+             "há mais tempo até caber em MB; sem MB, esvazia"
+    )
+    parser.add_argument(
+        "--verificar-overflow",
+        action="store_true",
+        help="Mede no DOM se algum item do cronograma foi cortado pelo flyer"
+    )
+    fila = parser.add_mutually_exclusive_group()
+    fila.add_argument(
+        "--enfileirar",
+        metavar="SPOOL",
+        help="Em vez de renderizar, grava os trabalhos (html, plataforma, formato) na pasta de spool"
+    )
+    fila.add_argument(
+        "--trabalhador",
+        metavar="SPOOL",
+        help="Consome os trabalhos da pasta de spool com um navegador aquecido (vários hosts podem dividir a fila)"
+    )
+    parser.add_argument(
+        "--aguardar",
+        action="store_true",
+        help="Com --trabalhador, continua esperando novos trabalhos quando a fila esvazia"
+    )
     
     args = parser.parse_args()
     
+    if args.limpar_cache is not None:
+        from imagem_ops import limpar_cache, pasta_cache_padrao
+        
+        removidos, liberados = limpar_cache(tamanho_maximo_mb=args.limpar_cache)
+        print(f"🧹 {pasta_cache_padrao()}: {removidos} arquivo(s) removido(s), {liberados / 2 ** 20:.1f} MB liberados")
+        return
+    
+    if args.saida_arquivo and (args.enfileirar or args.trabalhador):
+        parser.error("--saida-arquivo não pode ser usado com a fila (--enfileirar/--trabalhador)")
+    
+    if args.trace and args.cdp and args.paginas_por_endpoint > 1:
+        # start_tracing vale para o navegador inteiro: duas páginas no mesmo endpoint
+        # disputariam o trace (a segunda falha) e misturariam os eventos
+        print("⚠️  --trace usa 1 página por navegador remoto (ignorando --paginas-por-endpoint)")
+        args.paginas_por_endpoint = 1
+    
+    if args.trabalhador:
+        trabalhar(args.trabalhador, args.aguardar)
+        return
+    
     # Cria as pastas de saída se não existirem
     if args.plataforma == "todas":
-        output_dirs = ["instagram_posts", "whatsapp_posts", "original_posts"]
         plataformas = ["instagram", "whatsapp", "original"]
     else:
-        output_dir = f"{args.plataforma}_posts"
-        output_dirs = [output_dir]
         plataformas = [args.plataforma]
+    output_dirs = [os.path.dirname(nome_saida(plataforma, "", args.preview)) for plataforma in plataformas]
     
-    for output_dir in output_dirs:
-        os.makedirs(output_dir, exist_ok=True)
+    if not args.saida_arquivo and not args.simular:
+        for output_dir in output_dirs:
+            os.makedirs(output_dir, exist_ok=True)
     
     # Define arquivos a processar
     html_dir = "html"
@@ -179,32 +783,122 @@ def main():
     print(f"📱 Gerando posts para: {', '.join(plataformas)}")
     print(f"📄 Arquivos encontrados: {len(html_files)}")
     
-    # Processa cada arquivo para cada plataforma
-    for plataforma in plataformas:
-        output_dir = f"{plataforma}_posts"
-        print(f"\n🎯 Processando para {plataforma.upper()}:")
-        print("-" * 50)
+    if args.enfileirar:
+        from fila_render import enfileirar
         
+        total = 0
+        for plataforma in plataformas:
+            for html_file in html_files:
+                nome_base = os.path.splitext(os.path.basename(html_file))[0]
+                config = detectar_tipo_arquivo(html_file, plataforma)
+                config["verificar_overflow"] = args.verificar_overflow
+                config["deterministico"] = args.deterministico
+                config["fatiar"] = args.fatiar
+                config["preview"] = args.preview
+                if args.trace and fnmatch.fnmatch(os.path.basename(html_file), args.trace):
+                    # Caminho absoluto: o trabalhador roda em outra pasta (ou em outro host, no spool compartilhado)
+                    config["trace"] = os.path.abspath(os.path.join(PASTA_TRACES, f"{nome_base}-{plataforma}.json"))
+                enfileirar(args.enfileirar, {
+                    "html": os.path.abspath(html_file),
+                    "plataforma": plataforma,
+                    "formato": config["formato"],
+                    "config": config,
+                    "etapas": {"otimizar_assets": args.otimizar_assets, "subsetar_fontes": args.subsetar_fontes},
+                    "saida": os.path.abspath(nome_saida(plataforma, nome_base, args.preview)),
+                })
+                total += 1
+        print(f"\n📥 {total} trabalho(s) enfileirado(s) em {args.enfileirar}")
+        print(f"   Inicie os trabalhadores com: python gerar_posts.py --trabalhador {args.enfileirar}")
+        return
+    
+    if args.simular:
+        total = 0
+        for plataforma in plataformas:
+            print(f"\n🔎 {plataforma.upper()}:")
+            for html_file in html_files:
+                nome_base = os.path.splitext(os.path.basename(html_file))[0]
+                config = detectar_tipo_arquivo(html_file, plataforma)
+                altura = f"{config['height']}+" if config["full_page"] else config["height"]
+                print(f"   • {html_file} → {nome_saida(plataforma, nome_base, args.preview)} "
+                      f"({config['formato']}, {config['width']}x{altura})")
+                total += 1
+        print(f"\n🔎 {total} render(s) planejado(s); nada foi renderizado (--simular)")
+        return
+    
+    # Etapas de pré-renderização (feitas uma vez por arquivo, valem para todas as plataformas)
+    etapas = etapas_preparacao(args, html_files)
+    html_render = {html_file: preparar_html(html_file, etapas) for html_file in html_files}
+    
+    # Monta as tarefas: cada arquivo para cada plataforma
+    tarefas = []
+    for plataforma in plataformas:
         for html_file in html_files:
             nome_base = os.path.splitext(os.path.basename(html_file))[0]
             
             # Detecta configurações para a plataforma
             config = detectar_tipo_arquivo(html_file, plataforma)
+            config["verificar_overflow"] = args.verificar_overflow
+            config["deterministico"] = args.deterministico
+            config["fatiar"] = args.fatiar
+            config["preview"] = args.preview
+            if args.trace and fnmatch.fnmatch(os.path.basename(html_file), args.trace):
+                config["trace"] = os.path.join(PASTA_TRACES, f"{nome_base}-{plataforma}.json")
             
             # Define nome do arquivo de saída
-            nome_arquivo = os.path.join(output_dir, f"{nome_base}.png")
+            nome_arquivo = nome_saida(plataforma, nome_base, args.preview)
+            tarefas.append((html_render[html_file], nome_arquivo, config, plataforma))
+    
+    escritor = None
+    if args.saida_arquivo:
+        from arquivo_saida import EscritorPacote
+        
+        try:
+            escritor = EscritorPacote(args.saida_arquivo)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+    
+    try:
+        if args.cdp:
+            print(f"\n🎯 Distribuindo {len(tarefas)} render(s) entre {len(args.cdp)} navegador(es) remoto(s):")
+            print("-" * 50)
+            remoto = renderizar_no_pool(tarefas, args.cdp, args.paginas_por_endpoint, escritor)
+        else:
+            remoto = False
+        
+        if not remoto and args.autoajuste:
+            from autoajuste import teto_rss_padrao
             
-            try:
-                gerar_imagem_post(html_file, nome_arquivo, config, plataforma)
+            print(f"\n🎯 Renderizando {len(tarefas)} imagem(ns) com autoajuste:")
+            print("-" * 50)
+            renderizar_autoajustado(tarefas, args.teto_rss or teto_rss_padrao(), escritor=escritor)
+        elif not remoto:
+            for plataforma in plataformas:
+                print(f"\n🎯 Processando para {plataforma.upper()}:")
+                print("-" * 50)
                 
-            except Exception as e:
-                print(f"❌ Erro ao processar {html_file}: {e}")
+                for indice, tarefa in enumerate(tarefas):
+                    if tarefa[3] != plataforma:
+                        continue
+                    try:
+                        renderizar_tarefa(indice, tarefa, escritor=escritor)
+                        
+                    except Exception as e:
+                        print(f"❌ Erro ao processar {tarefa[0]}: {e}")
+                        if escritor:
+                            escritor.adicionar(indice, [])
+    finally:
+        if escritor:
+            total = escritor.fechar()
     
     print(f"\n✨ Processo Concluído!")
+    if escritor:
+        print(f"📦 {args.saida_arquivo}: {total} imagem(ns) + manifest.json")
+        return
     print("📂 Verifique as pastas:")
     for output_dir in output_dirs:
         if os.path.exists(output_dir):
-            arquivos = len([f for f in os.listdir(output_dir) if f.endswith('.png')])
+            arquivos = len([f for f in os.listdir(output_dir) if f.endswith(('.png', '.jpg'))])
             print(f"   • {output_dir}/ ({arquivos} imagens)")
 
 if __name__ == "__main__":
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Operações de imagem compartilhadas pelos geradores (remoção de fundo branco e
+extração da paleta da marca).
+
+Modos de remoção de fundo, sobre os mesmos kernels vetorizados:
+- "global": pixel transparente quando a distância euclidiana ao branco é menor que o
+  limiar (regra original de removeBackground/Script.py).
+- "border-connected": remove apenas o "quase branco" (>= 245 em R, G e B) conectado aos
+  cantos da imagem, preservando brancos internos (regra original de gerar_logo_transparente).
+
+Os resultados podem ser guardados em um cache por hash de conteúdo (CacheDerivados).
+A pasta do cache é a mesma para o gerador RAJJ, o removeBackground em lote e as etapas
+do gerar_posts, mas o modo e os parâmetros entram na chave: um resultado só é
+reaproveitado por quem pede a mesma transformação (ex.: outra execução do lote com o
+mesmo limiar). O cache tem um tamanho máximo; os arquivos usados há mais tempo saem
+primeiro (ver limpar_cache).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+from pathlib import Path
+
+MODOS = ("global", "border-connected")
+
+LIMIAR_PADRAO = 40
+LIMITE_QUASE_BRANCO = 245
+
+# Linhas por bloco do kernel de limiar; limita os temporários int32
+LINHAS_POR_BLOCO = 256
+
+# Acima deste número de pixels o processamento é feito em tiles (ver imagem_tiles.py)
+LIMITE_PIXELS_TILES = 40_000_000
+
+# Versão das regras; entra na chave do cache para invalidar resultados antigos
+VERSAO_KERNELS = 1
+
+# Tamanho máximo padrão do cache de derivados ($GERADOR_CACHE_MAX_MB)
+TAMANHO_MAXIMO_CACHE_MB = 1024
+# Ao passar do máximo, a limpeza desce até esta fração dele (evita varrer o cache a cada gravação)
+FRACAO_APOS_LIMPEZA = 0.9
+
+# Lado máximo da miniatura usada na extração de paleta
+LADO_PALETA = 96
+# Distância RGB máxima para dois tons caírem no mesmo cluster da paleta
+DISTANCIA_CLUSTER = 72
+
+
+def aplicar_limiar_branco(rgba, limiar=LIMIAR_PADRAO, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Define o alpha de um array RGBA (altura, largura, 4) no próprio buffer.
+
+    Compara a distância ao branco ao quadrado (inteiros) com limiar**2, sem cópia em
+    float nem raiz quadrada, processando linhas_por_bloco linhas por vez.
+    """
+    import numpy as np
+
+    limite = limiar ** 2
+    altura = rgba.shape[0]
+    for inicio in range(0, altura, linhas_por_bloco):
+        bloco = rgba[inicio:inicio + linhas_por_bloco]
+        dist2 = np.zeros(bloco.shape[:2], dtype=np.int32)
+        for canal in range(3):
+            delta = np.subtract(255, bloco[:, :, canal], dtype=np.int32)
+            delta *= delta
+            dist2 += delta
+        alpha = bloco[:, :, 3]
+        alpha.fill(255)
+        alpha[dist2 < limite] = 0
+
+
+def mascara_quase_branco(rgb):
+    """Máscara booleana dos pixels com R, G e B >= 245 (fundo de JPG com compressão)."""
+    import numpy as np
+
+    return np.logical_and.reduce(rgb[:, :, :3] >= LIMITE_QUASE_BRANCO, axis=2)
+
+
+def propagar_rotulos(n, a, b):
+    """
+    Une os nós 0..n-1 ligados pelas arestas (a[i], b[i]).
+
+    Propaga o menor rótulo pelas arestas com "pointer jumping" até estabilizar;
+    retorna um array em que nós do mesmo componente têm o mesmo rótulo.
+    """
+    import numpy as np
+
+    rotulos = np.arange(n, dtype=np.int64)
+    while True:
+        anterior = rotulos.copy()
+        np.minimum.at(rotulos, a, rotulos[b])
+        np.minimum.at(rotulos, b, rotulos[a])
+        rotulos = rotulos[rotulos]
+        if np.array_equal(rotulos, anterior):
+            return rotulos
+
+
+def rotular_componentes(mask):
+    """
+    Rotula componentes 4-conexos de uma máscara booleana (altura, largura).
+
+    Trabalha com "runs" horizontais: cada pixel recebe o id do seu run (cumsum dos
+    inícios de run) e runs sobrepostos em linhas vizinhas são unidos por
+    propagar_rotulos. Retorna (rotulos_por_pixel, n), com rótulos em [0, n) e
+    valor sem significado fora da máscara.
+    """
+    import numpy as np
+
+    h, w = mask.shape
+    inicio = mask.copy()
+    inicio[:, 1:] &= ~mask[:, :-1]
+    n_runs = int(np.count_nonzero(inicio))
+    ids = np.cumsum(inicio.ravel(), dtype=np.int32).reshape(h, w) - 1
+    del inicio
+    if n_runs == 0:
+        return ids, 0
+
+    vertical = mask[1:] & mask[:-1]
+    pares = np.unique(ids[:-1][vertical].astype(np.int64) * n_runs + ids[1:][vertical])
+    del vertical
+    rotulos = propagar_rotulos(n_runs, pares // n_runs, pares % n_runs)
+    return rotulos[ids], n_runs
+
+
+def fundo_conectado_aos_cantos(mask):
+    """Máscara do fundo: componentes de mask que contêm algum canto da imagem."""
+    import numpy as np
+
+    h, w = mask.shape
+    rotulos, n = rotular_componentes(mask)
+    cantos = [(0, 0), (0, w - 1), (h - 1, 0), (h - 1, w - 1)]
+    sementes = np.unique([rotulos[y, x] for y, x in cantos if mask[y, x]])
+    if n == 0 or sementes.size == 0:
+        return np.zeros_like(mask)
+    return mask & np.isin(rotulos, sementes)
+
+
+def remover_fundo(rgba, modo="global", limiar=LIMIAR_PADRAO):
+    """Remove o fundo branco de um array RGBA uint8, escrevendo o alpha no próprio buffer."""
+    if modo == "global":
+        aplicar_limiar_branco(rgba, limiar)
+    elif modo == "border-connected":
+        fundo = fundo_conectado_aos_cantos(mascara_quase_branco(rgba))
+        rgba[:, :, 3][fundo] = 0
+    else:
+        raise ValueError(f"Modo desconhecido: {modo} (use {', '.join(MODOS)})")
+    return rgba
+
+
+def remover_fundo_arquivo(origem, destino, modo="global", limiar=LIMIAR_PADRAO, tamanho_tile=None):
+    """
+    Lê origem, remove o fundo e grava um PNG RGBA em destino.
+
+    Imagens acima de LIMITE_PIXELS_TILES (ou com tamanho_tile informado) são
+    processadas em tiles mapeados em disco; a memória só é limitada para qualquer
+    tamanho com entradas PPM (ver imagem_tiles.py).
+    """
+    import numpy as np
+
+    from PIL import Image
+
+    if tamanho_tile is None:
+        try:
+            with warnings.catch_warnings():
+                # O tamanho é só consultado aqui; imagens enormes vão para os tiles
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(origem) as probe:
+                    largura, altura = probe.size
+            grande = largura * altura > LIMITE_PIXELS_TILES
+        except Image.DecompressionBombError:
+            grande = True
+        if grande:
+            tamanho_tile = 1024
+
+    if tamanho_tile:
+        from imagem_tiles import remover_fundo_em_tiles
+        remover_fundo_em_tiles(origem, destino, modo=modo, limiar=limiar, tamanho_tile=tamanho_tile)
+        return
+
+    # Uma única cópia RGBA da imagem; o alpha é escrito direto nela
+    rgba = np.array(Image.open(origem).convert("RGBA"))
+    remover_fundo(rgba, modo, limiar)
+    Image.fromarray(rgba, "RGBA").save(destino)
+
+
+def hash_conteudo(caminho, parametros=None):
+    """SHA-256 do conteúdo do arquivo combinado com os parâmetros (JSON ordenado)."""
+    digest = hashlib.sha256(json.dumps(parametros or {}, sort_keys=True).encode())
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def pasta_cache_padrao():
+    """Pasta do cache de derivados: $GERADOR_CACHE_DIR ou ~/.cache/gerador_image_from_html."""
+    return Path(os.environ.get("GERADOR_CACHE_DIR", Path.home() / ".cache" / "gerador_image_from_html"))
+
+
+def tamanho_maximo_cache_mb():
+    """Tamanho máximo do cache em MB: $GERADOR_CACHE_MAX_MB ou TAMANHO_MAXIMO_CACHE_MB."""
+    return float(os.environ.get("GERADOR_CACHE_MAX_MB", TAMANHO_MAXIMO_CACHE_MB))
+
+
+def marcar_uso(caminho):
+    """Atualiza o mtime de um arquivo do cache, que limpar_cache usa como último uso."""
+    try:
+        os.utime(caminho, None)
+    except OSError:
+        pass  # removido por outra limpeza nesse meio-tempo
+
+
+def _arquivos_cache(pasta):
+    """[(mtime, tamanho, caminho)] dos arquivos das subpastas do cache e o total em bytes."""
+    arquivos = []
+    total = 0
+    for arquivo in Path(pasta).glob("*/**/*"):
+        try:
+            info = arquivo.stat()
+        except OSError:
+            continue
+        if arquivo.is_file():
+            arquivos.append((info.st_mtime, info.st_size, arquivo))
+            total += info.st_size
+    return arquivos, total
+
+
+def _remover_antigos(arquivos, total, limite, protegidos=()):
+    """Remove de `arquivos` os usados há mais tempo até total <= limite. Retorna (removidos, liberados, total)."""
+    protegidos = {Path(caminho) for caminho in protegidos}
+    removidos = liberados = 0
+    for _mtime, tamanho, arquivo in sorted(arquivos):
+        if total <= limite:
+            break
+        if arquivo in protegidos:
+            continue
+        try:
+            arquivo.unlink()
+        except FileNotFoundError:
+            pass  # outra limpeza chegou antes
+        total -= tamanho
+        removidos += 1
+        liberados += tamanho
+    return removidos, liberados, total
+
+
+def limpar_cache(pasta=None, tamanho_maximo_mb=None, protegidos=()):
+    """
+    Remove os arquivos usados há mais tempo (mtime, ver marcar_uso) até o cache caber em
+    tamanho_maximo_mb (padrão: tamanho_maximo_cache_mb(); 0 esvazia), sem tocar nos
+    `protegidos`. Só entram arquivos das subpastas: os da raiz (ex.: autoajuste.json)
+    ficam. Retorna (arquivos removidos, bytes liberados).
+    """
+    pasta = Path(pasta) if pasta else pasta_cache_padrao()
+    if tamanho_maximo_mb is None:
+        tamanho_maximo_mb = tamanho_maximo_cache_mb()
+    arquivos, total = _arquivos_cache(pasta)
+    removidos, liberados, _total = _remover_antigos(arquivos, total, tamanho_maximo_mb * 2 ** 20, protegidos)
+    return removidos, liberados
+
+
+# Bytes conhecidos de cada pasta de cache neste processo (ver registrar_no_cache)
+_TAMANHO_CACHE = {}
+_TRAVA_TAMANHO_CACHE = threading.Lock()
+
+
+def registrar_no_cache(novo, pasta=None):
+    """
+    Soma o arquivo recém-gravado `novo` ao tamanho do cache e, acima do máximo, remove os
+    usados há mais tempo até FRACAO_APOS_LIMPEZA do máximo (nunca o próprio `novo`). A
+    pasta só é varrida na primeira gravação do processo e quando passa do máximo.
+    """
+    pasta = Path(pasta) if pasta else pasta_cache_padrao()
+    limite = tamanho_maximo_cache_mb() * 2 ** 20
+    with _TRAVA_TAMANHO_CACHE:
+        total = _TAMANHO_CACHE.get(pasta)
+        if total is None:
+            total = _arquivos_cache(pasta)[1]
+        else:
+            try:
+                total += Path(novo).stat().st_size
+            except OSError:
+                pass
+        if total > limite:
+            arquivos, total = _arquivos_cache(pasta)
+            _removidos, _liberados, total = _remover_antigos(arquivos, total, limite * FRACAO_APOS_LIMPEZA, [novo])
+        _TAMANHO_CACHE[pasta] = total
+
+
+class CacheDerivados:
+    """
+    Cache de arquivos derivados (logos transparentes, variantes redimensionadas, ...)
+    indexado pelo hash do conteúdo da origem e dos parâmetros da transformação. Cada
+    acerto marca o uso do arquivo; cada gravação nova aplica o tamanho máximo (registrar_no_cache).
+    """
+
+    def __init__(self, pasta=None):
+        self.pasta = Path(pasta) if pasta else pasta_cache_padrao()
+
+    def caminho(self, origem, parametros, extensao=".png"):
+        """Caminho no cache do derivado de origem com os parâmetros dados."""
+        chave = hash_conteudo(origem, parametros)
+        return self.pasta / chave[:2] / f"{chave}{extensao}"
+
+    def obter(self, origem, parametros, gerar, extensao=".png"):
+        """
+        Retorna o caminho do derivado, chamando gerar(origem, destino_temporario)
+        apenas quando ele ainda não está no cache. A gravação é atômica (rename).
+        """
+        destino = self.caminho(origem, parametros, extensao)
+        if destino.exists():
+            marcar_uso(destino)
+            return destino
+
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(suffix=extensao, dir=destino.parent)
+        os.close(fd)
+        try:
+            gerar(origem, temporario)
+            os.replace(temporario, destino)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        marcar_uso(destino)
+        registrar_no_cache(destino, self.pasta)
+        return destino
+
+
+def remover_fundo_em_cache(origem, modo="global", limiar=LIMIAR_PADRAO, cache=None, tamanho_tile=None):
+    """Remove o fundo de origem reaproveitando o cache de derivados; retorna o caminho do PNG."""
+    cache = cache or CacheDerivados()
+    parametros = {"op": "remover_fundo", "modo": modo, "limiar": limiar, "versao": VERSAO_KERNELS}
+    return cache.obter(
+        origem,
+        parametros,
+        lambda src, dst: remover_fundo_arquivo(src, dst, modo=modo, limiar=limiar, tamanho_tile=tamanho_tile),
+    )
+
+
+def copiar_se_diferente(origem, destino):
+    """Copia origem para destino apenas se o conteúdo mudou (preserva o mtime quando igual)."""
+    destino = Path(destino)
+    if destino.exists() and destino.stat().st_size == Path(origem).stat().st_size:
+        if hash_conteudo(destino) == hash_conteudo(origem):
+            return False
+    shutil.copyfile(origem, destino)
+    return True
+
+
+def _paleta_dominante(caminho, n_cores):
+    """Cores dominantes (hex, da mais frequente para a menos) ignorando fundo, cinzas e transparência."""
+    import numpy as np
+
+    from PIL import Image
+
+    with Image.open(caminho) as img:
+        if img.format == 'JPEG':
+            img.draft('RGB', (LADO_PALETA * 2, LADO_PALETA * 2))
+        miniatura = img.convert('RGBA')
+    miniatura.thumbnail((LADO_PALETA, LADO_PALETA))
+    pixels = np.asarray(miniatura).reshape(-1, 4).astype(np.int32)
+
+    maximo = pixels[:, :3].max(axis=1)
+    minimo = pixels[:, :3].min(axis=1)
+    # Fora: transparentes, quase brancos, quase pretos e tons de cinza (saturação baixa)
+    uteis = (pixels[:, 3] >= 128) & (minimo < 235) & (maximo >= 40) & (maximo - minimo >= 40)
+    rgb = pixels[uteis, :3]
+    if rgb.size == 0:
+        return []
+
+    # Histograma quantizado em 4 bits por canal, com a soma real das cores de cada caixa
+    caixas = (rgb[:, 0] >> 4) << 8 | (rgb[:, 1] >> 4) << 4 | (rgb[:, 2] >> 4)
+    contagem = np.bincount(caixas, minlength=4096)
+    somas = np.stack([np.bincount(caixas, weights=rgb[:, c], minlength=4096) for c in range(3)], axis=1)
+
+    # Agrupamento guloso das caixas, da mais populosa para a menos
+    clusters = []  # [peso, soma_rgb]
+    for caixa in np.argsort(contagem)[::-1]:
+        peso = contagem[caixa]
+        if peso == 0:
+            break
+        cor = somas[caixa] / peso
+        for cluster in clusters:
+            if np.linalg.norm(cluster[1] / cluster[0] - cor) < DISTANCIA_CLUSTER:
+                cluster[0] += peso
+                cluster[1] += somas[caixa]
+                break
+        else:
+            clusters.append([peso, somas[caixa].copy()])
+
+    clusters.sort(key=lambda cluster: cluster[0], reverse=True)
+    cores = []
+    for peso, soma in clusters[:n_cores]:
+        r, g, b = np.rint(soma / peso).astype(int)
+        cores.append(f"#{r:02X}{g:02X}{b:02X}")
+    return cores
+
+
+def extrair_paleta(caminho, n_cores=2, cache=None):
+    """
+    Extrai as cores dominantes da marca a partir da logo (lista de hex).
+
+    O resultado fica no cache de derivados pelo hash do conteúdo da logo, então
+    cada marca só é analisada uma vez.
+    """
+    cache = cache or CacheDerivados()
+    parametros = {"op": "paleta", "n_cores": n_cores, "lado": LADO_PALETA,
+                  "distancia": DISTANCIA_CLUSTER, "versao": VERSAO_KERNELS}
+
+    def gerar(origem, destino):
+        with open(destino, 'w', encoding='utf-8') as arquivo:
+            json.dump(_paleta_dominante(origem, n_cores), arquivo)
+
+    with open(cache.obter(caminho, parametros, gerar, extensao=".json"), 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
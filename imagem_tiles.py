@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Remoção de fundo branco em tiles para imagens muito grandes.
+
+A imagem é lida de um buffer RGB bruto mapeado em memória (np.memmap) e processada
+em tiles de tamanho fixo. O PNG RGBA de saída é gravado em faixas, sem nunca montar
+a imagem inteira em memória.
+
+Os modos e kernels são os de imagem_ops. No modo "border-connected" as regiões de
+cada tile são unidas às dos tiles vizinhos em uma passada de "costura" (seam merge)
+antes da escrita do alpha; o modo "global" é feito em uma única passada.
+
+Entradas PPM binárias (P6, 8 bits), como as geradas pelo pdftoppm, são mapeadas direto
+do arquivo, sem decodificação: só elas têm memória limitada para qualquer tamanho.
+Outros formatos são decodificados inteiros pelo Pillow para o buffer bruto em disco
+(o Pillow não decodifica PNG/JPEG em partes) e por isso são recusados acima de
+LIMITE_PIXELS_DECODIFICACAO; converta-os antes para PPM (pngtopnm, djpeg -pnm, pdftoppm).
+"""
+
+import os
+import struct
+import tempfile
+import warnings
+import zlib
+
+import numpy as np
+
+from imagem_ops import (
+    LIMIAR_PADRAO,
+    MODOS,
+    aplicar_limiar_branco,
+    mascara_quase_branco,
+    propagar_rotulos,
+    rotular_componentes,
+)
+
+TAMANHO_TILE = 1024
+
+# Maior imagem não PPM decodificada de uma vez pelo Pillow (~240 MB em RGB); abaixo do
+# limite de "decompression bomb" do Pillow, que continua valendo
+LIMITE_PIXELS_DECODIFICACAO = 80_000_000
+
+
+def _ler_cabecalho_ppm(caminho):
+    """Retorna (largura, altura, offset_dos_dados) de um PPM P6 de 8 bits, ou None."""
+    with open(caminho, 'rb') as arquivo:
+        dados = arquivo.read(512)
+    if not dados.startswith(b'P6'):
+        return None
+
+    campos = []
+    pos = 2
+    while len(campos) < 3:
+        while pos < len(dados) and dados[pos:pos + 1].isspace():
+            pos += 1
+        if dados[pos:pos + 1] == b'#':
+            pos = dados.index(b'\n', pos) + 1
+            continue
+        inicio = pos
+        while pos < len(dados) and not dados[pos:pos + 1].isspace():
+            pos += 1
+        campos.append(int(dados[inicio:pos]))
+    largura, altura, maximo = campos
+    if maximo != 255:
+        return None
+    # Um único espaço em branco separa o cabeçalho dos dados
+    return largura, altura, pos + 1
+
+
+def abrir_raster(origem, pasta_temp):
+    """
+    Retorna a imagem como array (altura, largura, 3) uint8 mapeado em disco.
+    PPM P6 é mapeado no próprio arquivo; os demais formatos são decodificados para um .rgb
+    temporário e geram ValueError acima de LIMITE_PIXELS_DECODIFICACAO.
+    """
+    cabecalho = _ler_cabecalho_ppm(origem)
+    if cabecalho is not None:
+        largura, altura, offset = cabecalho
+        return np.memmap(origem, dtype=np.uint8, mode='r', offset=offset, shape=(altura, largura, 3))
+
+    from PIL import Image
+
+    grande = (f"{origem}: acima de {LIMITE_PIXELS_DECODIFICACAO // 1_000_000} MP, só PPM (P6) é processado "
+              "com memória limitada; converta antes (ex.: pngtopnm, djpeg -pnm, pdftoppm)")
+    try:
+        with warnings.catch_warnings():
+            # Acima do aviso do Pillow a imagem é recusada logo abaixo, sem decodificar
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            img = Image.open(origem)
+        with img:
+            if img.width * img.height > LIMITE_PIXELS_DECODIFICACAO:
+                raise ValueError(grande)
+            rgb = img.convert("RGB")
+    except Image.DecompressionBombError:
+        raise ValueError(grande) from None
+    largura, altura = rgb.size
+    buffer = np.memmap(os.path.join(pasta_temp, "origem.rgb"), dtype=np.uint8, mode='w+',
+                       shape=(altura, largura, 3))
+    for y0 in range(0, altura, TAMANHO_TILE):
+        y1 = min(altura, y0 + TAMANHO_TILE)
+        buffer[y0:y1] = np.asarray(rgb.crop((0, y0, largura, y1)))
+    del rgb
+    buffer.flush()
+    return buffer
+
+
+def _chunk_png(arquivo, tipo, dados):
+    arquivo.write(struct.pack('>I', len(dados)))
+    arquivo.write(tipo)
+    arquivo.write(dados)
+    arquivo.write(struct.pack('>I', zlib.crc32(tipo + dados) & 0xFFFFFFFF))
+
+
+class EscritorPNG:
+    """Grava um PNG RGBA 8 bits faixa a faixa (filtro Sub em todas as linhas)."""
+
+    def __init__(self, destino, largura, altura):
+        self.largura = largura
+        self.arquivo = open(destino, 'wb')
+        self.compressor = zlib.compressobj(6)
+        self.arquivo.write(b'\x89PNG\r\n\x1a\n')
+        _chunk_png(self.arquivo, b'IHDR', struct.pack('>IIBBBBB', largura, altura, 8, 6, 0, 0, 0))
+
+    def escrever(self, faixa):
+        """Acrescenta linhas (n, largura, 4) uint8 à imagem."""
+        n = faixa.shape[0]
+        linhas = np.empty((n, self.largura * 4 + 1), dtype=np.uint8)
+        linhas[:, 0] = 1  # filtro Sub
+        plano = faixa.reshape(n, -1)
+        linhas[:, 1:5] = plano[:, :4]
+        np.subtract(plano[:, 4:], plano[:, :-4], out=linhas[:, 5:])
+        dados = self.compressor.compress(linhas.tobytes())
+        if dados:
+            _chunk_png(self.arquivo, b'IDAT', dados)
+
+    def fechar(self):
+        _chunk_png(self.arquivo, b'IDAT', self.compressor.flush())
+        _chunk_png(self.arquivo, b'IEND', b'')
+        self.arquivo.close()
+
+
+def _tiles(altura, largura, tamanho):
+    for y0 in range(0, altura, tamanho):
+        faixa = []
+        for x0 in range(0, largura, tamanho):
+            faixa.append((y0, min(altura, y0 + tamanho), x0, min(largura, x0 + tamanho)))
+        yield faixa
+
+
+def _rotulos_globais(raster, y0, y1, x0, x1, offset):
+    """Máscara e rótulos globais (-1 fora da máscara) de um tile."""
+    mask = mascara_quase_branco(raster[y0:y1, x0:x1])
+    locais, n = rotular_componentes(mask)
+    globais = np.where(mask, locais.astype(np.int64) + offset, -1)
+    return mask, globais, n
+
+
+def _componentes_de_fundo(raster, tamanho):
+    """
+    Primeira passada do modo "border-connected": rotula cada tile, costura as regiões nas
+    divisas entre tiles e retorna (offsets por tile, tabela rótulo global -> é fundo).
+    """
+    altura, largura = raster.shape[:2]
+    offsets = {}
+    total = 0
+    arestas = []
+    inferior = np.full(largura, -1, dtype=np.int64)  # última linha da faixa de cima
+    cantos = []
+
+    for faixa in _tiles(altura, largura, tamanho):
+        direita = None  # última coluna do tile à esquerda
+        for y0, y1, x0, x1 in faixa:
+            offsets[(y0, x0)] = total
+            _mask, globais, n = _rotulos_globais(raster, y0, y1, x0, x1, total)
+            total += n
+
+            if direita is not None:
+                ligados = (direita >= 0) & (globais[:, 0] >= 0)
+                arestas.append((direita[ligados], globais[:, 0][ligados]))
+            acima = inferior[x0:x1]
+            ligados = (acima >= 0) & (globais[0] >= 0)
+            arestas.append((acima[ligados], globais[0][ligados]))
+
+            direita = globais[:, -1].copy()
+            inferior[x0:x1] = globais[-1]
+
+            for cy, cx in ((0, 0), (0, largura - 1), (altura - 1, 0), (altura - 1, largura - 1)):
+                if y0 <= cy < y1 and x0 <= cx < x1 and globais[cy - y0, cx - x0] >= 0:
+                    cantos.append(globais[cy - y0, cx - x0])
+
+    if total == 0:
+        return offsets, np.zeros(0, dtype=bool)
+
+    a = np.concatenate([par[0] for par in arestas]) if arestas else np.zeros(0, dtype=np.int64)
+    b = np.concatenate([par[1] for par in arestas]) if arestas else np.zeros(0, dtype=np.int64)
+    raizes = propagar_rotulos(total, a, b)
+
+    fundo = np.zeros(total, dtype=bool)
+    if cantos:
+        fundo[np.unique(raizes[np.array(cantos)])] = True
+    return offsets, fundo[raizes]
+
+
+def remover_fundo_em_tiles(origem, destino, modo="global", limiar=LIMIAR_PADRAO, tamanho_tile=TAMANHO_TILE):
+    """
+    Remove o fundo branco de uma imagem grande processando-a em tiles.
+
+    Args:
+        origem: caminho da imagem (PPM P6 é mapeado sem decodificar).
+        destino: caminho do PNG RGBA de saída.
+        modo: "global" (distância ao branco) ou "border-connected" (quase branco conectado aos cantos).
+        limiar: limiar de distância ao branco do modo "global" (0-255).
+        tamanho_tile: lado do tile em pixels; limita a memória usada por tile.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo} (use {', '.join(MODOS)})")
+
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        raster = abrir_raster(origem, pasta_temp)
+        altura, largura = raster.shape[:2]
+
+        if modo == "border-connected":
+            offsets, fundo = _componentes_de_fundo(raster, tamanho_tile)
+
+        # O PNG vai para um temporário ao lado de destino e só substitui destino se tudo der certo
+        fd, temporario = tempfile.mkstemp(suffix=".png", dir=os.path.dirname(os.path.abspath(destino)))
+        os.close(fd)
+        escritor = EscritorPNG(temporario, largura, altura)
+        try:
+            for faixa in _tiles(altura, largura, tamanho_tile):
+                y0, y1 = faixa[0][0], faixa[0][1]
+                saida = np.empty((y1 - y0, largura, 4), dtype=np.uint8)
+                for _y0, _y1, x0, x1 in faixa:
+                    rgb = raster[y0:y1, x0:x1]
+                    saida[:, x0:x1, :3] = rgb
+                    if modo == "global":
+                        aplicar_limiar_branco(saida[:, x0:x1], limiar)
+                    else:
+                        mask, globais, _n = _rotulos_globais(raster, y0, y1, x0, x1, offsets[(y0, x0)])
+                        alpha = np.full(mask.shape, 255, dtype=np.uint8)
+                        alpha[mask] = np.where(fundo[globais[mask]], 0, 255)
+                        saida[:, x0:x1, 3] = alpha
+                escritor.escrever(saida)
+            escritor.fechar()
+            os.replace(temporario, destino)
+        finally:
+            escritor.arquivo.close()
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        del raster
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Pré-otimização das imagens referenciadas pelos HTMLs gerados.
+
+Lê as tags <img> e as regras CSS que as limitam (width, max-width, height, max-height
+em px, no <style> do documento ou nos atributos da tag), gera variantes já no tamanho
+de exibição (recomprimidas) no cache de derivados e reescreve as referências.
+Assim o Chromium não precisa decodificar e reduzir o bitmap original a cada render.
+"""
+
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from imagem_ops import CacheDerivados
+
+RE_ESTILO = re.compile(r'<style[^>]*>(.*?)</style>', re.IGNORECASE | re.DOTALL)
+RE_REGRA = re.compile(r'([^{}]+)\{([^{}]*)\}')
+RE_DECLARACAO = re.compile(r'(max-width|max-height|width|height)\s*:\s*([\d.]+)px', re.IGNORECASE)
+RE_TAG_IMG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+RE_SRC = re.compile(r'(\bsrc\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+
+ELEMENTOS_VAZIOS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+def _seletor_simples(parte):
+    """Separa 'div.a.b' em ('div', {'a', 'b'}); tag vazia significa qualquer elemento."""
+    tag, *classes = parte.split('.')
+    return tag.lower(), set(classes)
+
+
+def _casa(parte, tag, classes):
+    tag_seletor, classes_seletor = _seletor_simples(parte)
+    return (not tag_seletor or tag_seletor == tag) and classes_seletor <= classes
+
+
+def extrair_regras_img(conteudo):
+    """
+    Retorna [(partes_do_seletor, {propriedade: px})] das regras CSS que terminam em img.
+    Só seletores simples (tag, classes e descendência) são considerados.
+    """
+    regras = []
+    for estilo in RE_ESTILO.findall(conteudo):
+        for seletores, corpo in RE_REGRA.findall(estilo):
+            declaracoes = {prop.lower(): float(valor) for prop, valor in RE_DECLARACAO.findall(corpo)}
+            if not declaracoes:
+                continue
+            for seletor in seletores.split(','):
+                partes = seletor.replace('>', ' ').split()
+                if partes and _seletor_simples(partes[-1])[0] == 'img':
+                    regras.append((partes, declaracoes))
+    return regras
+
+
+class _ColetorImg(HTMLParser):
+    """Coleta, na ordem do documento, cada <img> com seus atributos e ancestrais."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pilha = []
+        self.imagens = []
+
+    def handle_starttag(self, tag, attrs):
+        atributos = dict(attrs)
+        classes = set((atributos.get('class') or '').split())
+        if tag == 'img':
+            self.imagens.append((atributos, classes, list(self.pilha)))
+        elif tag not in ELEMENTOS_VAZIOS:
+            self.pilha.append((tag, classes))
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.pilha) - 1, -1, -1):
+            if self.pilha[i][0] == tag:
+                del self.pilha[i:]
+                break
+
+
+def _limites_exibicao(atributos, classes, ancestrais, regras):
+    """
+    (largura_max, altura_max) em px de uma <img>, ou None quando não há limite.
+
+    Em cada eixo, o tamanho (width/height) e o teto (max-width/max-height) valem juntos:
+    o limite é o menor dos dois. Entre regras diferentes da mesma propriedade (cascata,
+    @media) vale a maior, que é a mais conservadora. Só valores em px são lidos; %, em,
+    vw e afins são ignorados.
+    """
+    tamanhos = {}
+    tetos = {}
+
+    def aplicar(propriedade, valor):
+        eixo = 'largura' if 'width' in propriedade else 'altura'
+        destino = tetos if propriedade.startswith('max-') else tamanhos
+        destino.setdefault(eixo, []).append(valor)
+
+    for partes, declaracoes in regras:
+        if not _casa(partes[-1], 'img', classes):
+            continue
+        if all(any(_casa(parte, tag, cls) for tag, cls in ancestrais) for parte in partes[:-1]):
+            for propriedade, valor in declaracoes.items():
+                aplicar(propriedade, valor)
+
+    # O atributo width/height entra como mais um tamanho: se o CSS define outro, ele prevalece
+    for atributo in ('width', 'height'):
+        valor = re.sub(r'px$', '', (atributos.get(atributo) or '').strip())
+        if valor.replace('.', '', 1).isdigit():
+            aplicar(atributo, float(valor))
+
+    def limite(eixo):
+        candidatos = [max(grupo[eixo]) for grupo in (tamanhos, tetos) if eixo in grupo]
+        return min(candidatos) if candidatos else None
+
+    return limite('largura'), limite('altura')
+
+
+def _gerar_variante(largura, altura):
+    def gerar(origem, destino):
+        from PIL import Image
+
+        with Image.open(origem) as img:
+            formato = img.format
+            variante = img.resize((largura, altura), Image.LANCZOS)
+        if formato == 'JPEG':
+            variante.convert('RGB').save(destino, 'JPEG', quality=90, optimize=True, progressive=True)
+        else:
+            variante.save(destino, 'PNG', optimize=True)
+    return gerar
+
+
+def otimizar_imagens_html(conteudo, base_dir, escala=1.0, cache=None):
+    """
+    Reescreve as <img> locais do HTML para variantes no tamanho de exibição.
+
+    Args:
+        conteudo: HTML gerado.
+        base_dir: pasta do HTML original (resolve os src relativos).
+        escala: device_scale_factor do render; a variante tem tamanho de exibição x escala.
+        cache: CacheDerivados onde as variantes são guardadas.
+
+    Returns:
+        O HTML com os src trocados por file:// das variantes (os demais ficam iguais).
+    """
+    from PIL import Image
+
+    cache = cache or CacheDerivados()
+    regras = extrair_regras_img(conteudo)
+    coletor = _ColetorImg()
+    coletor.feed(conteudo)
+
+    novos_src = []
+    for atributos, classes, ancestrais in coletor.imagens:
+        novos_src.append(None)
+        src = atributos.get('src') or ''
+        if not src or re.match(r'^[a-z][a-z0-9+.-]*:', src, re.IGNORECASE):
+            continue  # remoto, data: ou já absoluto
+        origem = Path(base_dir) / src
+        if not origem.is_file():
+            continue
+
+        largura_max, altura_max = _limites_exibicao(atributos, classes, ancestrais, regras)
+        if largura_max is None and altura_max is None:
+            continue
+
+        with Image.open(origem) as img:
+            largura, altura = img.size
+        fatores = [1.0]
+        if largura_max is not None:
+            fatores.append(largura_max * escala / largura)
+        if altura_max is not None:
+            fatores.append(altura_max * escala / altura)
+        fator = min(fatores)
+        if fator >= 1.0:
+            continue  # já está no tamanho de exibição (nunca amplia)
+
+        nova_largura = max(1, round(largura * fator))
+        nova_altura = max(1, round(altura * fator))
+        parametros = {"op": "redimensionar", "largura": nova_largura, "altura": nova_altura}
+        variante = cache.obter(origem, parametros, _gerar_variante(nova_largura, nova_altura),
+                               extensao=origem.suffix.lower() or '.png')
+        novos_src[-1] = variante.resolve().as_uri()
+
+    indices = iter(range(len(novos_src)))
+
+    def trocar(tag):
+        indice = next(indices, None)
+        if indice is None or novos_src[indice] is None:
+            return tag.group(0)
+        return RE_SRC.sub(lambda m: f"{m.group(1)}{m.group(2)}{novos_src[indice]}{m.group(2)}", tag.group(0), count=1)
+
+    return RE_TAG_IMG.sub(trocar, conteudo)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pool de navegadores remotos (Chromium com --remote-debugging-port) acessados por CDP.
+
+Os hosts de navegador fazem o layout e a rasterização; o Python só orquestra:
+
+- Antes do lote, cada endpoint é verificado em /json/version (saúde).
+- Cada página vai para o endpoint saudável com menos páginas abertas no momento,
+  respeitando o limite de páginas simultâneas por endpoint.
+- Um endpoint que falha durante o render é verificado de novo e sai do pool se não
+  responder; o trabalho é refeito em outro.
+- Sem nenhum endpoint saudável, quem chama volta para o Chromium local.
+
+Como o navegador remoto não enxerga o disco local, as páginas são abertas em uma origem
+virtual (ORIGEM_VIRTUAL) cujas requisições são atendidas pelo Python (page.route),
+lendo os arquivos locais. Exemplo com instâncias locais para teste:
+
+    chromium --headless=new --remote-debugging-port=9222 &
+    chromium --headless=new --remote-debugging-port=9223 &
+    python gerar_posts.py --cdp http://localhost:9222 --cdp http://localhost:9223
+"""
+
+import json
+import mimetypes
+import os
+import threading
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+ORIGEM_VIRTUAL = "http://arquivos.local"
+PAGINAS_POR_ENDPOINT = 2
+TIMEOUT_SAUDE = 2
+
+# Tipos reescritos ao servir: referências file:// (ex.: <base> e variantes do cache) viram a origem virtual
+TIPOS_TEXTO = ("text/html", "text/css")
+
+
+def url_versao(endpoint):
+    """http(s)://host:porta/json/version de um endpoint ws://, wss://, http:// ou https://."""
+    partes = urllib.parse.urlsplit(endpoint)
+    esquema = "https" if partes.scheme in ("https", "wss") else "http"
+    return f"{esquema}://{partes.netloc}/json/version"
+
+
+def verificar_endpoint(endpoint, timeout=TIMEOUT_SAUDE):
+    """Retorna a versão do navegador ("Chrome/...") se o endpoint responde, senão None."""
+    try:
+        with urllib.request.urlopen(url_versao(endpoint), timeout=timeout) as resposta:
+            return json.load(resposta).get("Browser") or "?"
+    except (OSError, ValueError):
+        return None
+
+
+def url_virtual(caminho):
+    """URL da origem virtual para um arquivo local."""
+    return ORIGEM_VIRTUAL + Path(os.path.abspath(caminho)).as_uri()[len("file://"):]
+
+
+def caminho_local(url):
+    """Caminho local de uma URL da origem virtual (inverso de url_virtual)."""
+    return urllib.request.url2pathname(urllib.parse.urlsplit(url).path)
+
+
+def servir_arquivos_locais(page):
+    """Atende pelo Python as requisições da página à origem virtual, lendo os arquivos locais."""
+    def responder(route):
+        caminho = caminho_local(route.request.url)
+        if not os.path.isfile(caminho):
+            route.fulfill(status=404, body="")
+            return
+        tipo = mimetypes.guess_type(caminho)[0] or "application/octet-stream"
+        corpo = Path(caminho).read_bytes()
+        if tipo in TIPOS_TEXTO:
+            corpo = corpo.decode("utf-8").replace("file://", ORIGEM_VIRTUAL).encode("utf-8")
+        route.fulfill(status=200, body=corpo, content_type=tipo)
+
+    page.route(f"{ORIGEM_VIRTUAL}/**", responder)
+
+
+class PoolNavegadores:
+    """
+    Controla a carga (páginas abertas) e a saúde de cada endpoint; é compartilhado entre
+    as threads de render. As conexões em si são de cada thread (a API síncrona do
+    Playwright não pode ser usada entre threads).
+    """
+
+    def __init__(self, endpoints, paginas_por_endpoint=PAGINAS_POR_ENDPOINT):
+        self.endpoints = list(dict.fromkeys(endpoints))
+        self.paginas_por_endpoint = paginas_por_endpoint
+        self.carga = {endpoint: 0 for endpoint in self.endpoints}
+        self.saudaveis = set()
+        self._condicao = threading.Condition()
+
+    def verificar(self):
+        """Verifica todos os endpoints e retorna os saudáveis, na ordem informada."""
+        for endpoint in self.endpoints:
+            versao = verificar_endpoint(endpoint)
+            if versao:
+                print(f"🌐 {endpoint}: {versao}")
+                self.saudaveis.add(endpoint)
+            else:
+                print(f"⚠️  {endpoint}: sem resposta, fora do pool")
+                self.saudaveis.discard(endpoint)
+        return [endpoint for endpoint in self.endpoints if endpoint in self.saudaveis]
+
+    @property
+    def vagas(self):
+        return len(self.saudaveis) * self.paginas_por_endpoint
+
+    def escolher(self):
+        """
+        Reserva uma página no endpoint saudável menos carregado (espera se todos estão no
+        limite). Retorna None quando não sobrou nenhum endpoint saudável.
+        """
+        with self._condicao:
+            while True:
+                livres = [e for e in self.endpoints
+                          if e in self.saudaveis and self.carga[e] < self.paginas_por_endpoint]
+                if livres:
+                    endpoint = min(livres, key=lambda e: self.carga[e])
+                    self.carga[endpoint] += 1
+                    return endpoint
+                if not self.saudaveis:
+                    return None
+                self._condicao.wait()
+
+    def liberar(self, endpoint, falhou=False):
+        """Devolve a página reservada; após uma falha, o endpoint só fica se ainda responder."""
+        saudavel = not falhou or verificar_endpoint(endpoint) is not None
+        with self._condicao:
+            self.carga[endpoint] -= 1
+            if not saudavel and endpoint in self.saudaveis:
+                print(f"⚠️  {endpoint}: parou de responder, fora do pool")
+                self.saudaveis.discard(endpoint)
+            self._condicao.notify_all()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Rasterização direta, sem navegador, dos layouts simples (caixas, texto e arcos).
+
+O calendário RAJJ e os cards do mapa de disciplinas são só retângulos arredondados,
+texto e um relógio em arcos; para eles cada gerador desenha o mesmo layout com o
+Pillow e grava o PNG em dezenas de milissegundos. HTML arbitrário continua indo
+pelo Chromium (gerar_posts.py).
+
+As coordenadas são sempre em px CSS; a Tela multiplica tudo pela escala (o
+equivalente ao device_scale_factor). Fontes são procuradas localmente
+($GERADOR_FONTES_DIR, pasta fontes/ do repositório e pastas do sistema); sem o
+arquivo da família, cai na DejaVu e, por último, na fonte embutida do Pillow.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# Sufixo dos arquivos estáticos de cada peso (convenção do Google Fonts)
+NOMES_PESO = {
+    300: "Light",
+    400: "Regular",
+    500: "Medium",
+    600: "SemiBold",
+    700: "Bold",
+    800: "ExtraBold",
+}
+
+# line-height "normal" aproximado quando a fonte não informa métricas úteis
+ALTURA_LINHA_PADRAO = 1.2
+
+RE_RGBA = re.compile(r'rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*([\d.]+)\s*)?\)')
+
+
+def pastas_fontes():
+    """Pastas onde procurar arquivos TTF/OTF, da mais específica para a mais geral."""
+    pastas = []
+    if os.environ.get("GERADOR_FONTES_DIR"):
+        pastas.append(Path(os.environ["GERADOR_FONTES_DIR"]))
+    pastas.append(Path(__file__).resolve().parent / "fontes")
+    pastas += [
+        Path.home() / ".fonts",
+        Path.home() / ".local" / "share" / "fonts",
+        Path.home() / "Library" / "Fonts",
+        Path("/usr/share/fonts"),
+        Path("/usr/local/share/fonts"),
+        Path("/Library/Fonts"),
+        Path("C:/Windows/Fonts"),
+    ]
+    return [pasta for pasta in pastas if pasta.is_dir()]
+
+
+@lru_cache(maxsize=1)
+def _indice_fontes():
+    """Nome do arquivo (minúsculo) -> caminho; o primeiro encontrado vence."""
+    indice = {}
+    for pasta in pastas_fontes():
+        for raiz, _dirs, arquivos in os.walk(pasta):
+            for arquivo in arquivos:
+                if arquivo.lower().endswith(('.ttf', '.otf')):
+                    indice.setdefault(arquivo.lower(), os.path.join(raiz, arquivo))
+    return indice
+
+
+def nome_arquivo_fonte(familia, peso, italico=False):
+    """Nome do arquivo estático sem extensão, ex.: ("Roboto", 300, True) -> "Roboto-LightItalic"."""
+    estilo = NOMES_PESO[peso]
+    if italico:
+        estilo = "Italic" if estilo == "Regular" else f"{estilo}Italic"
+    return f"{familia.replace(' ', '')}-{estilo}"
+
+
+def caminho_fonte(familia, peso, italico=False, aproximar=True):
+    """
+    Arquivo local da família/peso: (caminho, variavel) ou None. Com aproximar, aceita o
+    peso estático mais próximo, preferindo o mais pesado (como o navegador); depois tenta
+    a fonte variável (ex.: "Montserrat[wght].ttf").
+    """
+    indice = _indice_fontes()
+    pesos = sorted(NOMES_PESO, key=lambda p: (abs(p - peso), p < peso)) if aproximar else [peso]
+    for candidato in pesos:
+        if candidato not in NOMES_PESO:
+            continue
+        for extensao in (".ttf", ".otf"):
+            nome = f"{nome_arquivo_fonte(familia, candidato, italico)}{extensao}".lower()
+            if nome in indice:
+                return indice[nome], False
+
+    prefixo = f"{familia.replace(' ', '').lower()}["
+    for nome, caminho in indice.items():
+        if nome.startswith(prefixo) and "wght" in nome and ("italic" in nome) == italico:
+            return caminho, True
+    return None
+
+
+@lru_cache(maxsize=None)
+def carregar_fonte(familia, peso, tamanho):
+    """FreeTypeFont da família/peso no tamanho em px, com fallback para DejaVu e para a embutida."""
+    from PIL import ImageFont
+
+    encontrada = caminho_fonte(familia, peso)
+    if encontrada:
+        caminho, variavel = encontrada
+        fonte = ImageFont.truetype(caminho, tamanho)
+        if variavel:
+            try:
+                fonte.set_variation_by_axes([peso])
+            except (OSError, AttributeError):
+                pass
+        return fonte
+
+    indice = _indice_fontes()
+    reserva = "dejavusans-bold.ttf" if peso >= 600 else "dejavusans.ttf"
+    if reserva in indice:
+        return ImageFont.truetype(indice[reserva], tamanho)
+    return ImageFont.load_default(tamanho)
+
+
+def cor_rgb(cor, fundo=(255, 255, 255)):
+    """Converte "#RRGGBB" ou "rgba(r, g, b, a)" em (r, g, b), compondo a transparência sobre o fundo."""
+    if cor.startswith("#"):
+        return tuple(int(cor[i:i + 2], 16) for i in (1, 3, 5))
+    m = RE_RGBA.fullmatch(cor.strip())
+    if not m:
+        raise ValueError(f"Cor não suportada: {cor}")
+    r, g, b = (int(v) for v in m.groups()[:3])
+    alpha = float(m.group(4)) if m.group(4) is not None else 1.0
+    return tuple(round(c * alpha + f * (1 - alpha)) for c, f in zip((r, g, b), fundo))
+
+
+def sem_emoji(texto):
+    """Remove pictogramas que as fontes de texto não têm (📚, ⏱️, ...)."""
+    return re.sub(r'[\U0001F000-\U0001FFFF\u2600-\u27BF\uFE0F]', '', texto).strip()
+
+
+class Tela:
+    """Imagem RGB desenhada em coordenadas CSS (px) multiplicadas pela escala."""
+
+    def __init__(self, largura, altura, fundo="#FFFFFF", escala=1.0):
+        from PIL import Image, ImageDraw
+
+        self.escala = escala
+        self.largura = largura
+        self.altura = altura
+        self.imagem = Image.new("RGB", (round(largura * escala), round(altura * escala)), cor_rgb(fundo))
+        self.draw = ImageDraw.Draw(self.imagem)
+
+    def _px(self, *valores):
+        return [round(v * self.escala) for v in valores]
+
+    def fonte(self, familia, peso, tamanho):
+        return carregar_fonte(familia, peso, round(tamanho * self.escala))
+
+    def caixa(self, x0, y0, x1, y1, raio=0, fundo=None, borda=None, largura_borda=1, cantos=None):
+        """Retângulo (arredondado) com preenchimento e/ou borda interna, como o box-sizing do CSS."""
+        self.draw.rounded_rectangle(
+            self._px(x0, y0, x1 - 1 / self.escala, y1 - 1 / self.escala),
+            radius=round(raio * self.escala),
+            fill=cor_rgb(fundo) if fundo else None,
+            outline=cor_rgb(borda) if borda else None,
+            width=max(1, round(largura_borda * self.escala)),
+            corners=cantos,
+        )
+
+    def gradiente(self, x0, y0, x1, y1, cor_inicio, cor_fim, horizontal=True, raio=0, cantos=None):
+        """Gradiente linear entre duas cores, recortado por um retângulo arredondado."""
+        from PIL import Image, ImageDraw
+
+        px0, py0, px1, py1 = self._px(x0, y0, x1, y1)
+        tamanho = (px1 - px0, py1 - py0)
+        rampa = Image.linear_gradient("L")
+        rampa = rampa.rotate(90, expand=True) if horizontal else rampa
+        rampa = rampa.resize(tamanho)
+        faixa = Image.composite(Image.new("RGB", tamanho, cor_rgb(cor_fim)),
+                                Image.new("RGB", tamanho, cor_rgb(cor_inicio)), rampa)
+        mascara = Image.new("L", tamanho, 0)
+        ImageDraw.Draw(mascara).rounded_rectangle((0, 0, tamanho[0] - 1, tamanho[1] - 1),
+                                                  radius=round(raio * self.escala), fill=255, corners=cantos)
+        self.imagem.paste(faixa, (px0, py0), mascara)
+
+    def circulo(self, cx, cy, raio, fundo):
+        self.draw.ellipse(self._px(cx - raio, cy - raio, cx + raio, cy + raio), fill=cor_rgb(fundo))
+
+    def arco(self, cx, cy, raio, espessura, inicio, fim, cor):
+        """Arco de traço centrado no raio (como stroke no SVG); ângulos em graus, 0 = 3h, sentido horário."""
+        externo = raio + espessura / 2
+        self.draw.arc(self._px(cx - externo, cy - externo, cx + externo, cy + externo),
+                      inicio, fim, fill=cor_rgb(cor), width=max(1, round(espessura * self.escala)))
+
+    def largura_texto(self, texto, fonte, espacamento=0):
+        """Largura em px CSS, incluindo o letter-spacing."""
+        largura = fonte.getlength(texto) + espacamento * self.escala * len(texto)
+        return largura / self.escala
+
+    def altura_linha(self, fonte, altura_linha=None):
+        """Altura da linha em px CSS: line-height explícito (fator) ou ascender + descender."""
+        if altura_linha is not None:
+            return fonte.size * altura_linha / self.escala
+        ascendente, descendente = fonte.getmetrics()
+        return max(ascendente + descendente, fonte.size * ALTURA_LINHA_PADRAO) / self.escala
+
+    def texto(self, x, y, texto, fonte, cor, espacamento=0, altura_linha=None, alinhamento="esquerda",
+              linha_base=False):
+        """
+        Escreve uma linha com o topo da caixa de linha em y e retorna a largura em px CSS.
+        alinhamento: "esquerda" (x é a borda esquerda), "centro" ou "direita".
+        linha_base: y é a linha de base do texto (como o <text> do SVG).
+        """
+        largura = self.largura_texto(texto, fonte, espacamento)
+        if alinhamento == "centro":
+            x -= largura / 2
+        elif alinhamento == "direita":
+            x -= largura
+
+        ascendente, descendente = fonte.getmetrics()
+        if linha_base:
+            folga, ancora = 0, "ls"
+        else:
+            folga, ancora = (self.altura_linha(fonte, altura_linha) * self.escala - (ascendente + descendente)) / 2, "la"
+        px, py = round(x * self.escala), round(y * self.escala + folga)
+        cor = cor_rgb(cor)
+        if not espacamento:
+            self.draw.text((px, py), texto, font=fonte, fill=cor, anchor=ancora)
+        else:
+            passo = espacamento * self.escala
+            for caractere in texto:
+                self.draw.text((px, py), caractere, font=fonte, fill=cor, anchor=ancora)
+                px += fonte.getlength(caractere) + passo
+        return largura
+
+    def quebrar(self, texto, fonte, largura_maxima, espacamento=0):
+        """Quebra o texto em linhas que cabem na largura (px CSS), palavra a palavra."""
+        linhas, atual = [], ""
+        for palavra in texto.split():
+            candidata = f"{atual} {palavra}".strip()
+            if atual and self.largura_texto(candidata, fonte, espacamento) > largura_maxima:
+                linhas.append(atual)
+                atual = palavra
+            else:
+                atual = candidata
+        if atual:
+            linhas.append(atual)
+        return linhas
+
+    def colar(self, caminho, x, y, largura, altura):
+        """Cola uma imagem (com alpha) contida na caixa, centralizada (object-fit: contain)."""
+        from PIL import Image
+
+        with Image.open(caminho) as img:
+            img = img.convert("RGBA")
+            px, py, pl, pa = self._px(x, y, largura, altura)
+            img.thumbnail((pl, pa), Image.LANCZOS)
+            self.imagem.paste(img, (px + (pl - img.width) // 2, py + (pa - img.height) // 2), img)
+
+    def salvar(self, destino):
+        Path(destino).parent.mkdir(parents=True, exist_ok=True)
+        self.imagem.save(destino, "PNG")
@@ -1,8 +1,21 @@
-from PIL import Image
+import argparse
+import glob
+import json
 import os
-import numpy as np
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def remove_background(input_path, output_path, color_threshold=40):
+# Shared modules (imagem_ops, imagem_tiles) live at the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _add_repo_root_to_path():
+    """Makes the shared modules importable when running as a script (and in pool workers)."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+def remove_background(input_path, output_path, color_threshold=40, verbose=True, tile_size=None):
     """
     Removes white background from an image while preserving content.
 
@@ -11,6 +24,9 @@ def remove_background(input_path, output_path, color_threshold=40):
         output_path (str): The path where the output image with 
                            transparent background will be saved.
         color_threshold (int): Threshold for white detection (0-255).
+        verbose (bool): Print a message when the output is saved.
+        tile_size (int): Process the image in memory-mapped tiles of this size.
+                         Large images (over 40 MP) use tiles automatically.
     """
     # Get the directory where the script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,29 +37,160 @@ def remove_background(input_path, output_path, color_threshold=40):
     if not os.path.isabs(output_path):
         output_path = os.path.join(script_dir, output_path)
 
-    # Open the input image
-    input_image = Image.open(input_path).convert('RGBA')
-    
-    # Convert to numpy array for processing
-    img_array = np.array(input_image)
-    
-    # Define white color (255, 255, 255)
-    white = np.array([255, 255, 255])
-    
-    # Calculate distance to white for each pixel
-    diff = np.sum((img_array[:, :, :3].astype(np.float32) - white) ** 2, axis=2) ** 0.5
-    
-    # Create mask: pixels close to white become transparent
-    mask = (diff < color_threshold).astype(np.uint8) * 255
-    
-    # Apply mask to alpha channel (inverted: white = transparent, rest = opaque)
-    img_array[:, :, 3] = 255 - mask
-    
-    # Convert back to PIL Image and save
-    output_image = Image.fromarray(img_array, 'RGBA')
-    output_image.save(output_path)
-    print(f"Background removed and saved to {output_path}")
-
-# Example usage:
-# Make sure you have an image named 'Logo.png' in the same directory
-remove_background('Logo.png', 'output.png')
+    from imagem_ops import remover_fundo_arquivo
+
+    # Global Euclidean threshold mode of the shared image-ops module
+    remover_fundo_arquivo(input_path, output_path, modo="global", limiar=color_threshold,
+                          tamanho_tile=tile_size)
+    if verbose:
+        print(f"Background removed and saved to {output_path}")
+
+# Name of the manifest kept in the output directory to skip up-to-date files
+CACHE_MANIFEST = ".remove_background_cache.json"
+
+def content_hash(path, color_threshold):
+    """
+    Returns a SHA-256 of the file contents combined with the processing parameters.
+    """
+    from imagem_ops import hash_conteudo
+
+    return hash_conteudo(path, {"threshold": color_threshold})
+
+def _process_file(job):
+    """Worker entry point: processes one (input, output, threshold) job and returns its timing."""
+    from imagem_ops import remover_fundo_em_cache
+
+    input_path, output_path, color_threshold, tile_size = job
+    started = time.perf_counter()
+    # The shared derived-asset cache lets later runs with the same threshold reuse this result
+    derived = remover_fundo_em_cache(input_path, modo="global", limiar=color_threshold, tamanho_tile=tile_size)
+    shutil.copyfile(derived, output_path)
+    return output_path, time.perf_counter() - started
+
+def batch_remove_background(input_dir, output_dir, pattern="*.png", color_threshold=40, jobs=None,
+                            tile_size=None):
+    """
+    Removes the white background of every file matching pattern in input_dir.
+
+    Files are processed across a process pool. Outputs whose input content and
+    threshold did not change since the last run (tracked by content hash in a
+    manifest inside output_dir) are skipped. A file that fails, or whose output
+    name clashes with another input (a.png and a.jpg both map to a.png), is
+    reported as failed without stopping the batch. output_dir must not be input_dir,
+    otherwise the outputs would overwrite the inputs and be picked up by later runs.
+
+    Args:
+        input_dir (str): Directory with the input images.
+        output_dir (str): Directory where the PNG outputs are written.
+        pattern (str): Glob pattern used to select input files.
+        color_threshold (int): Threshold for white detection (0-255).
+        jobs (int): Number of worker processes (default: number of CPUs).
+        tile_size (int): Tile size for memory-bounded processing (see remove_background).
+
+    Returns:
+        list[dict]: One entry per input file with its status ("processed", "skipped"
+                    or "failed", with an "error") and timing.
+
+    Raises:
+        ValueError: If output_dir is the same directory as input_dir.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if os.path.samefile(input_dir, output_dir):
+        raise ValueError(f"output directory {output_dir} is the input directory; choose another one")
+    manifest_path = os.path.join(output_dir, CACHE_MANIFEST)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        manifest = {}
+
+    inputs = sorted(glob.glob(os.path.join(input_dir, pattern)))
+    results = []
+    pending = []
+    hashes = {}
+    by_name = {}
+    for input_path in map(os.path.abspath, inputs):
+        name = os.path.splitext(os.path.basename(input_path))[0] + ".png"
+        by_name.setdefault(name, []).append(input_path)
+    for input_path in map(os.path.abspath, inputs):
+        name = os.path.splitext(os.path.basename(input_path))[0] + ".png"
+        output_path = os.path.abspath(os.path.join(output_dir, name))
+        if len(by_name[name]) > 1:
+            # Both inputs would write (and race on) the same output file
+            others = ", ".join(os.path.basename(other) for other in by_name[name] if other != input_path)
+            results.append({"input": input_path, "output": output_path, "status": "failed", "seconds": 0.0,
+                            "error": f"output name {name} clashes with {others}"})
+            continue
+        digest = content_hash(input_path, color_threshold)
+        hashes[output_path] = (name, digest)
+        if os.path.exists(output_path) and manifest.get(name) == digest:
+            results.append({"input": input_path, "output": output_path, "status": "skipped", "seconds": 0.0})
+        else:
+            pending.append((input_path, output_path, color_threshold, tile_size))
+
+    try:
+        if pending:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_add_repo_root_to_path) as executor:
+                futures = {executor.submit(_process_file, job): job for job in pending}
+                for future in as_completed(futures):
+                    input_path, output_path = futures[future][:2]
+                    try:
+                        _, seconds = future.result()
+                    except Exception as e:
+                        results.append({"input": input_path, "output": output_path, "status": "failed",
+                                        "seconds": 0.0, "error": str(e) or type(e).__name__})
+                        continue
+                    name, digest = hashes[output_path]
+                    manifest[name] = digest
+                    results.append({"input": input_path, "output": output_path, "status": "processed",
+                                    "seconds": seconds})
+    finally:
+        # Always keep what finished, so the next run only redoes the failures
+        with open(manifest_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+
+    results.sort(key=lambda result: (result["output"], result["input"]))
+    return results
+
+def main():
+    """Command line entry point: single file (default Logo.png) or batch directory mode."""
+    parser = argparse.ArgumentParser(description="Remove white backgrounds from images")
+    parser.add_argument("--input-dir", help="Directory with the images to process (batch mode)")
+    parser.add_argument("--output-dir", help="Directory for the processed PNGs (batch mode)")
+    parser.add_argument("--pattern", default="*.png", help="Glob pattern for input files (default: *.png)")
+    parser.add_argument("--threshold", type=int, default=40, help="Threshold for white detection (0-255)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="Process images in memory-mapped tiles of this size (bounded memory)")
+    args = parser.parse_args()
+
+    if not args.input_dir:
+        # Make sure you have an image named 'Logo.png' in the same directory
+        remove_background('Logo.png', 'output.png', args.threshold, tile_size=args.tile_size)
+        return
+
+    output_dir = args.output_dir or os.path.join(args.input_dir, "output")
+    started = time.perf_counter()
+    try:
+        results = batch_remove_background(args.input_dir, output_dir, args.pattern, args.threshold, args.jobs,
+                                          args.tile_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for result in results:
+        if result["status"] == "skipped":
+            print(f"up to date  {result['output']}")
+        elif result["status"] == "failed":
+            print(f"failed      {result['input']}: {result['error']}")
+        else:
+            print(f"{result['seconds']:8.3f}s  {result['output']}")
+    processed = sum(1 for result in results if result["status"] == "processed")
+    failed = sum(1 for result in results if result["status"] == "failed")
+    print(f"Processed {processed} of {len(results)} files in {time.perf_counter() - started:.2f}s"
+          + (f", {failed} failed" if failed else ""))
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    _add_repo_root_to_path()
+    main()
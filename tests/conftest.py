@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Os scripts rodam da própria pasta; os testes importam os módulos do mesmo jeito
+for pasta in (RAIZ, RAIZ / "ScriptCarroselTCC"):
+    if str(pasta) not in sys.path:
+        sys.path.insert(0, str(pasta))
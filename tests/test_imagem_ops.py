@@ -0,0 +1,243 @@
+import os
+from collections import deque
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import imagem_ops
+from imagem_ops import (
+    CacheDerivados,
+    aplicar_limiar_branco,
+    fundo_conectado_aos_cantos,
+    limpar_cache,
+    remover_fundo,
+    remover_fundo_arquivo,
+    rotular_componentes,
+)
+from imagem_tiles import remover_fundo_em_tiles
+
+
+def inundar_dos_cantos(mask):
+    """Referência: busca em largura 4-conexa a partir dos cantos da máscara."""
+    h, w = mask.shape
+    fundo = np.zeros_like(mask)
+    fila = deque((y, x) for y, x in ((0, 0), (0, w - 1), (h - 1, 0), (h - 1, w - 1)) if mask[y, x])
+    for y, x in fila:
+        fundo[y, x] = True
+    while fila:
+        y, x = fila.popleft()
+        for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+            if 0 <= ny < h and 0 <= nx < w and mask[ny, nx] and not fundo[ny, nx]:
+                fundo[ny, nx] = True
+                fila.append((ny, nx))
+    return fundo
+
+
+def serpentina(h, w):
+    """Corredor de 1 px que vai e volta pela imagem; só a ponta toca o canto (0, 0)."""
+    mask = np.zeros((h, w), dtype=bool)
+    for y in range(1, h - 1, 2):
+        mask[y, 1:w - 1] = True
+    for i, y in enumerate(range(1, h - 3, 2)):
+        x = w - 2 if i % 2 == 0 else 1
+        mask[y + 1, x] = True
+    mask[0, 0] = mask[0, 1] = True
+    return mask
+
+
+def imagem_aleatoria(semente, h, w):
+    """RGB com regiões brancas, quase brancas e escuras espalhadas."""
+    rng = np.random.default_rng(semente)
+    rgb = np.full((h, w, 3), 255, dtype=np.uint8)
+    escuro = rng.random((h, w)) < 0.35
+    rgb[escuro] = rng.integers(0, 200, size=(int(escuro.sum()), 3), dtype=np.uint8)
+    quase = ~escuro & (rng.random((h, w)) < 0.3)
+    rgb[quase] = rng.integers(230, 256, size=(int(quase.sum()), 3), dtype=np.uint8)
+    return rgb
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_fundo_conectado_igual_a_busca_em_largura(semente):
+    mask = np.random.default_rng(semente).random((37, 53)) < 0.6
+    assert np.array_equal(fundo_conectado_aos_cantos(mask), inundar_dos_cantos(mask))
+
+
+def test_fundo_conectado_em_serpentina():
+    mask = serpentina(41, 29)
+    fundo = fundo_conectado_aos_cantos(mask)
+    assert np.array_equal(fundo, inundar_dos_cantos(mask))
+    assert fundo[39, 1] or fundo[39, 27]  # o fim do corredor também é fundo
+
+
+def test_rotular_componentes_separa_regioes():
+    mask = np.array([
+        [1, 1, 0, 1],
+        [0, 1, 0, 1],
+        [1, 0, 0, 1],
+    ], dtype=bool)
+    rotulos, _n = rotular_componentes(mask)
+    assert rotulos[0, 0] == rotulos[1, 1]
+    assert rotulos[0, 3] == rotulos[2, 3]
+    assert len({rotulos[0, 0], rotulos[0, 3], rotulos[2, 0]}) == 3
+
+
+def test_rotular_componentes_sem_mascara():
+    _rotulos, n = rotular_componentes(np.zeros((4, 4), dtype=bool))
+    assert n == 0
+
+
+@pytest.mark.parametrize("limiar", [0, 1, 40, 255])
+def test_limiar_branco_igual_a_formula_em_float(limiar):
+    rgba = np.zeros((50, 31, 4), dtype=np.uint8)
+    rgba[:, :, :3] = imagem_aleatoria(limiar, 50, 31)
+    esperado = np.where(
+        np.sqrt(((255.0 - rgba[:, :, :3].astype(float)) ** 2).sum(axis=2)) < limiar, 0, 255)
+    aplicar_limiar_branco(rgba, limiar, linhas_por_bloco=7)
+    assert np.array_equal(rgba[:, :, 3], esperado)
+
+
+@pytest.mark.parametrize("modo", ["global", "border-connected"])
+@pytest.mark.parametrize("tamanho_tile", [7, 16, 64])
+def test_tiles_iguais_ao_processamento_em_memoria(tmp_path, modo, tamanho_tile):
+    rgb = imagem_aleatoria(3, 45, 38)
+    rgb[:, 19] = 250  # faixa quase branca cruzando as divisas dos tiles
+    origem = tmp_path / "origem.png"
+    Image.fromarray(rgb).save(origem)
+
+    esperado = remover_fundo(np.array(Image.open(origem).convert("RGBA")), modo)
+    destino = tmp_path / "saida.png"
+    remover_fundo_em_tiles(origem, destino, modo=modo, tamanho_tile=tamanho_tile)
+    assert np.array_equal(np.array(Image.open(destino)), esperado)
+
+
+def test_tiles_em_serpentina_que_cruza_as_divisas(tmp_path):
+    rgb = np.zeros((41, 29, 3), dtype=np.uint8)
+    rgb[serpentina(41, 29)] = 255
+    origem = tmp_path / "origem.ppm"
+    Image.fromarray(rgb).save(origem)
+
+    destino = tmp_path / "saida.png"
+    remover_fundo_em_tiles(origem, destino, modo="border-connected", tamanho_tile=8)
+    esperado = np.where(inundar_dos_cantos(serpentina(41, 29)), 0, 255)
+    assert np.array_equal(np.array(Image.open(destino))[:, :, 3], esperado)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_CACHE_MAX_MB", "1")
+    return CacheDerivados(tmp_path / "cache")
+
+
+def criar_origens(pasta, n):
+    origens = []
+    for i in range(n):
+        origem = pasta / f"origem{i}.bin"
+        origem.write_bytes(bytes([i]) * 10)
+        origens.append(origem)
+    return origens
+
+
+def test_cache_gera_so_na_primeira_vez(cache, tmp_path):
+    (origem,) = criar_origens(tmp_path, 1)
+    chamadas = []
+
+    def gerar(src, dst):
+        chamadas.append(src)
+        with open(dst, "wb") as f:
+            f.write(b"derivado")
+
+    primeiro = cache.obter(origem, {"op": "teste"}, gerar, ".bin")
+    segundo = cache.obter(origem, {"op": "teste"}, gerar, ".bin")
+    outro = cache.obter(origem, {"op": "outro"}, gerar, ".bin")
+    assert primeiro == segundo != outro
+    assert len(chamadas) == 2
+    assert primeiro.read_bytes() == b"derivado"
+
+
+def test_cache_remove_os_usados_ha_mais_tempo(cache, tmp_path):
+    origens = criar_origens(tmp_path, 3)
+
+    def gerar(src, dst):
+        with open(dst, "wb") as f:
+            f.write(b"x" * 300_000)
+
+    caminhos = []
+    for i, origem in enumerate(origens):
+        caminho = cache.obter(origem, {"op": "teste"}, gerar, ".bin")
+        os.utime(caminho, (1000 + i, 1000 + i))
+        caminhos.append(caminho)
+    assert [c.exists() for c in caminhos] == [True, True, True]
+
+    quarto = cache.obter(tmp_path / "origem0.bin", {"op": "outro"}, gerar, ".bin")
+    assert quarto.exists()
+    assert not caminhos[0].exists()
+    assert caminhos[1].exists() and caminhos[2].exists()
+
+
+@pytest.mark.parametrize("tamanho", [10, 3 * 2 ** 20])
+def test_cache_nunca_remove_o_arquivo_recem_gravado(tmp_path, monkeypatch, tamanho):
+    # Com máximo 0, ou um derivado maior que o máximo, o recém-gravado continua no disco
+    monkeypatch.setenv("GERADOR_CACHE_MAX_MB", "0" if tamanho == 10 else "1")
+    cache = CacheDerivados(tmp_path / "cache")
+    anterior, origem = criar_origens(tmp_path, 2)
+
+    def gerar(src, dst):
+        with open(dst, "wb") as f:
+            f.write(b"x" * tamanho)
+
+    velho = cache.obter(anterior, {"op": "teste"}, gerar, ".bin")
+    novo = cache.obter(origem, {"op": "teste"}, gerar, ".bin")
+    assert novo.exists()
+    assert not velho.exists()
+
+
+def test_limpar_cache_preserva_raiz_e_protegidos(tmp_path):
+    pasta = tmp_path / "cache"
+    (pasta / "ab").mkdir(parents=True)
+    a = pasta / "ab" / "a.bin"
+    b = pasta / "ab" / "b.bin"
+    raiz = pasta / "autoajuste.json"
+    for arquivo in (a, b, raiz):
+        arquivo.write_bytes(b"x" * 100)
+
+    removidos, liberados = limpar_cache(pasta, 0, protegidos=[b])
+    assert (removidos, liberados) == (1, 100)
+    assert not a.exists() and b.exists() and raiz.exists()
+
+
+def test_remover_fundo_em_cache_reaproveita(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_CACHE_DIR", str(tmp_path / "cache"))
+    origem = tmp_path / "logo.png"
+    Image.fromarray(imagem_aleatoria(1, 20, 20)).save(origem)
+
+    chamadas = []
+    original = imagem_ops.remover_fundo_arquivo
+
+    def contar(*args, **kwargs):
+        chamadas.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(imagem_ops, "remover_fundo_arquivo", contar)
+    primeiro = imagem_ops.remover_fundo_em_cache(origem)
+    segundo = imagem_ops.remover_fundo_em_cache(origem)
+    assert primeiro == segundo and primeiro.exists()
+    assert len(chamadas) == 1
+
+    direto = tmp_path / "direto.png"
+    remover_fundo_arquivo(origem, direto)
+    assert np.array_equal(np.array(Image.open(primeiro)), np.array(Image.open(direto)))
+
+
+def test_tiles_nao_deixam_png_truncado_em_falha(tmp_path, monkeypatch):
+    origem = tmp_path / "origem.png"
+    Image.fromarray(imagem_aleatoria(2, 30, 30)).save(origem)
+    destino = tmp_path / "saida.png"
+
+    def falhar(*args, **kwargs):
+        raise MemoryError("sem memória")
+
+    monkeypatch.setattr("imagem_tiles.aplicar_limiar_branco", falhar)
+    with pytest.raises(MemoryError):
+        remover_fundo_em_tiles(origem, destino, tamanho_tile=8)
+    assert list(tmp_path.iterdir()) == [origem]
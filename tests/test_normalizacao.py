@@ -0,0 +1,18 @@
+from gerar_html import formatar_banca
+from normalizacao import normalizar_membro_banca, relatorio_pessoas
+
+
+def test_titulos_unificados_em_prof():
+    assert normalizar_membro_banca("Profa. Dra.  Ana  Lima") == "Prof. Ana Lima"
+    assert normalizar_membro_banca("Esp. João") == "Prof. João"
+
+
+def test_banca_pula_membros_vazios_apos_normalizar():
+    assert formatar_banca("Prof. Dr. Ana", "   ", "Dr.", "Maria") == "Prof. Ana, Prof. Maria"
+
+
+def test_relatorio_nao_conta_membros_vazios():
+    relatorio = relatorio_pessoas([
+        {"Nome": "ana", "Orientador": "Dr. Rui", "Membro 1 da Banca": "Me.", "Membro 2 da Banca": " "},
+    ])
+    assert relatorio["professores"] == {"Prof. Rui": 1}
@@ -0,0 +1,28 @@
+from otimizar_assets import _limites_exibicao, extrair_regras_img
+
+
+def limites(estilo, atributos=None, classes=(), ancestrais=()):
+    regras = extrair_regras_img(f"<style>{estilo}</style>")
+    return _limites_exibicao(atributos or {}, set(classes), list(ancestrais), regras)
+
+
+def test_atributo_menor_que_o_teto_do_css():
+    assert limites("img { max-width: 250px }", {"width": "120"}) == (120.0, None)
+
+
+def test_css_prevalece_sobre_o_atributo():
+    assert limites("img { width: 250px }", {"width": "120"}) == (250.0, None)
+
+
+def test_regras_concorrentes_usam_a_maior():
+    estilo = "img { width: 300px } @media (min-width: 1px) { img { width: 500px } }"
+    assert limites(estilo) == (500.0, None)
+
+
+def test_tamanho_e_teto_da_mesma_regra():
+    estilo = ".logo img { height: 60px; max-height: 40px }"
+    assert limites(estilo, ancestrais=[("div", {"logo"})]) == (None, 40.0)
+
+
+def test_so_valores_em_px():
+    assert limites("img { max-width: 50% }", {"width": "80%"}) == (None, None)
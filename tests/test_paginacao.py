@@ -0,0 +1,63 @@
+from gerar_html import formatar_data_exibicao, gerar_html_template, paginar_dia, rotulo_dia, texto_banner
+from paginacao import ALTURA_SCHEDULE, GAP_SCHEDULE, LARGURA_INFO, MetricaFonte, ModeloLayout, contar_linhas
+
+
+def apresentacao(hora, nome, titulo):
+    return {
+        'Hora': hora,
+        'Nome': nome,
+        'Título do trabalho': titulo,
+        'Orientador': 'Prof. Dr. Ana Souza',
+        'Membro 1 da Banca': 'Prof. Me. Rui Lima',
+        'Membro 2 da Banca': 'Profa. Dra. Clara Nunes',
+        'Membro 3 da Banca (Opcional)': '',
+    }
+
+
+def altura_pagina(modelo, itens):
+    alturas = []
+    for item in itens:
+        nome, titulo = item['Nome'], item['Título do trabalho']
+        alturas.append(modelo.altura_item(nome, titulo, 'Prof. Ana Souza, Prof. Rui Lima, Prof. Clara Nunes'))
+    return sum(alturas) + GAP_SCHEDULE * (len(alturas) - 1)
+
+
+def test_paginar_agrupa_em_ordem_sem_passar_da_altura():
+    modelo = ModeloLayout()
+    assert modelo.paginar([300, 300, 300]) == [[0, 1], [2]]
+    assert modelo.paginar([ALTURA_SCHEDULE + 50, 100]) == [[0], [1]]
+
+
+def test_dia_que_nao_cabe_e_dividido():
+    modelo = ModeloLayout()
+    titulo = "Um Estudo Sobre Arquiteturas de Software Para Sistemas Distribuídos de Grande Escala"
+    itens = [apresentacao(f"{8 + i:02d}:00:00", f"Aluno Número {i}", titulo) for i in range(6)]
+    data, _ = formatar_data_exibicao('10/11/25')
+
+    paginas = paginar_dia(itens, modelo, 3, data)
+    assert len(paginas) > 1
+    assert [item for pagina in paginas for item in pagina] == itens
+    for parte, pagina in enumerate(paginas, 1):
+        banner = texto_banner(data, rotulo_dia(3, parte, len(paginas)))
+        disponivel = ALTURA_SCHEDULE - modelo.altura_extra_banner(banner)
+        assert len(pagina) == 1 or altura_pagina(modelo, pagina) <= disponivel
+
+
+def test_banner_que_quebra_reduz_a_area_do_cronograma():
+    modelo = ModeloLayout()
+    curto = texto_banner("10 de November", "3")
+    longo = texto_banner("10 de November (Segunda-feira)", rotulo_dia(3, 12, 12))
+    assert modelo.altura_extra_banner(curto) == 0
+    assert modelo.altura_extra_banner(longo) > 0
+
+    alturas = [390, 390]  # cabem juntas só com o banner em uma linha
+    assert modelo.paginar_com_banner(alturas, lambda total: curto) == [[0, 1]]
+    assert modelo.paginar_com_banner(alturas, lambda total: longo) == [[0], [1]]
+
+
+def test_palavra_maior_que_a_linha_quebra_como_no_template():
+    metrica = MetricaFonte(28, 700)
+    palavra = "A" * 80
+    assert contar_linhas(palavra, metrica, LARGURA_INFO) > 1
+    html = gerar_html_template("10 de November", "1", [])
+    assert "overflow-wrap: anywhere" in html
@@ -0,0 +1,24 @@
+from gerar_html import ler_csv
+from validacao import validar_dados
+
+CABECALHO = ("Nome,Título do trabalho,Orientador,Membro 1 da Banca,Membro 2 da Banca,"
+             "Membro 3 da Banca (Opcional),Data,Hora\n")
+
+
+def test_linha_do_erro_considera_registros_com_varias_linhas(tmp_path):
+    arquivo = tmp_path / "data.csv"
+    arquivo.write_text(
+        CABECALHO
+        + 'Ana,"Título\nem duas linhas",Dr. X,A,B,,10/11/25,08:00:00\n'
+        + "Rui,Tema,Dr. Y,A,B,,99/11/25,08:00:00\n",
+        encoding="utf-8",
+    )
+    assert validar_dados(ler_csv(arquivo)) == ["linha 4: Data '99/11/25' fora do formato DD/MM/AA ou DD/MM/AAAA"]
+
+
+def test_membros_vazios_so_sao_erro_se_todos_faltarem():
+    base = {"Nome": "Ana", "Título do trabalho": "Tema", "Orientador": "Dr. X", "Data": "10/11/25",
+            "Hora": "08:00:00", "Membro 1 da Banca": "", "Membro 2 da Banca": "B"}
+    assert validar_dados([base]) == []
+    assert validar_dados([dict(base, **{"Membro 2 da Banca": ""})]) == [
+        "linha 2: nenhum membro da banca preenchido"]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Trace de desempenho do Chromium por render e resumo do tempo por etapa.
+
+O trace (formato do chrome://tracing / Perfetto) cobre do carregamento da página ao
+screenshot. O resumo soma o tempo próprio (sem os eventos aninhados) de cada grupo de
+eventos da timeline, para saber se um slide lento gasta em layout, pintura, script,
+decodificação de imagem ou no carregamento de fontes. As métricas do domínio
+Performance do CDP (contagens e durações acumuladas de layout, estilo e script) vão
+junto no resumo.
+"""
+
+import json
+import os
+
+CATEGORIAS_TRACE = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "blink.user_timing",
+    "loading",
+    "v8.execute",
+]
+
+# Grupo de cada evento da timeline que entra no resumo
+GRUPOS_EVENTOS = {
+    "Layout": "layout",
+    "UpdateLayoutTree": "estilo",
+    "ParseAuthorStyleSheet": "estilo",
+    "PrePaint": "pintura",
+    "Paint": "pintura",
+    "PaintImage": "pintura",
+    "Layerize": "pintura",
+    "UpdateLayer": "pintura",
+    "CompositeLayers": "pintura",
+    "RasterTask": "rasterizacao",
+    "EvaluateScript": "script",
+    "FunctionCall": "script",
+    "v8.compile": "script",
+    "TimerFire": "script",
+    "EventDispatch": "script",
+    "Decode Image": "decodificacao",
+    "ImageDecodeTask": "decodificacao",
+    "Decode LazyPixelRef": "decodificacao",
+    "ParseHTML": "html",
+}
+
+GRUPOS = ("layout", "estilo", "pintura", "rasterizacao", "script", "decodificacao", "html", "fontes")
+
+EXTENSOES_FONTE = (".woff2", ".woff", ".ttf", ".otf")
+
+# Métricas do Performance.getMetrics que vão para o resumo (durações em segundos)
+METRICAS_CDP = ("LayoutCount", "RecalcStyleCount", "LayoutDuration", "RecalcStyleDuration",
+                "ScriptDuration", "TaskDuration", "Nodes", "JSHeapUsedSize")
+
+
+def _eventos_com_duracao(eventos):
+    """Por thread, (inicio, fim, nome) em µs dos eventos completos (X) e dos pares B/E."""
+    por_thread = {}
+    abertos = {}
+    for evento in eventos:
+        fase = evento.get("ph")
+        thread = (evento.get("pid"), evento.get("tid"))
+        if fase == "X" and "dur" in evento:
+            por_thread.setdefault(thread, []).append((evento["ts"], evento["ts"] + evento["dur"], evento["name"]))
+        elif fase == "B":
+            abertos.setdefault(thread, []).append(evento)
+        elif fase == "E" and abertos.get(thread):
+            inicio = abertos[thread].pop()
+            por_thread.setdefault(thread, []).append((inicio["ts"], evento["ts"], inicio["name"]))
+    return por_thread
+
+
+def tempo_proprio_por_grupo(eventos):
+    """ms por grupo de GRUPOS_EVENTOS, descontando de cada evento o tempo dos eventos agrupados dentro dele."""
+    totais = dict.fromkeys(GRUPOS, 0.0)
+    for intervalos in _eventos_com_duracao(eventos).values():
+        intervalos = sorted((i for i in intervalos if i[2] in GRUPOS_EVENTOS), key=lambda i: (i[0], -i[1]))
+        pilha = []  # [fim, grupo, tempo_proprio]
+
+        def fechar(ate):
+            while pilha and pilha[-1][0] <= ate:
+                _fim, grupo, proprio = pilha.pop()
+                totais[grupo] += proprio
+
+        for inicio, fim, nome in intervalos:
+            fechar(inicio)
+            duracao = fim - inicio
+            if pilha:
+                pilha[-1][2] -= min(fim, pilha[-1][0]) - inicio
+            pilha.append([fim, GRUPOS_EVENTOS[nome], duracao])
+        fechar(float("inf"))
+    return {grupo: round(total / 1000, 1) for grupo, total in totais.items()}
+
+
+def tempo_fontes(eventos):
+    """ms do pedido ao fim do carregamento, somados, das requisições de arquivos de fonte."""
+    pedidos = {}
+    total = 0.0
+    for evento in eventos:
+        dados = evento.get("args", {}).get("data", {})
+        requisicao = dados.get("requestId")
+        if evento.get("name") == "ResourceSendRequest":
+            url = dados.get("url", "").split("?")[0].lower()
+            if url.endswith(EXTENSOES_FONTE) or "fonts.gstatic.com" in url:
+                pedidos[requisicao] = evento["ts"]
+        elif evento.get("name") == "ResourceFinish" and requisicao in pedidos:
+            total += evento["ts"] - pedidos.pop(requisicao)
+    return round(total / 1000, 1)
+
+
+def resumir_trace(caminho_trace, segundos=None, metricas=None):
+    """Resumo (dict) de um arquivo de trace: ms por grupo, fontes, total e métricas do CDP."""
+    with open(caminho_trace, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    eventos = dados["traceEvents"] if isinstance(dados, dict) else dados
+
+    resumo = {"trace": os.path.basename(caminho_trace)}
+    if segundos is not None:
+        resumo["total_ms"] = round(segundos * 1000, 1)
+    resumo.update(tempo_proprio_por_grupo(eventos))
+    resumo["fontes"] = tempo_fontes(eventos)
+    if metricas:
+        resumo["metricas_cdp"] = {nome: metricas[nome] for nome in METRICAS_CDP if nome in metricas}
+    return resumo
+
+
+def formatar_resumo(resumo):
+    """Uma linha com o total e os grupos com tempo, do maior para o menor."""
+    grupos = sorted(((resumo[g], g) for g in GRUPOS if resumo.get(g)), reverse=True)
+    partes = ", ".join(f"{grupo} {ms:.1f} ms" for ms, grupo in grupos)
+    total = f"{resumo['total_ms']:.0f} ms" if "total_ms" in resumo else "?"
+    return f"⏱️  {resumo['trace']}: {total} ({partes or 'sem eventos'})"